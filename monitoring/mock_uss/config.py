@@ -9,6 +9,10 @@ KEY_SERVICES = "MOCK_USS_SERVICES"
 KEY_DSS_URL = "MOCK_USS_DSS_URL"
 KEY_BEHAVIOR_LOCALITY = "MOCK_USS_BEHAVIOR_LOCALITY"
 KEY_CODE_VERSION = "MONITORING_VERSION"
+KEY_DETAILS_CONCURRENCY = "MOCK_USS_OP_INTENT_DETAILS_CONCURRENCY"
+KEY_NOTIFICATION_CONCURRENCY = "MOCK_USS_NOTIFICATION_CONCURRENCY"
+KEY_NOTIFICATION_TIMEOUT = "MOCK_USS_NOTIFICATION_TIMEOUT_SECONDS"
+KEY_ASYNC_NOTIFICATIONS = "MOCK_USS_ASYNC_NOTIFICATIONS"
 
 
 import_environment_variable(
@@ -27,3 +31,11 @@ import_environment_variable(
 import_environment_variable(KEY_DSS_URL, required=False)
 import_environment_variable(KEY_BEHAVIOR_LOCALITY, default="US.IndustryCollaboration")
 import_environment_variable(KEY_CODE_VERSION, default="Unknown")
+import_environment_variable(KEY_DETAILS_CONCURRENCY, default="8", mutator=int)
+import_environment_variable(KEY_NOTIFICATION_CONCURRENCY, default="8", mutator=int)
+import_environment_variable(KEY_NOTIFICATION_TIMEOUT, default="10", mutator=float)
+import_environment_variable(
+    KEY_ASYNC_NOTIFICATIONS,
+    default="false",
+    mutator=lambda s: s.strip().lower() in ("true", "1", "yes"),
+)
@@ -1,8 +1,18 @@
+from requests.adapters import HTTPAdapter
+
 from monitoring.mock_uss.app import require_config_value, webapp
-from monitoring.mock_uss.config import KEY_AUTH_SPEC, KEY_DSS_URL
+from monitoring.mock_uss.config import (
+    KEY_AUTH_SPEC,
+    KEY_DETAILS_CONCURRENCY,
+    KEY_DSS_URL,
+    KEY_NOTIFICATION_CONCURRENCY,
+)
 from monitoring.monitorlib import auth
 from monitoring.monitorlib.infrastructure import utm_client_session_factory
 
+MAX_USS_CONNECTION_POOLS = 64
+"""Maximum number of hosts (DSS and other USSs) to which utm_client keeps connections open for reuse."""
+
 require_config_value(KEY_DSS_URL)
 require_config_value(KEY_AUTH_SPEC)
 
@@ -10,3 +20,14 @@ utm_client = utm_client_session_factory.get_session(
     webapp.config[KEY_DSS_URL],
     auth.make_auth_adapter(webapp.config[KEY_AUTH_SPEC]),
 )
+
+# Allow each worker querying a USS concurrently to reuse its own connection to that USS
+_adapter = HTTPAdapter(
+    pool_connections=MAX_USS_CONNECTION_POOLS,
+    pool_maxsize=max(
+        webapp.config[KEY_DETAILS_CONCURRENCY],
+        webapp.config[KEY_NOTIFICATION_CONCURRENCY],
+    ),
+)
+utm_client.mount("https://", _adapter)
+utm_client.mount("http://", _adapter)
@@ -1,17 +1,36 @@
+import os
+import threading
 import uuid
-from collections.abc import Callable
-from datetime import datetime
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta
 
 import arrow
 import requests
+from implicitdict import StringBasedDateTime
+from loguru import logger
 from uas_standards.astm.f3548.v21 import api as f3548_v21
 from uas_standards.astm.f3548.v21.constants import OiMaxPlanHorizonDays, OiMaxVertices
 from uas_standards.interuss.automated_testing.scd.v1 import api as scd_api
 
 from monitoring.mock_uss.app import webapp
-from monitoring.mock_uss.config import KEY_BASE_URL
+from monitoring.mock_uss.config import (
+    KEY_ASYNC_NOTIFICATIONS,
+    KEY_BASE_URL,
+    KEY_DETAILS_CONCURRENCY,
+    KEY_NOTIFICATION_CONCURRENCY,
+    KEY_NOTIFICATION_TIMEOUT,
+)
 from monitoring.mock_uss.f3548v21 import utm_client
-from monitoring.mock_uss.flights.database import Database, FlightRecord, db
+from monitoring.mock_uss.flights.database import (
+    FlightRecord,
+    SubscriberNotificationResult,
+    db,
+    find_flight_by_op_intent_id,
+    find_flights_possibly_intersecting,
+    notification_locks,
+    op_intent_cache,
+)
+from monitoring.mock_uss.worker_pool import WorkerPool
 from monitoring.monitorlib.clients import scd as scd_client
 from monitoring.monitorlib.clients.flight_planning.flight_info import FlightInfo
 from monitoring.monitorlib.fetch import QueryError
@@ -21,6 +40,12 @@ from monitoring.monitorlib.locality import Locality
 from monitoring.monitorlib.scd import priority_of
 from monitoring.uss_qualifier.resources.overrides import apply_overrides
 
+_details_pool = WorkerPool(KEY_DETAILS_CONCURRENCY, "get_op_intent_details")
+_notification_pool = WorkerPool(KEY_NOTIFICATION_CONCURRENCY, "notify_subscribers")
+
+NOTIFICATION_ORDER_TIMEOUT = timedelta(minutes=1)
+"""Maximum time to wait for earlier asynchronous notifications about the same operational intent to be sent."""
+
 
 class PlanningError(Exception):
     pass
@@ -90,18 +115,22 @@ def validate_request(op_intent: f3548_v21.OperationalIntent) -> None:
         )
 
 
+def _volumes_of(op_intent: f3548_v21.OperationalIntent) -> Volume4DCollection:
+    return Volume4DCollection.from_f3548v21(
+        (op_intent.details.volumes or [])
+        + (op_intent.details.off_nominal_volumes or [])
+    )
+
+
 def conflicts_with_flightrecords(
-    op_intent: f3548_v21.OperationalIntent, flights: list[FlightRecord | None]
+    op_intent: f3548_v21.OperationalIntent, flights: Sequence[FlightRecord | None]
 ) -> bool:
     """
     Return true if the OperationalIntent conflicts with (intersects) any of the specified FlightRecords that do not
     correspond with op_intent.
     """
 
-    vc1 = Volume4DCollection.from_f3548v21(
-        (op_intent.details.volumes or [])
-        + (op_intent.details.off_nominal_volumes or [])
-    )
+    vc1 = _volumes_of(op_intent)
 
     for other_flight in flights:
         if not other_flight or not other_flight.op_intent:
@@ -111,10 +140,7 @@ def conflicts_with_flightrecords(
         if other_flight.op_intent.reference.id == op_intent.reference.id:  # Same flight
             continue
 
-        vc2 = Volume4DCollection.from_f3548v21(
-            (other_flight.op_intent.details.volumes or [])
-            + (other_flight.op_intent.details.off_nominal_volumes or [])
-        )
+        vc2 = _volumes_of(other_flight.op_intent)
 
         if vc1.intersects_vol4s(vc2):
             return True
@@ -122,6 +148,18 @@ def conflicts_with_flightrecords(
     return False
 
 
+def conflicts_with_managed_flights(op_intent: f3548_v21.OperationalIntent) -> bool:
+    """
+    Return true if the OperationalIntent conflicts with (intersects) any of the flights managed by mock_uss that do not
+    correspond with op_intent.
+
+    Only flights which may intersect op_intent according to the flights' spatio-temporal index are examined exactly.
+    """
+    return conflicts_with_flightrecords(
+        op_intent, find_flights_possibly_intersecting(_volumes_of(op_intent))
+    )
+
+
 def check_for_conflicts(
     new_op_intent: f3548_v21.OperationalIntent,
     existing_flight: FlightRecord | None,
@@ -154,9 +192,23 @@ def check_for_conflicts(
 
     v1 = Volume4DCollection.from_interuss_scd_api(new_op_intent.details.volumes)
 
+    # Evaluate intersections with the volumes of all operational intents at once
+    other_volumes = [
+        Volume4DCollection.from_interuss_scd_api(
+            op_intent.details.volumes + op_intent.details.off_nominal_volumes
+        )
+        for op_intent in op_intents
+    ]
+    intersecting_volumes = v1.intersection_matrix(
+        Volume4DCollection(v for v2 in other_volumes for v in v2)
+    ).any(axis=0)
+    volume_offsets = [0]
+    for v2 in other_volumes:
+        volume_offsets.append(volume_offsets[-1] + len(v2))
+
     allowed_conflict = False
 
-    for op_intent in op_intents:
+    for i, (op_intent, v2) in enumerate(zip(op_intents, other_volumes)):
         if (
             existing_flight
             and existing_flight.op_intent
@@ -167,8 +219,8 @@ def check_for_conflicts(
             )
             continue
 
-        v2 = Volume4DCollection.from_interuss_scd_api(
-            op_intent.details.volumes + op_intent.details.off_nominal_volumes
+        intersects = bool(
+            intersecting_volumes[volume_offsets[i] : volume_offsets[i + 1]].any()
         )
 
         new_priority = priority_of(new_op_intent.details)
@@ -178,7 +230,7 @@ def check_for_conflicts(
                 f"intersection with {op_intent.reference.id} allowed: intersection with lower-priority operational intents"
             )
 
-            allowed_conflict |= v1.intersects_vol4s(v2)
+            allowed_conflict |= intersects
             continue
         if new_priority == old_priority and locality.allows_same_priority_intersections(
             old_priority
@@ -186,7 +238,7 @@ def check_for_conflicts(
             log(
                 f"intersection with {op_intent.reference.id} allowed: intersection with same-priority operational intents (if allowed)"
             )
-            allowed_conflict |= v1.intersects_vol4s(v2)
+            allowed_conflict |= intersects
             continue
 
         modifying_activated = (
@@ -206,7 +258,7 @@ def check_for_conflicts(
                 )
                 continue
 
-        if v1.intersects_vol4s(v2):
+        if intersects:
             raise PlanningError(
                 f"Requested flight (priority {new_priority}) intersected {op_intent.reference.manager}'s operational intent {op_intent.reference.id} (priority {old_priority})"
             )
@@ -432,37 +484,35 @@ def query_operational_intents(
     op_intent_refs = scd_client.query_operational_intent_references(
         utm_client, area_of_interest
     )
-    dbcontent: Database = db.value
     get_details_for = []
-    own_flights = {
-        f.op_intent.reference.id: f
-        for f in dbcontent.flights.values()
-        if f and f.op_intent
-    }
     result = []
     for op_intent_ref in op_intent_refs:
-        if op_intent_ref.id in own_flights:
+        own_flight = find_flight_by_op_intent_id(op_intent_ref.id)
+        if own_flight:
             # This is our own flight
-            result.append(
-                op_intent_from_flightrecord(own_flights[op_intent_ref.id], "GET")
-            )
-        elif (
-            op_intent_ref.id in dbcontent.cached_operations
-            and dbcontent.cached_operations[op_intent_ref.id].reference.version
-            == op_intent_ref.version
-        ):
+            result.append(op_intent_from_flightrecord(own_flight[1], "GET"))
+        elif cached := op_intent_cache.get(op_intent_ref.id, op_intent_ref.version):
             # We have a current version of this op intent cached
-            result.append(dbcontent.cached_operations[op_intent_ref.id])
+            result.append(cached)
         else:
             # We need to get the details for this op intent
             get_details_for.append(op_intent_ref)
 
+    # Fetch missing details concurrently; results are examined in the order they would be fetched sequentially
+    executor = _details_pool.get()
+    futures = [
+        executor.submit(
+            scd_client.get_operational_intent_details,
+            utm_client,
+            op_intent_ref.uss_base_url,
+            op_intent_ref.id,
+        )
+        for op_intent_ref in get_details_for
+    ]
     updated_op_intents = []
-    for op_intent_ref in get_details_for:
+    for op_intent_ref, future in zip(get_details_for, futures):
         try:
-            op_intent, _ = scd_client.get_operational_intent_details(
-                utm_client, op_intent_ref.uss_base_url, op_intent_ref.id
-            )
+            op_intent, _ = future.result()
             updated_op_intents.append(op_intent)
         except QueryError as e:
             if op_intent_ref.uss_availability == f3548_v21.UssAvailabilityState.Down:
@@ -477,9 +527,7 @@ def query_operational_intents(
                 raise e
     result.extend(updated_op_intents)
 
-    with db.transact() as tx:
-        for op_intent in updated_op_intents:
-            tx.value.cached_operations[op_intent.reference.id] = op_intent
+    op_intent_cache.put(updated_op_intents)
 
     return result
 
@@ -672,7 +720,7 @@ def share_op_intent(
         mod_op_sharing_behavior=new_flight.mod_op_sharing_behavior,
     )
     operational_intent = op_intent_from_flightrecord(record, "POST")
-    notif_errors = notify_subscribers(
+    notif_errors = dispatch_subscriber_notifications(
         result.operational_intent_reference.id,
         operational_intent,
         result.subscribers,
@@ -703,11 +751,41 @@ def delete_op_intent(
         op_intent_ref.id,
         op_intent_ref.ovn,
     )
-    return notify_subscribers(
+    return dispatch_subscriber_notifications(
         result.operational_intent_reference.id, None, result.subscribers, log
     )
 
 
+def _notify_subscriber(
+    op_intent_id: f3548_v21.EntityID,
+    op_intent: f3548_v21.OperationalIntent | None,
+    subscriber: f3548_v21.SubscriberToNotify,
+    log: Callable[[str], None],
+) -> Exception | None:
+    update = f3548_v21.PutOperationalIntentDetailsParameters(
+        operational_intent_id=op_intent_id,
+        operational_intent=op_intent,
+        subscriptions=subscriber.subscriptions,
+    )
+    log(f"Notifying {subscriber.uss_base_url}")
+    try:
+        scd_client.notify_operational_intent_details_changed(
+            utm_client,
+            subscriber.uss_base_url,
+            update,
+            timeout_seconds=webapp.config[KEY_NOTIFICATION_TIMEOUT],
+        )
+    except (
+        ValueError,
+        ConnectionError,
+        requests.exceptions.ConnectionError,
+        QueryError,
+    ) as e:
+        log(f"Failed to notify {subscriber.uss_base_url}: {str(e)}")
+        return e
+    return None
+
+
 def notify_subscribers(
     op_intent_id: f3548_v21.EntityID,
     op_intent: f3548_v21.OperationalIntent | None,
@@ -717,29 +795,98 @@ def notify_subscribers(
     """
     Notify subscribers of a changed or deleted operational intent.
     This function will attempt all notifications, even if some of them fail.
+    Notifications are sent concurrently by a bounded pool of workers.
 
     :return: Notification errors if any, by subscriber.
     """
-    notif_errors: dict[f3548_v21.SubscriptionUssBaseURL, Exception] = {}
-    for subscriber in subscribers:
-        update = f3548_v21.PutOperationalIntentDetailsParameters(
-            operational_intent_id=op_intent_id,
-            operational_intent=op_intent,
-            subscriptions=subscriber.subscriptions,
+    executor = _notification_pool.get()
+    futures = [
+        (
+            subscriber.uss_base_url,
+            executor.submit(
+                _notify_subscriber, op_intent_id, op_intent, subscriber, log
+            ),
         )
-        log(f"Notifying {subscriber.uss_base_url}")
-        try:
-            scd_client.notify_operational_intent_details_changed(
-                utm_client, subscriber.uss_base_url, update
-            )
-        except (
-            ValueError,
-            ConnectionError,
-            requests.exceptions.ConnectionError,
-            QueryError,
-        ) as e:
-            log(f"Failed to notify {subscriber.uss_base_url}: {str(e)}")
-            notif_errors[subscriber.uss_base_url] = e
+        for subscriber in subscribers
+    ]
+    notif_errors: dict[f3548_v21.SubscriptionUssBaseURL, Exception] = {}
+    for uss_base_url, future in futures:
+        error = future.result()
+        if error is not None:
+            notif_errors[uss_base_url] = error
 
     log(f"{len(notif_errors) if notif_errors else 'No'} notifications failed")
     return notif_errors
+
+
+def _notify_subscribers_and_record(
+    op_intent_id: f3548_v21.EntityID,
+    op_intent: f3548_v21.OperationalIntent | None,
+    subscribers: list[f3548_v21.SubscriberToNotify],
+    ordered: bool,
+) -> None:
+    def log(msg: str) -> None:
+        logger.debug(f"[notify_subscribers/{os.getpid()}:{op_intent_id}] {msg}")
+
+    try:
+        notif_errors = notify_subscribers(op_intent_id, op_intent, subscribers, log)
+    finally:
+        if ordered:
+            notification_locks.release(op_intent_id)
+    notified_at = StringBasedDateTime(arrow.utcnow().datetime)
+    with db.transact() as tx:
+        for subscriber in subscribers:
+            result = SubscriberNotificationResult(
+                op_intent_id=op_intent_id,
+                uss_base_url=subscriber.uss_base_url,
+                notified_at=notified_at,
+            )
+            if subscriber.uss_base_url in notif_errors:
+                result.error = str(notif_errors[subscriber.uss_base_url])
+            tx.value.subscriber_notifications.append(result)
+
+
+def dispatch_subscriber_notifications(
+    op_intent_id: f3548_v21.EntityID,
+    op_intent: f3548_v21.OperationalIntent | None,
+    subscribers: list[f3548_v21.SubscriberToNotify],
+    log: Callable[[str], None],
+) -> dict[f3548_v21.SubscriptionUssBaseURL, Exception]:
+    """Notify subscribers of a changed or deleted operational intent, or arrange for them to be notified.
+
+    When mock_uss is configured to notify asynchronously, this function returns immediately and the outcome of each
+    notification is recorded in Database.subscriber_notifications once it is sent.  Asynchronous notifications about
+    the same operational intent are sent in the order they are dispatched, in any process: this function waits for
+    notifications of any earlier change to be sent before dispatching another one.
+
+    :return: Notification errors if any, by subscriber (always empty when notifying asynchronously).
+    """
+    if not webapp.config[KEY_ASYNC_NOTIFICATIONS] or not subscribers:
+        return notify_subscribers(op_intent_id, op_intent, subscribers, log)
+
+    # Planning operations on a flight are serialized, so lock requests are queued in the order of the changes
+    try:
+        notification_locks.acquire(
+            op_intent_id,
+            timeout=NOTIFICATION_ORDER_TIMEOUT,
+            description=f"notify_subscribers from process {os.getpid()}",
+        )
+        ordered = True
+    except RuntimeError as e:
+        log(f"Notifying subscribers without waiting for earlier notifications: {e}")
+        ordered = False
+
+    log(f"Notifying {len(subscribers)} subscribers asynchronously")
+    try:
+        # Not submitted to the notification pool itself, which could then be exhausted by tasks waiting on each other
+        threading.Thread(
+            target=_notify_subscribers_and_record,
+            args=(op_intent_id, op_intent, subscribers, ordered),
+            name=f"notify_subscribers:{op_intent_id}",
+            daemon=True,
+        ).start()
+    except BaseException:
+        if ordered:
+            notification_locks.release(op_intent_id)
+        raise
+    return {}
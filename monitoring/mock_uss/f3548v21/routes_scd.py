@@ -16,10 +16,14 @@ from uas_standards.astm.f3548.v21.api import (
 from monitoring.mock_uss.app import webapp
 from monitoring.mock_uss.auth import requires_scope
 from monitoring.mock_uss.f3548v21.flight_planning import (
-    conflicts_with_flightrecords,
+    conflicts_with_managed_flights,
     op_intent_from_flightrecord,
 )
-from monitoring.mock_uss.flights.database import FlightRecord, db
+from monitoring.mock_uss.flights.database import (
+    FlightRecord,
+    db,
+    find_flight_by_op_intent_id,
+)
 from monitoring.mock_uss.logging import query_type
 from monitoring.mock_uss.user_interactions.notifications import (
     UserNotification,
@@ -28,6 +32,9 @@ from monitoring.mock_uss.user_interactions.notifications import (
 from monitoring.monitorlib import scd
 from monitoring.monitorlib.clients.flight_planning.planning import Conflict
 from monitoring.monitorlib.fetch import QueryType
+from monitoring.monitorlib.scd_automated_testing.scd_injection_api import (
+    SCOPE_SCD_QUALIFIER_INJECT,
+)
 
 
 @webapp.route("/mock/scd/uss/v1/operational_intents/<entityid>", methods=["GET"])
@@ -37,12 +44,8 @@ def scdsc_get_operational_intent_details(entityid: str):
     """Implements getOperationalIntentDetails in ASTM SCD API."""
 
     # Look up entityid in database
-    tx = db.value
-    flight = None
-    for f in tx.flights.values():
-        if f and f.op_intent and f.op_intent.reference.id == entityid:
-            flight = f
-            break
+    found = find_flight_by_op_intent_id(entityid)
+    flight = found[1] if found else None
 
     # If requested operational intent doesn't exist, return 404
     if flight is None or flight.op_intent is None:
@@ -71,12 +74,8 @@ def scdsc_get_operational_intent_telemetry(entityid: str):
     """Implements getOperationalIntentTelemetry in ASTM SCD API."""
 
     # Look up entityid in database
-    tx = db.value
-    flight: FlightRecord | None = None
-    for f in tx.flights.values():
-        if f and f.op_intent and f.op_intent.reference.id == entityid:
-            flight = f
-            break
+    found = find_flight_by_op_intent_id(entityid)
+    flight: FlightRecord | None = found[1] if found else None
 
     # If requested operational intent doesn't exist, return 404
     if flight is None:
@@ -132,11 +131,9 @@ def scdsc_notify_operational_intent_details_changed():
 
     if "operational_intent" in op_intent_data and op_intent_data.operational_intent:
         # An op intent is being created or modified; check if it conflicts with any flights we're managing
-        with db.transact() as tx:
-            if conflicts_with_flightrecords(
-                op_intent_data.operational_intent, list(tx.value.flights.values())
-            ):
-                # Virtually notify user that another op intent conflicts with their flight
+        if conflicts_with_managed_flights(op_intent_data.operational_intent):
+            # Virtually notify user that another op intent conflicts with their flight
+            with db.transact() as tx:
                 tx.value.flight_planning_notifications.append(
                     UserNotification(
                         type=UserNotificationType.DetectedConflict,
@@ -176,3 +173,15 @@ def scdsc_make_uss_report():
 
     # Return the ErrorReport as the nominal response
     return flask.jsonify(report), 201
+
+
+@webapp.route("/mock/scd/subscriber_notifications", methods=["GET"])
+@requires_scope(SCOPE_SCD_QUALIFIER_INJECT)
+def scdsc_subscriber_notifications():
+    """Lists the outcomes of subscriber notifications mock_uss sent asynchronously."""
+    return (
+        flask.jsonify(
+            {"subscriber_notifications": db.snapshot.subscriber_notifications}
+        ),
+        200,
+    )
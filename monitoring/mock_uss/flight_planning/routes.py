@@ -178,7 +178,7 @@ def flight_planning_v1_user_notifications() -> tuple[str, int]:
 
     final_list: list[api.UserNotification] = []
 
-    for user_notification in db.value.flight_planning_notifications:
+    for user_notification in db.snapshot.flight_planning_notifications:
         if after.datetime <= user_notification.observed_at.datetime <= before.datetime:
             final_list.append(
                 api.UserNotification(
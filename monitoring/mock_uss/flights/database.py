@@ -1,17 +1,29 @@
 import json
+from collections.abc import MutableMapping
 from datetime import timedelta
 
 import arrow
-from implicitdict import ImplicitDict, Optional
-from uas_standards.astm.f3548.v21.api import EntityID, OperationalIntent
+from implicitdict import ImplicitDict, Optional, StringBasedDateTime
+from uas_standards.astm.f3548.v21.api import (
+    EntityID,
+    OperationalIntent,
+    SubscriptionUssBaseURL,
+)
 
 from monitoring.mock_uss.app import webapp
+from monitoring.mock_uss.flights.op_intent_cache import OperationalIntentCache
 from monitoring.mock_uss.user_interactions.notifications import UserNotification
 from monitoring.monitorlib.clients.flight_planning.flight_info import FlightInfo
 from monitoring.monitorlib.clients.mock_uss.mock_uss_scd_injection_api import (
     MockUssFlightBehavior,
 )
-from monitoring.monitorlib.multiprocessing import SynchronizedValue
+from monitoring.monitorlib.geotemporal import Volume4DCollection
+from monitoring.monitorlib.geotemporal_index import Volume4DIndex
+from monitoring.monitorlib.multiprocessing import (
+    SynchronizedLocks,
+    SynchronizedMap,
+    SynchronizedValue,
+)
 
 DEADLOCK_TIMEOUT = timedelta(seconds=5)
 
@@ -27,6 +39,18 @@ FLIGHTS_LIMIT = timedelta(hours=1)
 OPERATIONAL_INTENTS_LIMIT = timedelta(hours=1)
 """Automatically remove cached operational intents obtained from others after this long beyond their end time."""
 
+MAX_CACHED_OPERATIONAL_INTENTS = 2000
+"""Maximum number of operational intents obtained from others that mock_uss caches at once."""
+
+MAX_CACHED_OPERATIONAL_INTENT_BYTES = 100000
+"""Maximum size of the JSON representation of a single cached operational intent obtained from another USS."""
+
+MAX_FLIGHTS = 1000
+"""Maximum number of flights mock_uss can manage at once."""
+
+MAX_FLIGHT_RECORD_BYTES = 100000
+"""Maximum size of the JSON representation of a single FlightRecord."""
+
 
 class MockUSSFlightID(str):
     """The identity of a flight, as tracked/managed by mock_uss"""
@@ -44,20 +68,25 @@ class FlightRecord(ImplicitDict):
     locked: bool = False
 
 
-class Database(ImplicitDict):
-    """Simple in-memory pseudo-database tracking the state of the mock system"""
+class SubscriberNotificationResult(ImplicitDict):
+    """Outcome of notifying a subscriber of a change to one of our operational intents"""
+
+    op_intent_id: EntityID
+    uss_base_url: SubscriptionUssBaseURL
+    notified_at: StringBasedDateTime
+    error: Optional[str] = None
+    """Description of the reason the notification failed, if it failed."""
 
-    flights: dict[MockUSSFlightID, FlightRecord | None] = {}
-    """Collection of flights managed by mock_uss, referenced by flight ID.
-    
-    When the value is None, this indicates that the flight of the specified ID is currently in the process of being
-    created and should be treated as locked."""
 
-    cached_operations: dict[EntityID, OperationalIntent] = {}
+class Database(ImplicitDict):
+    """Simple in-memory pseudo-database tracking the state of the mock system"""
 
     flight_planning_notifications: list[UserNotification] = []
     """List of notifications sent during flight planning operations"""
 
+    subscriber_notifications: list[SubscriberNotificationResult] = []
+    """Outcomes of subscriber notifications sent asynchronously after planning operations"""
+
     def cleanup_notifications(self):
         self.flight_planning_notifications = [
             notif
@@ -65,41 +94,149 @@ class Database(ImplicitDict):
             if notif.observed_at.datetime + NOTIFICATIONS_LIMIT
             > arrow.utcnow().datetime
         ]
+        self.subscriber_notifications = [
+            result
+            for result in self.subscriber_notifications
+            if result.notified_at.datetime + NOTIFICATIONS_LIMIT
+            > arrow.utcnow().datetime
+        ]
 
-    def cleanup_flights(self):
-        to_cleanup = []
 
-        for flight_id, flight in self.flights.items():
-            if (
-                flight
-                and not flight.locked
-                and flight.op_intent
-                and flight.op_intent.reference.time_end.value.datetime + FLIGHTS_LIMIT
-                < arrow.utcnow().datetime
-            ):
-                to_cleanup.append(flight_id)
+db = SynchronizedValue[Database](
+    Database(),
+    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
+)
 
-        for flight_id in to_cleanup:
-            del self.flights[flight_id]
+op_intent_cache = OperationalIntentCache(
+    max_entries=MAX_CACHED_OPERATIONAL_INTENTS,
+    entry_capacity_bytes=MAX_CACHED_OPERATIONAL_INTENT_BYTES,
+    expiration=OPERATIONAL_INTENTS_LIMIT,
+)
+"""Details of operational intents obtained from other USSs, by ID and version."""
 
-    def cleanup_operational_intents(self):
-        to_cleanup = []
 
-        for op_id, op_intent in self.cached_operations.items():
-            if (
-                op_intent.reference.time_end.value.datetime + OPERATIONAL_INTENTS_LIMIT
-                < arrow.utcnow().datetime
-            ):
-                to_cleanup.append(op_id)
+def _op_intent_id_of(flight: FlightRecord | None) -> str | None:
+    # TODO(mock_uss_flight_id): Use flight ID that is independent of op_intent
+    return flight.op_intent.reference.id if flight and flight.op_intent else None
 
-        for op_id in to_cleanup:
-            del self.cached_operations[op_id]
 
+OP_INTENT_ID_INDEX = "op_intent_id"
+"""Name of flights_db index from operational intent ID to flight."""
 
-db = SynchronizedValue[Database](
-    Database(),
-    decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
+
+def _decode_flight_record(b: bytes) -> FlightRecord | None:
+    content = json.loads(b.decode("utf-8"))
+    return None if content is None else ImplicitDict.parse(content, FlightRecord)
+
+
+flights_db = SynchronizedMap[FlightRecord | None](
+    max_entries=MAX_FLIGHTS,
+    entry_capacity_bytes=MAX_FLIGHT_RECORD_BYTES,
+    decoder=_decode_flight_record,
+    indexes={OP_INTENT_ID_INDEX: _op_intent_id_of},
 )
+"""Collection of flights managed by mock_uss, referenced by flight ID.
+
+When the value is None, this indicates that the flight of the specified ID is currently in the process of being
+created and should be treated as locked.
+
+Use `flights_db.lookup(OP_INTENT_ID_INDEX, op_intent_id)` to find the flight with a particular operational intent."""
+
+flight_locks = SynchronizedLocks(max_keys=MAX_FLIGHTS)
+"""Locks held while creating, modifying, or deleting flights, by flight ID (see `lock_flight`)."""
+
+notification_locks = SynchronizedLocks(max_keys=MAX_FLIGHTS)
+"""Locks held while asynchronously notifying subscribers of changes to an operational intent, by operational intent ID,
+so that subscribers receive notifications about the same operational intent in the order the changes were made."""
+
+
+def find_flight_by_op_intent_id(
+    op_intent_id: str,
+) -> tuple[MockUSSFlightID, FlightRecord] | None:
+    """Find the flight mock_uss manages with the specified operational intent, if any."""
+    result = flights_db.lookup(OP_INTENT_ID_INDEX, op_intent_id)
+    if result is None or result[1] is None:
+        return None
+    return MockUSSFlightID(result[0]), result[1]
+
+
+class _FlightVolumesIndex:
+    """Spatio-temporal index of the operational intent volumes of flights in flights_db, local to this process.
+
+    The index is brought up to date with flights_db (which may be changed by any process) before each use, re-reading
+    only the flights that have changed since the last use.
+    """
+
+    def __init__(self):
+        self._generation = -1
+        self._versions: dict[str, int] = {}
+        self._index = Volume4DIndex[str]()
+
+    def _sync(self) -> None:
+        generation = flights_db.generation
+        if generation == self._generation:
+            return
+        versions = flights_db.versions()
+        for flight_id in self._versions:
+            if flight_id not in versions:
+                self._index.remove(flight_id)
+        for flight_id, version in versions.items():
+            if self._versions.get(flight_id) == version:
+                continue
+            flight = flights_db.get(flight_id)
+            if flight and flight.op_intent:
+                self._index.set(
+                    flight_id,
+                    Volume4DCollection.from_f3548v21(
+                        (flight.op_intent.details.volumes or [])
+                        + (flight.op_intent.details.off_nominal_volumes or [])
+                    ),
+                )
+            else:
+                self._index.remove(flight_id)
+        self._versions = versions
+        self._generation = generation
+
+    def candidates(self, volumes: Volume4DCollection) -> set[str]:
+        self._sync()
+        return self._index.candidates(volumes)
+
+
+_flight_volumes_index = _FlightVolumesIndex()
+
+
+def find_flights_possibly_intersecting(
+    volumes: Volume4DCollection,
+) -> list[FlightRecord]:
+    """Find the flights mock_uss manages which have operational intents that may intersect the specified volumes.
+
+    Flights which are returned do not necessarily intersect (exact intersection must still be evaluated), but flights
+    which are not returned certainly do not intersect.
+    """
+    result = []
+    for flight_id in _flight_volumes_index.candidates(volumes):
+        flight = flights_db.get(flight_id)
+        if flight and flight.op_intent:
+            result.append(flight)
+    return result
+
+
+def cleanup_flights(flights: MutableMapping[str, FlightRecord | None]) -> None:
+    to_cleanup = []
+
+    for flight_id, flight in flights.items():
+        if (
+            flight
+            and not flight.locked
+            and flight.op_intent
+            and flight.op_intent.reference.time_end.value.datetime + FLIGHTS_LIMIT
+            < arrow.utcnow().datetime
+        ):
+            to_cleanup.append(flight_id)
+
+    for flight_id in to_cleanup:
+        del flights[flight_id]
+
 
 TASK_DATABASE_CLEANUP = "flights database cleanup"
 
@@ -108,8 +245,9 @@ TASK_DATABASE_CLEANUP = "flights database cleanup"
 def database_cleanup() -> None:
     with db.transact() as tx:
         tx.value.cleanup_notifications()
-        tx.value.cleanup_flights()
-        tx.value.cleanup_operational_intents()
+    op_intent_cache.cleanup()
+    with flights_db.transact() as tx:
+        cleanup_flights(tx.value)
 
 
 webapp.set_task_period(TASK_DATABASE_CLEANUP, DB_CLEANUP_INTERVAL)
@@ -0,0 +1,133 @@
+import json
+from collections.abc import Iterable
+from datetime import timedelta
+
+import arrow
+from implicitdict import ImplicitDict, StringBasedDateTime
+from loguru import logger
+from uas_standards.astm.f3548.v21.api import EntityID, OperationalIntent
+
+from monitoring.monitorlib.multiprocessing import SynchronizedMap
+
+DEFAULT_MAX_ENTRIES = 2000
+"""Default maximum number of operational intents to cache at once."""
+
+DEFAULT_ENTRY_CAPACITY_BYTES = 100000
+"""Default maximum size of the JSON representation of a single cached operational intent."""
+
+DEFAULT_EXPIRATION = timedelta(hours=1)
+"""Default duration after an operational intent's end time at which it is no longer cached."""
+
+USE_RECORD_INTERVAL = timedelta(minutes=1)
+"""Use of a cached operational intent is recorded (for least-recently-used eviction) at most this often."""
+
+
+class CachedOperationalIntent(ImplicitDict):
+    op_intent: OperationalIntent
+    last_used: StringBasedDateTime
+    """Approximate time at which this operational intent was last stored or retrieved."""
+
+
+def _decode(b: bytes) -> CachedOperationalIntent:
+    return ImplicitDict.parse(json.loads(b.decode("utf-8")), CachedOperationalIntent)
+
+
+class OperationalIntentCache:
+    """Details of other USSs' operational intents, shared by all processes, keyed by operational intent ID and version.
+
+    Each operational intent occupies its own entry in shared memory, so retrieving one decodes only that operational
+    intent (and only when it has changed since this process last decoded it).  An operational intent is retrieved only
+    when its cached version matches the version requested, and stops being available once it is expired (ended longer
+    ago than the expiration duration).  When the cache is full, expired operational intents are evicted first, then
+    the least recently used.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        entry_capacity_bytes: int = DEFAULT_ENTRY_CAPACITY_BYTES,
+        expiration: timedelta = DEFAULT_EXPIRATION,
+    ):
+        self._entries = SynchronizedMap[CachedOperationalIntent](
+            max_entries=max_entries,
+            entry_capacity_bytes=entry_capacity_bytes,
+            decoder=_decode,
+        )
+        self._expiration = expiration
+
+    def _is_expired(self, op_intent: OperationalIntent, now: arrow.Arrow) -> bool:
+        return op_intent.reference.time_end.value.datetime + self._expiration < now
+
+    def get(self, op_intent_id: EntityID, version: int) -> OperationalIntent | None:
+        """Retrieve the cached details of the specified version of an operational intent, if available."""
+        cached = self._entries.get(op_intent_id)
+        if cached is None or cached.op_intent.reference.version != version:
+            return None
+        now = arrow.utcnow()
+        if self._is_expired(cached.op_intent, now):
+            return None
+        if cached.last_used.datetime + USE_RECORD_INTERVAL < now:
+            with self._entries.transact() as tx:
+                current = tx.value.get(op_intent_id)
+                if (
+                    current is not None
+                    and current.op_intent.reference.version == version
+                ):
+                    current.last_used = StringBasedDateTime(now)
+        return cached.op_intent
+
+    def put(self, op_intents: Iterable[OperationalIntent]) -> None:
+        """Cache the specified operational intents in a single transaction, evicting others as necessary."""
+        now = arrow.utcnow()
+        to_cache: dict[EntityID, CachedOperationalIntent] = {}
+        for op_intent in op_intents:
+            if self._is_expired(op_intent, now):
+                continue
+            cached = CachedOperationalIntent(
+                op_intent=op_intent, last_used=StringBasedDateTime(now)
+            )
+            if len(json.dumps(cached)) > self._entries.entry_capacity_bytes:
+                logger.warning(
+                    f"Not caching operational intent {op_intent.reference.id} because it exceeds the cache's entry capacity of {self._entries.entry_capacity_bytes} bytes"
+                )
+                continue
+            to_cache[op_intent.reference.id] = cached
+        if not to_cache:
+            return
+        if len(to_cache) > self._entries.max_entries:
+            raise ValueError(
+                f"Tried to cache {len(to_cache)} operational intents at once in a cache that can only hold {self._entries.max_entries}"
+            )
+
+        with self._entries.transact() as tx:
+            n_new = sum(1 for k in to_cache if k not in tx.value)
+            n_to_evict = len(tx.value) + n_new - self._entries.max_entries
+            if n_to_evict > 0:
+                candidates = [
+                    (not self._is_expired(v.op_intent, now), v.last_used.datetime, k)
+                    for k, v in ((k, tx.value[k]) for k in list(tx.value))
+                    if k not in to_cache
+                ]
+                candidates.sort()
+                for _, _, k in candidates[0:n_to_evict]:
+                    del tx.value[k]
+            for op_intent_id, cached in to_cache.items():
+                tx.value[op_intent_id] = cached
+
+    def remove(self, op_intent_ids: Iterable[EntityID]) -> None:
+        """Remove the specified operational intents from the cache, if present."""
+        with self._entries.transact() as tx:
+            for op_intent_id in op_intent_ids:
+                if op_intent_id in tx.value:
+                    del tx.value[op_intent_id]
+
+    def cleanup(self) -> None:
+        """Remove all expired operational intents from the cache."""
+        now = arrow.utcnow()
+        with self._entries.transact() as tx:
+            for op_intent_id in list(tx.value):
+                if self._is_expired(tx.value[op_intent_id].op_intent, now):
+                    del tx.value[op_intent_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
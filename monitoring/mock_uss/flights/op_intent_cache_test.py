@@ -0,0 +1,74 @@
+import datetime
+
+from implicitdict import ImplicitDict, StringBasedDateTime
+from uas_standards.astm.f3548.v21.api import OperationalIntent
+
+from monitoring.mock_uss.flights.op_intent_cache import OperationalIntentCache
+
+
+def _time(t: datetime.datetime) -> dict:
+    return {"value": StringBasedDateTime(t), "format": "RFC3339"}
+
+
+def _op_intent(
+    op_intent_id: str, version: int, t_end: datetime.datetime
+) -> OperationalIntent:
+    t_start = t_end - datetime.timedelta(minutes=10)
+    return ImplicitDict.parse(
+        {
+            "reference": {
+                "id": op_intent_id,
+                "manager": "uss1",
+                "uss_availability": "Normal",
+                "version": version,
+                "state": "Accepted",
+                "ovn": f"ovn{version}",
+                "time_start": _time(t_start),
+                "time_end": _time(t_end),
+                "uss_base_url": "https://uss1.example.com",
+                "subscription_id": "sub1",
+            },
+            "details": {"volumes": [], "priority": 0},
+        },
+        OperationalIntent,
+    )
+
+
+def test_versions_and_expiration():
+    now = datetime.datetime.now(datetime.UTC)
+    cache = OperationalIntentCache(
+        max_entries=10, expiration=datetime.timedelta(minutes=5)
+    )
+    cache.put(
+        [
+            _op_intent("op1", 1, now + datetime.timedelta(minutes=10)),
+            _op_intent("op2", 1, now - datetime.timedelta(minutes=10)),
+        ]
+    )
+    assert len(cache) == 1
+    cached = cache.get("op1", 1)
+    assert cached is not None and cached.reference.ovn == "ovn1"
+    assert cache.get("op1", 2) is None
+    assert cache.get("op2", 1) is None
+
+    cache.put([_op_intent("op1", 2, now + datetime.timedelta(minutes=10))])
+    assert cache.get("op1", 1) is None
+    cached = cache.get("op1", 2)
+    assert cached is not None and cached.reference.ovn == "ovn2"
+
+    cache.remove(["op1", "op3"])
+    assert len(cache) == 0
+
+
+def test_eviction():
+    now = datetime.datetime.now(datetime.UTC)
+    cache = OperationalIntentCache(max_entries=3)
+    t_end = now + datetime.timedelta(minutes=10)
+    cache.put([_op_intent("op0", 1, t_end)])
+    cache.put([_op_intent(f"op{i}", 1, t_end) for i in range(1, 3)])
+    cache.put([_op_intent("op3", 1, t_end)])
+    assert len(cache) == 3
+    # Least recently used operational intent is evicted first
+    assert cache.get("op0", 1) is None
+    for i in range(1, 4):
+        assert cache.get(f"op{i}", 1) is not None
@@ -1,6 +1,6 @@
 import json
+import os
 from collections.abc import Callable
-from datetime import UTC, datetime
 
 import arrow
 from implicitdict import ImplicitDict
@@ -9,10 +9,10 @@ from monitoring.mock_uss.flights.database import (
     DEADLOCK_TIMEOUT,
     FlightRecord,
     MockUSSFlightID,
-    db,
+    flight_locks,
+    flights_db,
 )
 from monitoring.monitorlib.clients.flight_planning.flight_info import FlightInfo
-from monitoring.monitorlib.delay import sleep
 from monitoring.monitorlib.temporal import Time
 
 
@@ -49,65 +49,54 @@ def adjust_flight_info(info: FlightInfo) -> FlightInfo:
 def lock_flight(flight_id: MockUSSFlightID, log: Callable[[str], None]) -> FlightRecord:
     # If this is a change to an existing flight, acquire lock to that flight
     log(f"Acquiring lock for flight {flight_id}")
-    deadline = datetime.now(UTC) + DEADLOCK_TIMEOUT
-    while True:
-        with db.transact() as tx:
-            if flight_id in tx.value.flights:
+    flight_locks.acquire(
+        flight_id,
+        timeout=DEADLOCK_TIMEOUT,
+        description=f"inject_flight from process {os.getpid()}",
+    )
+    try:
+        with flights_db.transact() as tx:
+            existing_flight = tx.value.get(flight_id, None)
+            if existing_flight:
                 # This is an existing flight being modified
-                existing_flight = tx.value.flights[flight_id]
-                if existing_flight and not existing_flight.locked:
-                    log("Existing flight locked for update")
-                    existing_flight.locked = True
-                    break
+                log("Existing flight locked for update")
+                existing_flight.locked = True
             else:
                 log("Request is for a new flight (lock established)")
-                tx.value.flights[flight_id] = None
-                existing_flight = None
-                break
-        # We found an existing flight but it was locked; wait for it to become
-        # available
-        sleep(0.5, f"flight {flight_id} is currently already locked")
-
-        if datetime.now(UTC) > deadline:
-            raise RuntimeError(
-                f"Deadlock in inject_flight while attempting to gain access to flight {flight_id}"
-            )
+                tx.value[flight_id] = None
+    except BaseException:
+        flight_locks.release(flight_id)
+        raise
     return existing_flight
 
 
 def release_flight_lock(flight_id: MockUSSFlightID, log: Callable[[str], None]) -> None:
-    with db.transact() as tx:
-        if flight_id in tx.value.flights:
-            flight = tx.value.flights[flight_id]
-            if flight:
-                # FlightRecord was a true existing flight
-                log(f"Releasing lock on existing flight_id {flight_id}")
-                flight.locked = False
-            else:
-                # FlightRecord was just a placeholder for a new flight
-                log(f"Releasing placeholder for existing flight_id {flight_id}")
-                del tx.value.flights[flight_id]
+    try:
+        with flights_db.transact() as tx:
+            if flight_id in tx.value:
+                flight = tx.value[flight_id]
+                if flight:
+                    # FlightRecord was a true existing flight
+                    log(f"Releasing lock on existing flight_id {flight_id}")
+                    flight.locked = False
+                else:
+                    # FlightRecord was just a placeholder for a new flight
+                    log(f"Releasing placeholder for existing flight_id {flight_id}")
+                    del tx.value[flight_id]
+    finally:
+        flight_locks.release(flight_id)
 
 
 def delete_flight_record(flight_id: MockUSSFlightID) -> FlightRecord | None:
-    deadline = datetime.now(UTC) + DEADLOCK_TIMEOUT
-    while True:
-        with db.transact() as tx:
-            if flight_id in tx.value.flights:
-                flight = tx.value.flights[flight_id]
-                if flight and not flight.locked:
-                    # FlightRecord was a true existing flight not being mutated anywhere else
-                    del tx.value.flights[flight_id]
-                    return flight
-            else:
-                # No FlightRecord found
-                return None
-        # There is a race condition with another handler to create or modify the requested flight; wait for that to resolve
-        sleep(
-            0.5,
-            f"flight {flight_id} is currently already locked while we are trying to delete it",
-        )
-        if datetime.now(UTC) > deadline:
-            raise RuntimeError(
-                f"Deadlock in delete_flight while attempting to gain access to flight {flight_id} (now: {datetime.now(UTC)}, deadline: {deadline})"
-            )
+    # Wait for any other handler creating or modifying the requested flight to finish
+    with flight_locks.hold(
+        flight_id,
+        timeout=DEADLOCK_TIMEOUT,
+        description=f"delete_flight from process {os.getpid()}",
+    ):
+        with flights_db.transact() as tx:
+            flight = tx.value.get(flight_id, None)
+            if flight_id in tx.value:
+                # Remove the FlightRecord (or a placeholder abandoned by a process that no longer exists)
+                del tx.value[flight_id]
+            return flight
@@ -1,6 +1,4 @@
 import datetime
-import json
-import os
 
 import flask
 
@@ -13,12 +11,12 @@ from monitoring.monitorlib.clients.mock_uss.interactions import (
     QueryDirection,
 )
 from monitoring.monitorlib.fetch import Query, QueryType, describe_flask_query
+from monitoring.monitorlib.segmented_log import SegmentedLog
 
 require_config_value(KEY_INTERACTIONS_LOG_DIR)
 
-# We use dashes between hours, minutes and seconds, because colons might be problematic for Windows,
-# and the CI is unhappy about them in filenames.
-LOGGED_INTERACTION_FILENAME_TIMESTAMP_FORMAT = "%Y-%m-%dT%H-%M-%S.%fZ"
+interactions_log = SegmentedLog(webapp.config[KEY_INTERACTIONS_LOG_DIR])
+"""Log of interactions shared by all processes of this mock_uss instance."""
 
 
 def log_interaction(direction: QueryDirection, query: Query) -> None:
@@ -34,17 +32,7 @@ def log_interaction(direction: QueryDirection, query: Query) -> None:
 
 
 def log_file(code: str, content: Interaction) -> None:
-    log_path = webapp.config[KEY_INTERACTIONS_LOG_DIR]
-    n = len(os.listdir(log_path))
-    basename = "{:06d}_{}_{}.json".format(
-        n,
-        code,
-        content.interaction_time().strftime(
-            LOGGED_INTERACTION_FILENAME_TIMESTAMP_FORMAT
-        ),
-    )
-    with open(os.path.join(log_path, basename), "w") as f:
-        json.dump(content, f)
+    interactions_log.append(content, content.interaction_time(), code)
 
 
 class InteractionLoggingHook(QueryHook):
@@ -1,7 +1,7 @@
 from monitoring.mock_uss.app import require_config_value, webapp
 from monitoring.mock_uss.config import KEY_AUTH_SPEC, KEY_DSS_URL
 from monitoring.mock_uss.riddp.config import KEY_RID_VERSION
-from monitoring.monitorlib import auth
+from monitoring.monitorlib import auth, geo
 from monitoring.monitorlib.infrastructure import utm_client_session_factory
 from monitoring.monitorlib.rid import RIDVersion
 
@@ -24,3 +24,6 @@ utm_client = utm_client_session_factory.get_session(
     _dss_base_url,
     auth.make_auth_adapter(webapp.config[KEY_AUTH_SPEC]),
 )
+
+# Load the geoid model used for MSL altitudes before workers are forked so they all share it
+geo.load_egm96()
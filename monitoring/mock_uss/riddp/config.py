@@ -2,9 +2,13 @@ from monitoring.mock_uss.app import import_environment_variable
 from monitoring.monitorlib.rid import RIDVersion
 
 KEY_RID_VERSION = "MOCK_USS_RID_VERSION"
+KEY_FETCH_CONCURRENCY = "MOCK_USS_RIDDP_FETCH_CONCURRENCY"
+KEY_FETCH_DEADLINE = "MOCK_USS_RIDDP_FETCH_DEADLINE_SECONDS"
 
 import_environment_variable(
     KEY_RID_VERSION,
     default=RIDVersion.f3411_19,
     mutator=lambda s: RIDVersion(s),
 )
+import_environment_variable(KEY_FETCH_CONCURRENCY, default="8", mutator=int)
+import_environment_variable(KEY_FETCH_DEADLINE, default="10", mutator=float)
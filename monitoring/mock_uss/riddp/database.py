@@ -1,50 +1,118 @@
+from __future__ import annotations
+
 import json
 
-from implicitdict import ImplicitDict
+from implicitdict import ImplicitDict, Optional, StringBasedDateTime
 
 from monitoring.monitorlib.fetch.rid import ISA
 from monitoring.monitorlib.geo import LatLngBoundingBox
-from monitoring.monitorlib.multiprocessing import SynchronizedValue
+from monitoring.monitorlib.multiprocessing import SynchronizedLocks, SynchronizedValue
 from monitoring.monitorlib.mutate.rid import ChangedSubscription, UpdatedISA
 
 from .behavior import DisplayProviderBehavior
 
+MAX_RETAINED_UPDATES = 20
+"""Number of most recent ISA notifications retained, for diagnostic purposes, by each subscription."""
+
 
 class FlightInfo(ImplicitDict):
     flights_url: str
 
 
 class ObservationSubscription(ImplicitDict):
+    subscription_id: str
+    """ID of the DSS subscription."""
+
+    time_end: StringBasedDateTime
+    """Time at which the DSS subscription expires."""
+
     bounds: LatLngBoundingBox
 
     upsert_result: ChangedSubscription
 
     updates: list[UpdatedISA]
+    """Most recent ISA notifications received for this subscription (at most MAX_RETAINED_UPDATES)."""
+
+    isas: dict[str, ISA]
+    """ISAs currently relevant to this subscription, by ISA ID, reflecting all notifications applied so far."""
+
+    isa_notification_indices: dict[str, int]
+    """Notification index of the most recent change applied to each ISA (including removed ISAs), by ISA ID."""
+
+    @staticmethod
+    def from_upsert_result(
+        bounds: LatLngBoundingBox, upsert_result: ChangedSubscription
+    ) -> ObservationSubscription:
+        subscription = upsert_result.subscription
+        if subscription is None:
+            raise ValueError(
+                "Cannot track observation subscription when upsert result did not contain a subscription"
+            )
+        notification_index = subscription.notification_index
+        isas = {isa.id: isa for isa in upsert_result.isas}
+        return ObservationSubscription(
+            subscription_id=subscription.id,
+            time_end=StringBasedDateTime(subscription.time_end),
+            bounds=bounds,
+            upsert_result=upsert_result,
+            updates=[],
+            isas=isas,
+            isa_notification_indices={isa_id: notification_index for isa_id in isas},
+        )
+
+    def apply_update(
+        self,
+        update: UpdatedISA,
+        isa_id: str,
+        isa: ISA | None,
+        notification_index: int,
+    ) -> None:
+        """Apply a notified change to an ISA, unless a later change to that ISA has already been applied.
+
+        Args:
+            update: Notification received.
+            isa_id: ID of the ISA that changed.
+            isa: New state of the ISA, or None if the ISA was removed.
+            notification_index: Notification index of this subscription indicated in the notification.
+        """
+        self.updates.append(update)
+        if len(self.updates) > MAX_RETAINED_UPDATES:
+            self.updates = self.updates[-MAX_RETAINED_UPDATES:]
+
+        if self.isa_notification_indices.get(isa_id, -1) >= notification_index:
+            return  # Notifications arrived out of order; this change is already superseded
+        self.isa_notification_indices[isa_id] = notification_index
+        if isa is None:
+            self.isas.pop(isa_id, None)
+        else:
+            self.isas[isa_id] = isa
 
     def get_isas(self) -> list[ISA]:
-        isas = [isa for isa in self.upsert_result.isas]
-        # TODO: consider sorting updates by notification index
-        for update in self.updates:
-            current_isas = []
-            isa_already_exists = False
-            for isa in isas:
-                if update.isa_id == isa.id:
-                    isa_already_exists = True
-                    if update.isa is not None:
-                        current_isas.append(update.isa)
-                    else:
-                        pass  # Exclude this ISA since the update removed it
-                else:
-                    current_isas.append(isa)
-            if not isa_already_exists:
-                current_isas.append(update.isa)
-            isas = current_isas
-        return isas
+        return list(self.isas.values())
 
     @property
     def flights_urls(self) -> dict[str, str]:
         """Returns map of flights URL to owning USS"""
-        return {isa.flights_url: isa.owner for isa in self.get_isas()}
+        return {isa.flights_url: isa.owner for isa in self.isas.values()}
+
+
+class PendingISAUpdate(ImplicitDict):
+    """ISA notification received for a subscription which was still being created (see `ObservationSubscription.apply_update`)."""
+
+    notification: UpdatedISA
+    isa_id: str
+    isa: Optional[ISA] = None
+    notification_index: int
+
+
+class PendingSubscription(ImplicitDict):
+    """DSS subscription being created, which may receive ISA notifications before it is recorded in the database."""
+
+    time_end: StringBasedDateTime
+    """Time after which this entry may be discarded if the subscription was never recorded."""
+
+    updates: list[PendingISAUpdate]
+    """ISA notifications received for this subscription so far, to be applied once it is recorded."""
 
 
 class Database(ImplicitDict):
@@ -54,8 +122,52 @@ class Database(ImplicitDict):
     behavior: DisplayProviderBehavior = DisplayProviderBehavior()
     subscriptions: list[ObservationSubscription]
 
+    pending_subscriptions: dict[str, PendingSubscription] = {}
+    """DSS subscriptions being created, by subscription ID."""
+
+    def apply_isa_update(
+        self,
+        notification_indices: dict[str, int],
+        update: UpdatedISA,
+        isa_id: str,
+        isa: ISA | None,
+    ) -> bool:
+        """Apply a notified change to an ISA to each subscription notified, or retain it for subscriptions still being created.
+
+        Args:
+            notification_indices: Notification index indicated in the notification, by ID of each subscription notified.
+            update: Notification received.
+            isa_id: ID of the ISA that changed.
+            isa: New state of the ISA, or None if the ISA was removed.
+
+        Returns: True if any subscription notified was found.
+        """
+        found = False
+        for subscription in self.subscriptions:
+            subscription_id = subscription.subscription_id
+            if subscription_id in notification_indices:
+                subscription.apply_update(
+                    update, isa_id, isa, notification_indices[subscription_id]
+                )
+                found = True
+        for subscription_id, pending in self.pending_subscriptions.items():
+            if subscription_id in notification_indices:
+                pending.updates.append(
+                    PendingISAUpdate(
+                        notification=update,
+                        isa_id=isa_id,
+                        isa=isa,
+                        notification_index=notification_indices[subscription_id],
+                    )
+                )
+                found = True
+        return found
+
 
 db = SynchronizedValue[Database](
     Database(flights={}, subscriptions=[]),
     decoder=lambda b: ImplicitDict.parse(json.loads(b.decode("utf-8")), Database),
 )
+
+subscription_creation_locks = SynchronizedLocks(max_keys=100)
+"""Locks held while creating a subscription for views in an area, so concurrent requests share one new subscription."""
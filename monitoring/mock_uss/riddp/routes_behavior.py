@@ -28,4 +28,4 @@ def riddp_set_dp_behavior() -> tuple[str, int] | flask.Response:
 @webapp.route("/riddp/behavior", methods=["GET"])
 def riddp_get_dp_behavior() -> flask.Response:
     """Get the behavior of the mock Display Provider."""
-    return flask.jsonify(db.value.behavior)
+    return flask.jsonify(db.snapshot.behavior)
@@ -1,9 +1,14 @@
+import concurrent.futures
+import math
+import os
+import time
 import uuid
 from datetime import timedelta
 
 import arrow
 import flask
 import s2sphere
+from implicitdict import ImplicitDict, Optional, StringBasedDateTime
 from loguru import logger
 from uas_standards.astm.f3411.v19.api import ErrorResponse
 from uas_standards.astm.f3411.v19.constants import Scope
@@ -24,23 +29,38 @@ from uas_standards.interuss.automated_testing.rid.v1.observation import (
 from monitoring.mock_uss.app import webapp
 from monitoring.mock_uss.auth import requires_scope
 from monitoring.mock_uss.config import KEY_BASE_URL
-from monitoring.mock_uss.riddp.database import ObservationSubscription
+from monitoring.mock_uss.riddp.database import (
+    ObservationSubscription,
+    PendingSubscription,
+)
+from monitoring.mock_uss.worker_pool import WorkerPool
 from monitoring.monitorlib import geo
 from monitoring.monitorlib.fetch import rid as fetch
-from monitoring.monitorlib.fetch.rid import Flight
+from monitoring.monitorlib.fetch.rid import FetchedUSSFlights, Flight
 from monitoring.monitorlib.formatting import limit_resolution
-from monitoring.monitorlib.geo import egm96_geoid_offset
 from monitoring.monitorlib.mutate import rid as mutate
 from monitoring.monitorlib.rid import RIDVersion
 
 from . import clustering, database, utm_client
 from .behavior import DisplayProviderBehavior
-from .config import KEY_RID_VERSION
+from .config import KEY_FETCH_CONCURRENCY, KEY_FETCH_DEADLINE, KEY_RID_VERSION
 from .database import db
+from .subscription_index import find_subscription
+
+SUBSCRIPTION_CREATION_CELL_DEG = 0.01
+"""Views centered in the same cell (degrees of latitude and longitude) of this size wait for each other to create subscriptions."""
+
+SUBSCRIPTION_CREATION_TIMEOUT = timedelta(seconds=30)
+"""Maximum time to wait for another request to finish creating a subscription."""
+
+FETCH_TIMEOUT_GRACE_SECONDS = 1
+"""Queries for USSs' flights time out this long after the display data deadline."""
+
+_fetch_pool = WorkerPool(KEY_FETCH_CONCURRENCY, "riddp_fetch_flights")
 
 
 def _make_flight_observation(
-    flight: Flight, view: s2sphere.LatLngRect
+    flight: Flight, view: s2sphere.LatLngRect, geoid_offset: float
 ) -> observation_api.Flight:
     paths: list[list[observation_api.Position]] = []
     current_path: list[observation_api.Position] = []
@@ -74,7 +94,7 @@ def _make_flight_observation(
         paths.append(current_path)
 
     p = flight.most_recent_position
-    msl_alt_m = p.alt - egm96_geoid_offset(s2sphere.LatLng.from_degrees(p.lat, p.lng))
+    msl_alt_m = p.alt - geoid_offset
     msl_alt = MSLAltitude(meters=msl_alt_m, reference_datum=AltitudeReference.EGM96)
     current_state = observation_api.CurrentState(
         timestamp=p.time.isoformat(),
@@ -107,6 +127,161 @@ def _make_flight_observation(
     )
 
 
+def _create_subscription(
+    view: s2sphere.LatLngRect, rid_version: RIDVersion
+) -> ObservationSubscription | tuple[flask.Response, int]:
+    """Create a new DSS subscription covering the view and record it in the database (without holding the database lock while communicating with the DSS)."""
+    buffer_m = (
+        1000  # meters beyond the view box triggering creation of this subscription
+    )
+    dt = timedelta(seconds=30)  # duration of new subscription
+    sub_bounds = geo.LatLngBoundingBox.from_latlng_rect(view).expand(
+        buffer_m, buffer_m, buffer_m, buffer_m
+    )
+    subscription_id = str(uuid.uuid4())
+    time_end = arrow.utcnow() + dt
+
+    # ISA notifications for the new subscription may arrive before it is recorded below, so they are retained until then
+    with db.transact() as tx:
+        tx.value.pending_subscriptions[subscription_id] = PendingSubscription(
+            time_end=StringBasedDateTime(time_end.datetime), updates=[]
+        )
+    try:
+        upsert_result = mutate.upsert_subscription(
+            area_vertices=sub_bounds.to_vertices(),
+            alt_lo=0,
+            alt_hi=100000,
+            start_time=None,
+            end_time=time_end.datetime,
+            uss_base_url=webapp.config[KEY_BASE_URL] + "/mock/riddp",
+            subscription_id=subscription_id,
+            rid_version=rid_version,
+            utm_client=utm_client,
+        )
+        if not upsert_result.success:
+            msg = f"Error establishing ISA subscription in DSS: {upsert_result.errors}"
+            logger.error(msg)
+            response = ErrorResponse(message=msg)
+            response["upsert_subscription"] = upsert_result
+            _discard_pending_subscription(subscription_id)
+            return flask.jsonify(response), 412
+        logger.debug(
+            f"New subscription indicated ISAs: {','.join(isa.id for isa in upsert_result.isas)}"
+        )
+        subscription = ObservationSubscription.from_upsert_result(
+            sub_bounds, upsert_result
+        )
+    except BaseException:
+        _discard_pending_subscription(subscription_id)
+        raise
+
+    with db.transact() as tx:
+        now = arrow.utcnow().datetime
+        pending = tx.value.pending_subscriptions.pop(subscription_id, None)
+        if pending and pending.updates:
+            for u in pending.updates:
+                subscription.apply_update(
+                    u.notification, u.isa_id, u.isa, u.notification_index
+                )
+            logger.debug(
+                f"Applied {len(pending.updates)} ISA notifications received while creating subscription {subscription_id}"
+            )
+        tx.value.subscriptions = [
+            s for s in tx.value.subscriptions if s.time_end.datetime > now
+        ]
+        tx.value.subscriptions.append(subscription)
+    return subscription
+
+
+def _discard_pending_subscription(subscription_id: str) -> None:
+    """Stop retaining ISA notifications for a subscription that will not be recorded, along with any expired entries."""
+    with db.transact() as tx:
+        now = arrow.utcnow().datetime
+        tx.value.pending_subscriptions = {
+            k: v
+            for k, v in tx.value.pending_subscriptions.items()
+            if k != subscription_id and v.time_end.datetime > now
+        }
+
+
+class USSFlightsFetch(ImplicitDict):
+    """Debugging information about the retrieval of flights from one USS's flights URL for a display data request."""
+
+    flights_url: str
+
+    uss: str
+    """Owner of the ISA indicating flights_url."""
+
+    elapsed_s: float
+    """Time taken to retrieve flights, or time waited before giving up if retrieval did not complete."""
+
+    completed: bool
+    """True if retrieval completed (successfully or not) before the deadline; otherwise the USS's flights were omitted."""
+
+    flights_response: Optional[FetchedUSSFlights] = None
+    """Response from the USS, if retrieval completed before the deadline.  Not included in display data responses."""
+
+
+def _fetch_timings(fetches: dict[str, USSFlightsFetch]) -> list[dict]:
+    return [
+        {k: v for k, v in f.items() if k != "flights_response"}
+        for f in fetches.values()
+    ]
+
+
+def _fetch_uss_flights(
+    flights_urls: dict[str, str], view: s2sphere.LatLngRect, rid_version: RIDVersion
+) -> dict[str, USSFlightsFetch]:
+    """Retrieve flights in the view from each flights URL concurrently, waiting no longer than the configured deadline.
+
+    Args:
+        flights_urls: Map of flights URL to owning USS.
+        view: Area in which flights should be retrieved.
+        rid_version: Version of F3411 with which to retrieve flights.
+
+    Returns: Result of retrieving flights from each flights URL, by flights URL.
+    """
+    t0 = time.monotonic()
+    deadline = t0 + webapp.config[KEY_FETCH_DEADLINE]
+
+    def fetch_flights(flights_url: str) -> tuple[FetchedUSSFlights, float]:
+        t_start = time.monotonic()
+        # Give up on the query shortly after the deadline so workers are not occupied indefinitely
+        timeout_s = max(deadline - t_start, 0) + FETCH_TIMEOUT_GRACE_SECONDS
+        flights_response = fetch.uss_flights(
+            flights_url, view, True, rid_version, utm_client, timeout_seconds=timeout_s
+        )
+        return flights_response, time.monotonic() - t_start
+
+    executor = _fetch_pool.get()
+    futures = {
+        flights_url: executor.submit(fetch_flights, flights_url)
+        for flights_url in flights_urls
+    }
+    concurrent.futures.wait(futures.values(), timeout=max(deadline - t0, 0))
+
+    results: dict[str, USSFlightsFetch] = {}
+    for flights_url, future in futures.items():
+        if future.done():
+            flights_response, elapsed_s = future.result()
+            results[flights_url] = USSFlightsFetch(
+                flights_url=flights_url,
+                uss=flights_urls[flights_url],
+                elapsed_s=elapsed_s,
+                completed=True,
+                flights_response=flights_response,
+            )
+        else:
+            future.cancel()
+            results[flights_url] = USSFlightsFetch(
+                flights_url=flights_url,
+                uss=flights_urls[flights_url],
+                elapsed_s=time.monotonic() - t0,
+                completed=False,
+            )
+    return results
+
+
 @webapp.route("/riddp/observation/display_data", methods=["GET"])
 @requires_scope(Scope.Read)
 def riddp_display_data() -> tuple[flask.Response, int]:
@@ -135,72 +310,54 @@ def riddp_display_data() -> tuple[flask.Response, int]:
             413,
         )
 
-    with db.transact() as tx:
-        # Find an existing subscription to serve this request
-        subscription: ObservationSubscription | None = None
-        t_max = (
-            arrow.utcnow() + timedelta(seconds=1)
-        ).datetime  # Don't rely on subscriptions very near their expiration
-        tx.value.subscriptions = [
-            s
-            for s in tx.value.subscriptions
-            if s.upsert_result.subscription
-            and s.upsert_result.subscription.time_end > t_max
-        ]
-        for existing_subscription in tx.value.subscriptions:
-            assert isinstance(existing_subscription, ObservationSubscription)
-            sub_rect = existing_subscription.bounds.to_latlngrect()
-            if sub_rect.contains(view):
-                subscription = existing_subscription
-                logger.debug(
-                    f"Existing subscription {subscription.upsert_result.subscription.id} indicates ISAs: {','.join(isa.id for isa in subscription.get_isas())}"
-                )
-                break
-
-        # No existing subscription suffices; create a new one
-        if subscription is None:
-            buffer_m = 1000  # meters beyond the view box triggering creation of this subscription
-            dt = timedelta(seconds=30)  # duration of new subscription
-            sub_bounds = geo.LatLngBoundingBox.from_latlng_rect(view).expand(
-                buffer_m, buffer_m, buffer_m, buffer_m
-            )
-            upsert_result = mutate.upsert_subscription(
-                area_vertices=sub_bounds.to_vertices(),
-                alt_lo=0,
-                alt_hi=100000,
-                start_time=None,
-                end_time=(arrow.utcnow() + dt).datetime,
-                uss_base_url=webapp.config[KEY_BASE_URL] + "/mock/riddp",
-                subscription_id=str(uuid.uuid4()),
-                rid_version=rid_version,
-                utm_client=utm_client,
-            )
-            if not upsert_result.success:
-                msg = f"Error establishing ISA subscription in DSS: {upsert_result.errors}"
-                logger.error(msg)
-                response = ErrorResponse(message=msg)
-                response["upsert_subscription"] = upsert_result
-                return flask.jsonify(response), 412
-            logger.debug(
-                f"New subscription indicated ISAs: {','.join(isa.id for isa in upsert_result.isas)}"
-            )
-            subscription = ObservationSubscription(
-                bounds=sub_bounds, upsert_result=upsert_result, updates=[]
-            )
-            tx.value.subscriptions.append(subscription)
+    # Find an existing subscription to serve this request
+    t_max = (
+        arrow.utcnow() + timedelta(seconds=1)
+    ).datetime  # Don't rely on subscriptions very near their expiration
+    subscription = find_subscription(view, t_max)
+    if subscription is None:
+        # Only one request at a time creates a subscription for views in this area; concurrent requests wait for it
+        center = view.get_center()
+        area_key = f"{math.floor(center.lat().degrees / SUBSCRIPTION_CREATION_CELL_DEG)},{math.floor(center.lng().degrees / SUBSCRIPTION_CREATION_CELL_DEG)}"
+        with database.subscription_creation_locks.hold(
+            area_key,
+            timeout=SUBSCRIPTION_CREATION_TIMEOUT,
+            description=f"riddp_display_data creating subscription from process {os.getpid()}",
+        ):
+            # A subscription may have been created while waiting
+            subscription = find_subscription(view, t_max)
+            if subscription is None:
+                subscription_or_error = _create_subscription(view, rid_version)
+                if not isinstance(subscription_or_error, ObservationSubscription):
+                    return subscription_or_error
+                subscription = subscription_or_error
+    else:
+        logger.debug(
+            f"Existing subscription {subscription.subscription_id} indicates ISAs: {','.join(subscription.isas)}"
+        )
 
-    # Fetch flights from each unique flights URL
+    # Fetch flights from each unique flights URL concurrently
     validated_flights: list[Flight] = []
-    tx = db.value
+    tx = db.snapshot
     flight_info: dict[str, database.FlightInfo] = {k: v for k, v in tx.flights.items()}
     behavior: DisplayProviderBehavior = tx.behavior
 
-    for flights_url, uss in subscription.flights_urls.items():
-        if uss in behavior.do_not_display_flights_from:
+    hidden_usss = behavior.do_not_display_flights_from or []
+    flights_urls = {
+        flights_url: uss
+        for flights_url, uss in subscription.flights_urls.items()
+        if uss not in hidden_usss
+    }
+    fetches = _fetch_uss_flights(flights_urls, view, rid_version)
+
+    for flights_url, uss in flights_urls.items():
+        fetch_result = fetches[flights_url]
+        flights_response = fetch_result.flights_response
+        if flights_response is None:
+            logger.warning(
+                f"Omitting flights from {flights_url} of {uss} because they were not retrieved within {webapp.config[KEY_FETCH_DEADLINE]} seconds"
+            )
             continue
-        flights_response = fetch.uss_flights(
-            flights_url, view, True, rid_version, utm_client
-        )
         if not flights_response.success:
             msg = (
                 f"Error querying {flights_url} from {uss}: {flights_response.errors[0]}"
@@ -208,6 +365,7 @@ def riddp_display_data() -> tuple[flask.Response, int]:
             logger.error(msg)
             response = ErrorResponse(message=msg)
             response["fetched_uss_flights"] = flights_response
+            response["uss_flights_fetches"] = _fetch_timings(fetches)
             return flask.jsonify(response), 412
         for flight in flights_response.flights:
             flight_errors = flight.errors()
@@ -220,6 +378,7 @@ def riddp_display_data() -> tuple[flask.Response, int]:
                 response = ErrorResponse(message=msg)
                 response["flight_validation_errors"] = flight_errors
                 response["fetched_uss_flights"] = flights_response
+                response["uss_flights_fetches"] = _fetch_timings(fetches)
                 return flask.jsonify(response), 412
             validated_flights.append(flight)
             flight_info[flight.id] = database.FlightInfo(flights_url=flights_url)
@@ -230,7 +389,15 @@ def riddp_display_data() -> tuple[flask.Response, int]:
             tx.value.flights[k] = v
 
     # Make and return response
-    flights = [_make_flight_observation(f, view) for f in validated_flights]
+    positions = [f.most_recent_position for f in validated_flights]
+    geoid_offsets = geo.egm96_geoid_offsets(
+        [p.lat if p else math.nan for p in positions],
+        [p.lng if p else math.nan for p in positions],
+    )
+    flights = [
+        _make_flight_observation(f, view, geoid_offset)
+        for f, geoid_offset in zip(validated_flights, geoid_offsets.tolist())
+    ]
     if behavior.always_omit_recent_paths:
         for f in flights:
             f.recent_paths = None
@@ -241,6 +408,7 @@ def riddp_display_data() -> tuple[flask.Response, int]:
         # Construct clusters response
         clusters = clustering.make_clusters(flights, view.lo(), view.hi(), rid_version)
         response = observation_api.GetDisplayDataResponse(clusters=clusters)
+    response["uss_flights_fetches"] = _fetch_timings(fetches)
     return flask.jsonify(response), 200
 
 
@@ -248,7 +416,7 @@ def riddp_display_data() -> tuple[flask.Response, int]:
 @requires_scope(Scope.Read)
 def riddp_flight_details(flight_id: str) -> tuple[str, int] | flask.Response:
     """Implements get flight details endpoint per automated testing API."""
-    tx = db.value
+    tx = db.snapshot
     flight_info = tx.flights.get(flight_id)
     if not flight_info:
         return f'Flight "{flight_id}" not found', 404
@@ -13,6 +13,7 @@ from monitoring.mock_uss.auth import requires_scope
 from monitoring.mock_uss.logging import query_type
 from monitoring.mock_uss.riddp.database import db
 from monitoring.monitorlib.fetch import QueryType, describe_flask_query
+from monitoring.monitorlib.fetch.rid import ISA
 from monitoring.monitorlib.mutate.rid import UpdatedISA
 
 
@@ -37,25 +38,28 @@ def riddp_notify_isa_v22a(id: str):
         msg = f"Unable to parse PutIdentificationServiceAreaNotificationParameters JSON request: {e}"
         return msg, 400
 
-    subscription_ids = [s.subscription_id for s in put_params.subscriptions]
-    if subscription_ids:
+    notification_indices = {
+        s.subscription_id: s.notification_index or 0 for s in put_params.subscriptions
+    }
+    if notification_indices:
+        isa = (
+            ISA(v22a_value=put_params.service_area)
+            if "service_area" in put_params and put_params.service_area
+            else None
+        )
+        query = describe_flask_query(flask.request, flask.jsonify(None), 0)
         with db.transact() as tx:
-            updated = False
-
-            for subscription in tx.value.subscriptions:
-                if not subscription.upsert_result.subscription:
-                    continue
-                if subscription.upsert_result.subscription.id in subscription_ids:
-                    query = describe_flask_query(flask.request, flask.jsonify(None), 0)
-                    subscription.updates.append(UpdatedISA(v22a_query=query))
-                    logger.debug(
-                        f"Updated subscription {subscription.upsert_result.subscription.id} with ISA {id}"
-                    )
-                    updated = True
-            if not updated:
-                logger.warning(
-                    f"Update for ISA {id} specified non-existent subscriptions {','.join(subscription_ids)}"
-                )
+            updated = tx.value.apply_isa_update(
+                notification_indices, UpdatedISA(v22a_query=query), id, isa
+            )
+        if updated:
+            logger.debug(
+                f"Updated subscriptions {','.join(notification_indices)} with ISA {id}"
+            )
+        else:
+            logger.warning(
+                f"Update for ISA {id} specified non-existent subscriptions {','.join(notification_indices)}"
+            )
 
     return (
         flask.jsonify(None),
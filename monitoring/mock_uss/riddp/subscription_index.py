@@ -0,0 +1,61 @@
+import bisect
+import datetime
+from collections.abc import Iterable
+
+import s2sphere
+
+from .database import Database, ObservationSubscription, db
+
+
+class SubscriptionIndex:
+    """In-process index of observation subscriptions by the areas they cover.
+
+    Subscriptions are sorted by the southern edge of their bounds.  A subscription can only contain a view when its
+    southern edge is south of the view's southern edge and its northern edge is north of the view's northern edge, so
+    only subscriptions with southern edges between (view north edge - tallest subscription) and (view south edge) are
+    candidates to contain a view.
+    """
+
+    def __init__(self, subscriptions: Iterable[ObservationSubscription]):
+        entries = sorted(
+            ((s.bounds.lat_min, i, s) for i, s in enumerate(subscriptions)),
+            key=lambda e: (e[0], e[1]),
+        )
+        self._lat_mins = [e[0] for e in entries]
+        self._subscriptions = [e[2] for e in entries]
+        self._max_lat_extent = max(
+            (s.bounds.lat_max - s.bounds.lat_min for s in self._subscriptions),
+            default=0,
+        )
+
+    def containing(
+        self, view: s2sphere.LatLngRect, expiring_after: datetime.datetime
+    ) -> ObservationSubscription | None:
+        """Find a subscription containing the entire view which does not expire until after the specified time."""
+        i0 = bisect.bisect_left(
+            self._lat_mins, view.lat_hi().degrees - self._max_lat_extent
+        )
+        i1 = bisect.bisect_right(self._lat_mins, view.lat_lo().degrees)
+        for subscription in self._subscriptions[i0:i1]:
+            if subscription.time_end.datetime <= expiring_after:
+                continue
+            if subscription.bounds.to_latlngrect().contains(view):
+                return subscription
+        return None
+
+
+_index: tuple[Database, SubscriptionIndex] | None = None
+"""Most recent database snapshot in this process, and the index of its subscriptions."""
+
+
+def find_subscription(
+    view: s2sphere.LatLngRect, expiring_after: datetime.datetime
+) -> ObservationSubscription | None:
+    """Find a subscription in the database containing the entire view which does not expire until after the specified time."""
+    global _index
+    snapshot = db.snapshot
+    index = _index
+    if index is None or index[0] is not snapshot:
+        index = (snapshot, SubscriptionIndex(snapshot.subscriptions))
+        _index = index
+    return index[1].containing(view, expiring_after)
@@ -0,0 +1,100 @@
+import threading
+from dataclasses import dataclass
+
+import s2sphere
+
+from monitoring.monitorlib.rid_automated_testing.flight_index import (
+    DetailsTimeline,
+    FlightIndex,
+)
+from monitoring.monitorlib.rid_automated_testing.injection_api import TestFlight
+from monitoring.monitorlib.rid_automated_testing.telemetry import CompiledTelemetry
+
+from .database import Database, db
+
+
+@dataclass(eq=False)
+class InjectedFlight:
+    test_id: str
+    flight: TestFlight
+    telemetry: CompiledTelemetry
+    details: DetailsTimeline
+    order: tuple[int, int]
+    """Sort key reproducing the order in which flights are listed in the database."""
+
+
+class InjectedFlights:
+    """Flights injected into the ridsp database, compiled and indexed for efficient queries.
+
+    Each process maintains its own instance, which is only reloaded when the database changes.  When it is reloaded,
+    only tests which were not already compiled are compiled and added to the index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._source: Database | None = None
+        self._tests: dict[str, tuple[str, int, list[InjectedFlight]]] = {}
+        """Version and number of flights of each compiled test, and its compiled flights."""
+        self._index: FlightIndex[InjectedFlight] = FlightIndex()
+
+    def _reload(self, source: Database) -> None:
+        tests = {}
+        for t, (test_id, record) in enumerate(source.tests.items()):
+            compiled = self._tests.get(test_id, None)
+            if (
+                compiled is None
+                or compiled[0] != record.version
+                or compiled[1] != len(record.flights)
+            ):
+                compiled = (
+                    record.version,
+                    len(record.flights),
+                    [
+                        InjectedFlight(
+                            test_id=test_id,
+                            flight=flight,
+                            telemetry=CompiledTelemetry(flight.telemetry),
+                            details=DetailsTimeline(flight.details_responses),
+                            order=(t, f),
+                        )
+                        for f, flight in enumerate(record.flights)
+                    ],
+                )
+                for injected_flight in compiled[2]:
+                    self._index.set(
+                        injected_flight,
+                        injected_flight.telemetry,
+                        injected_flight.details,
+                    )
+            else:
+                for injected_flight in compiled[2]:
+                    injected_flight.order = (t, injected_flight.order[1])
+            tests[test_id] = compiled
+
+        for test_id, compiled in self._tests.items():
+            if tests.get(test_id, None) is not compiled:
+                for injected_flight in compiled[2]:
+                    self._index.remove(injected_flight)
+
+        self._tests = tests
+        self._source = source
+
+    def _current(self) -> None:
+        source = db.snapshot
+        if source is not self._source:
+            self._reload(source)
+
+    def in_view(self, view: s2sphere.LatLngRect) -> list[InjectedFlight]:
+        """Flights which may have telemetry within the specified view, in database order."""
+        with self._lock:
+            self._current()
+            return sorted(self._index.in_view(view), key=lambda f: f.order)
+
+    def with_id(self, flight_id: str) -> list[InjectedFlight]:
+        """Flights which report the specified ID at some time, in database order."""
+        with self._lock:
+            self._current()
+            return sorted(self._index.with_id(flight_id), key=lambda f: f.order)
+
+
+injected_flights = InjectedFlights()
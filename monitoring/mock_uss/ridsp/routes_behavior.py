@@ -28,4 +28,4 @@ def ridsp_set_dp_behavior() -> tuple[str, int] | flask.Response:
 @webapp.route("/ridsp/behavior", methods=["GET"])
 def ridsp_get_dp_behavior() -> flask.Response:
     """Get the behavior of the mock Display Provider."""
-    return flask.jsonify(db.value.behavior)
+    return flask.jsonify(db.snapshot.behavior)
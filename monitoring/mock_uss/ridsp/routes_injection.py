@@ -216,7 +216,7 @@ def ridsp_get_user_notifications() -> tuple[str | flask.Response, int]:
 
     final_list = []
 
-    for user_notification in db.value.notifications.user_notifications:
+    for user_notification in db.snapshot.notifications.user_notifications:
         if (
             after.datetime
             <= user_notification.observed_at.value.datetime
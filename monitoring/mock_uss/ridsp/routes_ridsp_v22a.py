@@ -33,10 +33,9 @@ from monitoring.mock_uss.logging import query_type
 from monitoring.monitorlib import geo
 from monitoring.monitorlib.fetch import QueryType
 from monitoring.monitorlib.rid import RIDVersion
-from monitoring.monitorlib.rid_automated_testing.injection_api import TestFlight
 from monitoring.monitorlib.rid_v2 import make_time
 
-from .database import db
+from .injected_flights import InjectedFlight, injected_flights
 
 
 def _make_position(p: injection.RIDAircraftPosition) -> RIDAircraftPosition:
@@ -105,16 +104,17 @@ def _make_details(p: injection.RIDFlightDetails) -> RIDFlightDetails:
 
 
 def _get_report(
-    flight: TestFlight,
+    injected_flight: InjectedFlight,
     t_request: datetime.datetime,
     view: s2sphere.LatLngRect,
     recent_positions_duration: float,
 ) -> RIDFlight | None:
-    details = flight.get_details(t_request)
+    flight = injected_flight.flight
+    details = injected_flight.details.at(t_request)
     if not details:
         return None
 
-    recent_states = flight.select_relevant_states(
+    recent_states = injected_flight.telemetry.select_relevant_states(
         view,
         t_request - timedelta(seconds=NetMaxNearRealTimeDataPeriodSeconds),
         t_request,
@@ -200,16 +200,16 @@ def ridsp_flights_v22a():
 
     now = arrow.utcnow().datetime
     flights = []
-    tx = db.value
-    for test_id, record in tx.tests.items():
-        for flight in record.flights:
-            reported_flight = _get_report(flight, now, view, recent_positions_duration)
-            if reported_flight is not None:
-                # TODO: Implement Service Provider behaviors for F3411-22a
-                # reported_flight = behavior.adjust_reported_flight(
-                #     flight, reported_flight, tx.behavior
-                # )
-                flights.append(reported_flight)
+    for injected_flight in injected_flights.in_view(view):
+        reported_flight = _get_report(
+            injected_flight, now, view, recent_positions_duration
+        )
+        if reported_flight is not None:
+            # TODO: Implement Service Provider behaviors for F3411-22a
+            # reported_flight = behavior.adjust_reported_flight(
+            #     injected_flight.flight, reported_flight, tx.behavior
+            # )
+            flights.append(reported_flight)
     return (
         flask.jsonify(GetFlightsResponse(timestamp=make_time(now), flights=flights)),
         200,
@@ -221,17 +221,13 @@ def ridsp_flights_v22a():
 @requires_scope(Scope.DisplayProvider)
 def ridsp_flight_details_v22a(id: str):
     now = arrow.utcnow().datetime
-    tx = db.value
-    for test_id, record in tx.tests.items():
-        for flight in record.flights:
-            details = flight.get_details(now)
-            if details and details.id == id:
-                return (
-                    flask.jsonify(
-                        GetFlightDetailsResponse(details=_make_details(details))
-                    ),
-                    200,
-                )
+    for injected_flight in injected_flights.with_id(id):
+        details = injected_flight.details.at(now)
+        if details and details.id == id:
+            return (
+                flask.jsonify(GetFlightDetailsResponse(details=_make_details(details))),
+                200,
+            )
     return (
         flask.jsonify(ErrorResponse(message=f"Flight {id} not found")),
         404,
@@ -31,7 +31,13 @@ from monitoring.mock_uss.f3548v21.flight_planning import (
     share_op_intent,
     validate_request,
 )
-from monitoring.mock_uss.flights.database import FlightRecord, MockUSSFlightID, db
+from monitoring.mock_uss.flights.database import (
+    FlightRecord,
+    MockUSSFlightID,
+    db,
+    flights_db,
+    op_intent_cache,
+)
 from monitoring.mock_uss.flights.planning import (
     adjust_flight_info,
     delete_flight_record,
@@ -235,10 +241,11 @@ def inject_flight(
         # Store flight in database
         step_name = "storing flight in database"
         log("Storing flight in database")
-        with db.transact() as tx:
-            tx.value.flights[flight_id] = record
-            if has_conflict:
-                # Record virtual user notification that this flight caused/has a conflict
+        with flights_db.transact() as tx:
+            tx.value[flight_id] = record
+        if has_conflict:
+            # Record virtual user notification that this flight caused/has a conflict
+            with db.transact() as tx:
                 tx.value.flight_planning_notifications.append(
                     UserNotification(
                         type=UserNotificationType.CausedConflict,
@@ -447,7 +454,7 @@ def clear_area(extent: Volume4D) -> ClearAreaResponse:
         )
 
         # Try to remove all relevant flights normally
-        for flight_id, flight in db.value.flights.items():
+        for flight_id, flight in flights_db.items():
             if flight is None:
                 # Flight is locked in the process of being created
                 continue
@@ -458,7 +465,7 @@ def clear_area(extent: Volume4D) -> ClearAreaResponse:
                 # Flight is not in the area being cleared
                 continue
 
-            del_resp, _status_code = delete_flight(flight_id)
+            del_resp, _status_code = delete_flight(MockUSSFlightID(flight_id))
             if (
                 del_resp.activity_result == PlanningActivityResult.Completed
                 and del_resp.flight_plan_status == FlightPlanStatus.Closed
@@ -497,10 +504,7 @@ def clear_area(extent: Volume4D) -> ClearAreaResponse:
                 }
 
         # Clear the op intent cache for every op intent removed
-        with db.transact() as tx:
-            for op_intent_id in op_intents_removed:
-                if op_intent_id in tx.value.cached_operations:
-                    del tx.value.cached_operations[op_intent_id]
+        op_intent_cache.remove(op_intents_removed)
 
     except (ValueError, ConnectionError) as e:
         msg = f"{e.__class__.__name__} while {step_name}: {str(e)}"
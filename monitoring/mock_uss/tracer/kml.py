@@ -3,6 +3,7 @@ from __future__ import annotations
 import glob
 import os
 import re
+import threading
 from abc import abstractmethod
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
@@ -30,6 +31,7 @@ from monitoring.monitorlib.geotemporal import Volume4D, Volume4DCollection
 from monitoring.monitorlib.infrastructure import get_token_claims
 from monitoring.monitorlib.kml.f3548v21 import f3548v21_styles
 from monitoring.monitorlib.kml.generation import make_placemark_from_volume
+from monitoring.monitorlib.segmented_log import SegmentedLog
 from monitoring.monitorlib.temporal import Time
 
 
@@ -337,87 +339,82 @@ def _get_style(type: VolumeType, state: str, future: bool) -> str:
         raise NotImplementedError()
 
 
-def render_historical_kml(log_folder: str) -> str:
-    logger.debug("Rendering historical KML...")
+_LOG_FILE_NAME_FORMATS = [
+    # <index>_<HHMMSS>_<microseconds>_<prefix_code>.yaml, written by earlier versions of tracer
+    re.compile(r"^(\d{6})_(\d\d)(\d\d)(\d\d)_(\d{6})_(?P<prefix_code>[^.]+)\.yaml$"),
+    # <writer>_<sequence number>_<prefix_code>.yaml, as in tracer's logs.zip
+    re.compile(r"^([^_]+)_(\d{6})_(?P<prefix_code>[^.]+)\.yaml$"),
+]
 
-    # Performance metrics
-    loading_time = Stopwatch()
-    parsing_time = Stopwatch()
-    processing_time = Stopwatch()
-    generation_time = Stopwatch()
-    rendering_time = Stopwatch()
-
-    historical_volume_collections: list[HistoricalVolumesCollection] = []
-    log_files = glob.glob(os.path.join(log_folder, "*.yaml"))
-    log_files.sort()
-    for log_file in log_files:
-        logger.debug(f"Processing {log_file}")
-
-        if "nochange_queries" in log_file:
-            continue  # This is a known case where we don't want to print a warning
-
-        # See if this is actually a log entry
-        filename = os.path.split(log_file)[-1]
-        m = re.match(r"^(\d{6})_(\d\d)(\d\d)(\d\d)_(\d{6})_([^.]+)\.yaml$", filename)
-        if not m:
-            # File name does not match log entry format
-            logger.warning(f"File name {filename} does not match log entry format")
-            continue
 
-        # Determine type of log entry
-        prefix_code = m.group(6)
-        log_entry_type = TracerLogEntry.entry_type_from_prefix(prefix_code)
-        if not log_entry_type:
-            # Can't determine a log entry type from the prefix
-            logger.warning(
-                f"Cannot determine log entry type from prefix_code `{prefix_code}`"
-            )
-            continue
+def _log_file_entry_type(filename: str) -> type[TracerLogEntry] | None:
+    """Determine the type of log entry in a YAML log file, if historical volumes can be rendered for it."""
+    if "nochange_queries" in filename:
+        return None  # This is a known case where we don't want to print a warning
 
-        # See if we can render volumes of log entry
-        if log_entry_type not in _historical_volumes_renderers:
-            # We don't have an historical volume renderer for this log entry type
-            logger.warning(
-                f"No historical volume renderer for {log_entry_type.__name__} in {log_file}"
-            )
-            continue
+    # See if this is actually a log entry
+    m = next((m for fmt in _LOG_FILE_NAME_FORMATS if (m := fmt.match(filename))), None)
+    if not m:
+        # File name does not match log entry format
+        logger.warning(f"File name {filename} does not match log entry format")
+        return None
 
-        # Render log entry into historical volume collections
-        with open(log_file) as f:
-            try:
-                with loading_time:
-                    content = yaml.load(f, Loader=yaml.CLoader)
-                with parsing_time:
-                    log_entry = ImplicitDict.parse(content, log_entry_type)
-            except ValueError as e:
-                logger.warning(f"Skipping {filename} because of parse error: {str(e)}")
-                continue
-        with processing_time:
-            historical_volume_collections.extend(
-                _historical_volumes_renderers[log_entry_type].renderer(
-                    log_entry, historical_volume_collections
-                )
-            )
+    # Determine type of log entry
+    prefix_code = m.group("prefix_code")
+    log_entry_type = TracerLogEntry.entry_type_from_prefix(prefix_code)
+    if not log_entry_type:
+        # Can't determine a log entry type from the prefix
+        logger.warning(
+            f"Cannot determine log entry type from prefix_code `{prefix_code}`"
+        )
+        return None
+
+    # See if we can render volumes of log entry
+    if log_entry_type not in _historical_volumes_renderers:
+        # We don't have an historical volume renderer for this log entry type
+        logger.warning(
+            f"No historical volume renderer for {log_entry_type.__name__} in {filename}"
+        )
+        return None
 
-    historical_volume_collections.sort(key=lambda hv: hv.active_at)
+    return log_entry_type
 
-    # Render historical volume collections into a folder structure
-    with generation_time:
-        top_folder: dict[VolumeType, VolumesFolder] = {}
-        for hvc in historical_volume_collections:
-            if hvc.type not in top_folder:
-                top_folder[hvc.type] = VolumesFolder(
-                    name=hvc.type, volumes=[], children=[]
-                )
-            type_folder = top_folder[hvc.type]
 
-            children = [f for f in type_folder.children if f.name == hvc.name]
-            if not children:
-                id_folder = VolumesFolder(name=hvc.name, volumes=[], children=[])
-                type_folder.children.append(id_folder)
-            else:
-                id_folder = children[0]
+@dataclass
+class _HistoricalEntity:
+    """All historical volume collections for one named entity (e.g., operational intent)."""
 
+    type: VolumeType
+    name: str
+    collections: list[HistoricalVolumesCollection]
+
+    first_active_at: datetime
+    """Time at which this entity first became visible."""
+
+    last_visible_at: datetime | None
+    """Latest time at which any part of this entity is visible, or None if some part of it is visible indefinitely."""
+
+    kml: str | None = None
+    """Cached KML Folder for this entity, or None if it needs to be rendered."""
+
+    def add(self, hvc: HistoricalVolumesCollection) -> None:
+        self.collections.append(hvc)
+        self.first_active_at = min(self.first_active_at, hvc.active_at)
+        if self.last_visible_at is not None:
+            self.last_visible_at = max(self.last_visible_at, hvc.active_at)
+            for v in hvc.volumes:
+                if not v.time_end:
+                    self.last_visible_at = None
+                    break
+                self.last_visible_at = max(self.last_visible_at, v.time_end.datetime)
+        self.kml = None
+
+    def visible_since(self, t: datetime) -> bool:
+        return self.last_visible_at is None or self.last_visible_at >= t
+
+    def to_volumes_folder(self) -> VolumesFolder:
+        id_folder = VolumesFolder(name=self.name, volumes=[], children=[])
+        for hvc in sorted(self.collections, key=lambda hv: hv.active_at):
             # Truncate time ranges of volumes in previous version(s)
             t_hvc = Time(hvc.active_at)
             id_folder.truncate(t_hvc)
@@ -441,6 +438,8 @@ def render_historical_kml(log_folder: str) -> str:
                 if v.time_end and v.time_end.datetime <= hvc.active_at:
                     # This volume ended before the collection was declared, so it never actually existed
                     continue
+                # Adjust a copy of the volume so the collection can be rendered again later
+                v = Volume4D(v)
                 if v.time_start and v.time_start.datetime < hvc.active_at:
                     # Volume is declared in the past, but it's only visible starting now
                     v.time_start = t_hvc
@@ -453,19 +452,179 @@ def render_historical_kml(log_folder: str) -> str:
                     future_folder.volumes.append(StyledVolume(f"v{i}", future_v, style))
                 style = _get_style(hvc.type, hvc.state, False)
                 active_folder.volumes.append(StyledVolume(f"v{i}", v, style))
+        return id_folder
+
+
+_KML_NAMESPACE_DECLARATION = re.compile(r' xmlns(:\w+)?="[^"]*"')
+_FOLDER_PLACEHOLDER = "historical_volumes_folder:"
+
+
+def _render_folder(folder: VolumesFolder) -> str:
+    """Render a folder to be inserted into a document which already declares the KML namespaces."""
+    text = etree.tostring(
+        format_xml_with_cdata(folder.to_kml_folder()), pretty_print=True
+    ).decode("utf-8")
+    start_tag, _, rest = text.partition(">")
+    return _KML_NAMESPACE_DECLARATION.sub("", start_tag) + ">" + rest
+
+
+class HistoricalKML:
+    """Historical KML of the tracer log entries in a folder, maintained incrementally.
 
-    with rendering_time:
-        doc = kml.kml(
-            kml.Document(
-                *f3548v21_styles(),
-                *[f.to_kml_folder() for f in top_folder.values()],
+    Each time the KML is rendered, only log entries added since the last rendering are processed, and only the folders
+    of entities affected by those entries are rendered again; the rest of the document is served from cache.
+    """
+
+    def __init__(self, log_folder: str):
+        self._log_folder = log_folder
+        self._log = SegmentedLog(log_folder)
+        self._log_entry_types = {
+            t.prefix_code(): t for t in _historical_volumes_renderers
+        }
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._processed: set[str] = set()
+        self._collections: list[HistoricalVolumesCollection] = []
+        self._entities: dict[tuple[VolumeType, str], _HistoricalEntity] = {}
+
+    def _process(
+        self,
+        name: str,
+        log_entry_type: type[TracerLogEntry],
+        content: dict,
+        parsing_time: Stopwatch,
+        processing_time: Stopwatch,
+    ) -> None:
+        # Render log entry into historical volume collections
+        try:
+            with parsing_time:
+                log_entry = ImplicitDict.parse(content, log_entry_type)
+        except ValueError as e:
+            logger.warning(f"Skipping {name} because of parse error: {str(e)}")
+            return
+        with processing_time:
+            hvcs = _historical_volumes_renderers[log_entry_type].renderer(
+                log_entry, self._collections
             )
+            for hvc in hvcs:
+                self._collections.append(hvc)
+                key = (hvc.type, hvc.name)
+                if key not in self._entities:
+                    self._entities[key] = _HistoricalEntity(
+                        type=hvc.type,
+                        name=hvc.name,
+                        collections=[],
+                        first_active_at=hvc.active_at,
+                        last_visible_at=hvc.active_at,
+                    )
+                self._entities[key].add(hvc)
+
+    def update(self) -> None:
+        """Process any log entries added since the last update."""
+        # Performance metrics
+        loading_time = Stopwatch()
+        parsing_time = Stopwatch()
+        processing_time = Stopwatch()
+
+        with self._lock:
+            # Log entries in the tracer log store are indexed by prefix code, so only renderable entries need to be read
+            with loading_time:
+                log_entries = self._log.entries(kinds=self._log_entry_types)
+                log_files = sorted(glob.glob(os.path.join(self._log_folder, "*.yaml")))
+            present = {e.name for e in log_entries}
+            present.update(os.path.split(f)[-1] for f in log_files)
+            if not self._processed <= present:
+                logger.debug("Tracer logs were cleared; rebuilding historical KML")
+                self._reset()
+
+            new_entries = [e for e in log_entries if e.name not in self._processed]
+            n_new = len(new_entries)
+            for entry, content in self._log.read(new_entries):
+                self._process(
+                    entry.name,
+                    self._log_entry_types[entry.kind],
+                    content,
+                    parsing_time,
+                    processing_time,
+                )
+            self._processed.update(e.name for e in new_entries)
+
+            for log_file in log_files:
+                filename = os.path.split(log_file)[-1]
+                if filename in self._processed:
+                    continue
+                self._processed.add(filename)
+                n_new += 1
+                log_entry_type = _log_file_entry_type(filename)
+                if not log_entry_type:
+                    continue
+                logger.debug(f"Processing {log_file}")
+                with open(log_file) as f, loading_time:
+                    content = yaml.load(f, Loader=yaml.CLoader)
+                self._process(
+                    filename, log_entry_type, content, parsing_time, processing_time
+                )
+
+        if n_new:
+            logger.debug(
+                f"Processed {n_new} new log entries for historical KML with {loading_time.elapsed_time.total_seconds():.2f}s load, {parsing_time.elapsed_time.total_seconds():.2f}s parse, {processing_time.elapsed_time.total_seconds():.2f}s process"
+            )
+
+    def render(self, visible_since: datetime | None = None) -> str:
+        """Render the historical KML, including log entries added since the last rendering.
+
+        Args:
+            visible_since: If specified, only include entities with some part visible at or after this time.
+        """
+        self.update()
+
+        # Performance metrics
+        generation_time = Stopwatch()
+        rendering_time = Stopwatch()
+
+        with self._lock:
+            with generation_time:
+                entities = [
+                    e
+                    for e in self._entities.values()
+                    if visible_since is None or e.visible_since(visible_since)
+                ]
+                entities.sort(key=lambda e: e.first_active_at)
+                folders_by_type: dict[VolumeType, list[str]] = {}
+                for entity in entities:
+                    if entity.kml is None:
+                        entity.kml = _render_folder(entity.to_volumes_folder())
+                    folders_by_type.setdefault(entity.type, []).append(entity.kml)
+
+            with rendering_time:
+                doc = kml.kml(
+                    kml.Document(
+                        *f3548v21_styles(),
+                        *[
+                            kml.Folder(
+                                kml.name(t),
+                                etree.Comment(f"{_FOLDER_PLACEHOLDER}{t}"),
+                            )
+                            for t in folders_by_type
+                        ],
+                    )
+                )
+                result = etree.tostring(
+                    format_xml_with_cdata(doc), pretty_print=True
+                ).decode("utf-8")
+                for t, folders in folders_by_type.items():
+                    result = result.replace(
+                        f"<!--{_FOLDER_PLACEHOLDER}{t}-->", "".join(folders)
+                    )
+
+        logger.debug(
+            f"Completed historical KML rendering of {len(entities)} entities with {generation_time.elapsed_time.total_seconds():.2f}s generate, {rendering_time.elapsed_time.total_seconds():.2f}s render"
         )
-        result = etree.tostring(format_xml_with_cdata(doc), pretty_print=True).decode(
-            "utf-8"
-        )
+        return result
 
-    logger.debug(
-        f"Completed render_historical_kml with {loading_time.elapsed_time.total_seconds():.2f}s load, {parsing_time.elapsed_time.total_seconds():.2f}s parse, {processing_time.elapsed_time.total_seconds():.2f}s process, {generation_time.elapsed_time.total_seconds():.2f}s generate, {rendering_time.elapsed_time.total_seconds():.2f}s render"
-    )
-    return result
+
+def render_historical_kml(log_folder: str) -> str:
+    logger.debug("Rendering historical KML...")
+    return HistoricalKML(log_folder).render()
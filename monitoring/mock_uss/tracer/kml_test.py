@@ -0,0 +1,103 @@
+import datetime
+
+from implicitdict import StringBasedDateTime
+from lxml import etree
+
+from monitoring.mock_uss.tracer.kml import HistoricalKML
+from monitoring.mock_uss.tracer.log_types import OperationalIntentNotification
+from monitoring.mock_uss.tracer.tracerlog import Logger
+from monitoring.monitorlib.fetch import RequestDescription
+
+T0 = datetime.datetime.now(datetime.UTC) - datetime.timedelta(hours=2)
+
+
+def _time(t: datetime.datetime) -> dict:
+    return {"value": StringBasedDateTime(t), "format": "RFC3339"}
+
+
+def _notification(
+    op_intent_id: str, version: int, recorded_at: datetime.datetime
+) -> OperationalIntentNotification:
+    t_end = recorded_at + datetime.timedelta(minutes=10)
+    op_intent = {
+        "reference": {
+            "id": op_intent_id,
+            "manager": "uss1",
+            "uss_availability": "Normal",
+            "version": version,
+            "state": "Accepted",
+            "ovn": f"ovn{version}",
+            "time_start": _time(recorded_at),
+            "time_end": _time(t_end),
+            "uss_base_url": "https://uss1.example.com",
+            "subscription_id": "sub1",
+        },
+        "details": {
+            "volumes": [
+                {
+                    "volume": {
+                        "outline_circle": {
+                            "center": {"lat": 34, "lng": -118},
+                            "radius": {"value": 100, "units": "M"},
+                        },
+                        "altitude_lower": {
+                            "value": 0,
+                            "reference": "W84",
+                            "units": "M",
+                        },
+                        "altitude_upper": {
+                            "value": 100,
+                            "reference": "W84",
+                            "units": "M",
+                        },
+                    },
+                    "time_start": _time(recorded_at),
+                    "time_end": _time(t_end),
+                }
+            ],
+            "priority": 0,
+        },
+    }
+    return OperationalIntentNotification(
+        observation_area_id="area1",
+        request=RequestDescription(
+            method="POST",
+            url="https://tracer.example.com/uss/v1/operational_intents",
+            json={
+                "operational_intent_id": op_intent_id,
+                "operational_intent": op_intent,
+                "subscriptions": [],
+            },
+        ),
+        recorded_at=StringBasedDateTime(recorded_at),
+    )
+
+
+def test_incremental_rendering(tmp_path):
+    tracer_logger = Logger(str(tmp_path))
+    historical_kml = HistoricalKML(str(tmp_path))
+    assert "op1" not in historical_kml.render()
+
+    tracer_logger.log_new(_notification("op1", 1, T0))
+    kml = historical_kml.render()
+    assert "op1" in kml
+    assert "v1 (ovn1)" in kml
+
+    tracer_logger.log_new(_notification("op1", 2, T0 + datetime.timedelta(minutes=5)))
+    tracer_logger.log_new(_notification("op2", 1, T0 + datetime.timedelta(minutes=100)))
+    kml = historical_kml.render()
+    assert "v1 (ovn1)" in kml
+    assert "v2 (ovn2)" in kml
+    assert "op2" in kml
+    assert len(etree.fromstring(kml.encode("utf-8")).findall(".//{*}Placemark")) == 3
+    # Rendering incrementally must produce the same result as rendering from scratch
+    assert kml == HistoricalKML(str(tmp_path)).render()
+
+    recent = historical_kml.render(
+        datetime.datetime.now(datetime.UTC) - datetime.timedelta(minutes=30)
+    )
+    assert "op1" not in recent
+    assert "op2" in recent
+
+    tracer_logger.clear()
+    assert "op2" not in historical_kml.render()
@@ -2,7 +2,9 @@ import datetime
 import glob
 import io
 import os
+import threading
 import zipfile
+from collections.abc import Iterator
 from typing import cast
 
 import arrow
@@ -15,28 +17,39 @@ from loguru import logger
 from monitoring.mock_uss.app import webapp
 from monitoring.mock_uss.tracer import context
 from monitoring.mock_uss.tracer.database import db
-from monitoring.mock_uss.tracer.kml import render_historical_kml
+from monitoring.mock_uss.tracer.kml import HistoricalKML
 from monitoring.mock_uss.tracer.log_types import PollFlights, TracerLogEntry
 from monitoring.mock_uss.tracer.observation_areas import ObservationArea
+from monitoring.mock_uss.tracer.tracerlog import NOCHANGE_QUERIES_LOG
 from monitoring.mock_uss.ui import auth as ui_auth
 from monitoring.monitorlib import geo, infrastructure
 from monitoring.monitorlib.fetch import rid
 
 
+def _log_names() -> list[str]:
+    """Names of all tracer log entries, most recent first."""
+    log_names = [
+        f"{entry.name}.yaml" for entry in reversed(context.tracer_logger.entries())
+    ]
+    if os.path.exists(
+        os.path.join(context.tracer_logger.log_path, NOCHANGE_QUERIES_LOG)
+    ):
+        log_names.append(NOCHANGE_QUERIES_LOG)
+    return log_names
+
+
 @webapp.route("/tracer/logs", methods=["GET"])
 @ui_auth.login_required()
 def tracer_list_logs():
     logger.debug(f"Handling tracer_list_logs from {os.getpid()}")
-    logs = [
-        log
-        for log in reversed(sorted(os.listdir(context.tracer_logger.log_path)))
-        if log.endswith(".yaml")
-    ]
+    logs = _log_names()
+    kml_path = context.tracer_logger.kml_path
+    existing_kmls = set(os.listdir(kml_path)) if os.path.exists(kml_path) else set()
     kmls = {}
     for log in logs:
-        kml = os.path.join("kml", log[0:-5] + ".kml")
-        if os.path.exists(os.path.join(context.tracer_logger.log_path, kml)):
-            kmls[log] = kml
+        kml = log[0:-5] + ".kml"
+        if kml in existing_kmls:
+            kmls[log] = os.path.join("kml", kml)
     response = flask.make_response(
         flask.render_template(
             "tracer/logs.html",
@@ -50,24 +63,49 @@ def tracer_list_logs():
     return response
 
 
+class _ZipStream(io.RawIOBase):
+    """Unseekable output stream which accumulates written content until it is taken."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def take(self) -> bytes:
+        content = b"".join(self._chunks)
+        self._chunks = []
+        return content
+
+
+def _zip_logs() -> Iterator[bytes]:
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED, False) as zip_file:
+        for entry, content in context.tracer_logger.read(
+            reversed(context.tracer_logger.entries())
+        ):
+            zip_file.writestr(f"{entry.name}.yaml", yaml.dump(content, indent=2))
+            yield stream.take()
+        nochange_log = os.path.join(
+            context.tracer_logger.log_path, NOCHANGE_QUERIES_LOG
+        )
+        if os.path.exists(nochange_log):
+            zip_file.write(nochange_log, NOCHANGE_QUERIES_LOG)
+    yield stream.take()
+
+
 @webapp.route("/tracer/logs.zip")
 @ui_auth.login_required(role="admin")
 def tracer_download_logs():
-    logs = [
-        log
-        for log in reversed(sorted(os.listdir(context.tracer_logger.log_path)))
-        if log.endswith(".yaml")
-    ]
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
-        for log in logs:
-            with open(os.path.join(context.tracer_logger.log_path, log)) as f:
-                zip_file.writestr(log, f.read())
     zip_name = (
         f"logs_{datetime.datetime.now(datetime.UTC).isoformat().split('.')[0]}.zip"
     )
     return flask.Response(
-        zip_buffer.getvalue(),
+        flask.stream_with_context(_zip_logs()),
         mimetype="application/zip",
         headers={"Content-Disposition": f"attachment;filename={zip_name}"},
     )
@@ -79,14 +117,8 @@ def tracer_clear_logs():
     if db.value.observation_areas:
         return "Logs cannot be cleared while any observation areas exist", 400
 
-    files = [
-        f
-        for f in reversed(sorted(os.listdir(context.tracer_logger.log_path)))
-        if f.endswith(".yaml") or f.endswith(".kml")
-    ]
-    for f in files:
-        os.remove(os.path.join(context.tracer_logger.log_path, f))
-    return f"{len(files)} log files cleared successfully", 200
+    num_removed = context.tracer_logger.clear()
+    return f"{num_removed} log files cleared successfully", 200
 
 
 def _redact_and_augment_log(obj):
@@ -113,15 +145,21 @@ def _redact_and_augment_log(obj):
 @ui_auth.login_required()
 def tracer_logs(log):
     logger.debug(f"Handling tracer_logs from {os.getpid()}")
-    logfile = os.path.join(context.tracer_logger.log_path, log)
-    if not os.path.exists(logfile):
-        flask.abort(404)
-    with open(logfile) as f:
-        objs = [obj for obj in yaml.full_load_all(f)]
-    if len(objs) == 1:
-        obj = objs[0]
+    if log == NOCHANGE_QUERIES_LOG:
+        logfile = os.path.join(context.tracer_logger.log_path, log)
+        if not os.path.exists(logfile):
+            flask.abort(404)
+        with open(logfile) as f:
+            obj = {"entries": [obj for obj in yaml.full_load_all(f)]}
     else:
-        obj = {"entries": objs}
+        entry = context.tracer_logger.find(log)
+        if entry is None:
+            flask.abort(404)
+        obj = next(
+            (content for _, content in context.tracer_logger.read([entry])), None
+        )
+        if obj is None:
+            flask.abort(404)
 
     object_type_name = cast(str | None, obj.get("object_type", None))
     object_type = TracerLogEntry.entry_type(object_type_name)
@@ -132,7 +170,7 @@ def tracer_logs(log):
     return flask.render_template(
         "tracer/log.html",
         log=_redact_and_augment_log(obj),
-        title=logfile,
+        title=log,
         username=flask_login.current_user.username,
     )
 
@@ -141,7 +179,7 @@ def tracer_logs(log):
 @ui_auth.login_required()
 def tracer_kml_now():
     logger.debug(f"Handling tracer_kml_now from {os.getpid()}")
-    all_kmls = glob.glob(os.path.join(context.tracer_logger.log_path, "kml", "*.kml"))
+    all_kmls = glob.glob(os.path.join(context.tracer_logger.kml_path, "*.kml"))
     if not all_kmls:
         flask.abort(404, "No KMLs exist")
     latest_kml = max(all_kmls, key=os.path.getctime)
@@ -157,7 +195,7 @@ def tracer_kml_now():
 @ui_auth.login_required()
 def tracer_kmls(kml):
     logger.debug(f"Handling tracer_kmls from {os.getpid()}")
-    kmlfile = os.path.join(context.tracer_logger.log_path, "kml", kml)
+    kmlfile = os.path.join(context.tracer_logger.kml_path, kml)
     if not os.path.exists(kmlfile):
         flask.abort(404)
     return flask.send_file(
@@ -168,12 +206,32 @@ def tracer_kmls(kml):
     )
 
 
+_historical_kml: HistoricalKML | None = None
+_historical_kml_lock = threading.Lock()
+
+
+def _get_historical_kml() -> HistoricalKML:
+    global _historical_kml
+    with _historical_kml_lock:
+        if _historical_kml is None:
+            _historical_kml = HistoricalKML(context.tracer_logger.log_path)
+        return _historical_kml
+
+
 @webapp.route("/tracer/kml/historical.kml")
 @ui_auth.login_required()
 def tracer_kml_historical():
-    kml_name = f"historical_{datetime.datetime.now(datetime.UTC).isoformat().split('.')[0]}.kml"
+    """Historical KML of all logged operational intents.
+
+    Query parameter `minutes` may be specified to include only operational intents visible at some point during the
+    specified number of minutes before now.
+    """
+    now = datetime.datetime.now(datetime.UTC)
+    minutes = flask.request.args.get("minutes", None, type=float)
+    visible_since = now - datetime.timedelta(minutes=minutes) if minutes else None
+    kml_name = f"historical_{now.isoformat().split('.')[0]}.kml"
     return flask.Response(
-        render_historical_kml(context.tracer_logger.log_path),
+        _get_historical_kml().render(visible_since),
         mimetype="application/vnd.google-earth.kml+xml",
         headers={"Content-Disposition": f"attachment;filename={kml_name}"},
     )
@@ -1,14 +1,20 @@
 import datetime
 import json
 import os
+from collections.abc import Container, Iterable, Iterator
 
 import yaml
 
 from monitoring.mock_uss.tracer.log_types import TracerLogEntry
 from monitoring.monitorlib import infrastructure
+from monitoring.monitorlib.segmented_log import LogEntry, SegmentedLog
+
+NOCHANGE_QUERIES_LOG = "000000_nochange_queries.yaml"
 
 
 class Logger:
+    """Tracer log, stored in an append-only SegmentedLog indexed by log entry prefix code and time logged."""
+
     def __init__(
         self,
         log_path: str,
@@ -16,47 +22,79 @@ class Logger:
     ):
         self.log_path = log_path
         os.makedirs(self.log_path, exist_ok=True)
+        self.log = SegmentedLog(self.log_path)
         self.kml_session = kml_session
 
+    @property
+    def kml_path(self) -> str:
+        return os.path.join(self.log_path, "kml")
+
     def log_same(self, t0: datetime.datetime, t1: datetime.datetime, code: str) -> None:
-        with open(
-            os.path.join(self.log_path, "000000_nochange_queries.yaml"), "a"
-        ) as f:
+        with open(os.path.join(self.log_path, NOCHANGE_QUERIES_LOG), "a") as f:
             body = {"t0": t0.isoformat(), "t1": t1.isoformat(), "code": code}
             f.write(yaml.dump(body, explicit_start=True))
 
     def log_new(self, content: TracerLogEntry) -> str:
-        n = len(os.listdir(self.log_path))
-        basename = "{:06d}_{}_{}".format(
-            n, datetime.datetime.now().strftime("%H%M%S_%f"), content.prefix_code()
-        )
-        logname = f"{basename}.yaml"
-        fullname = os.path.join(self.log_path, logname)
-
         dump = json.loads(json.dumps(content))
         dump["object_type"] = type(content).__name__
-        with open(fullname, "w") as f:
-            f.write(yaml.dump(dump, indent=2))
+        entry = self.log.append(
+            dump, datetime.datetime.now(datetime.UTC), content.prefix_code()
+        )
+        logname = f"{entry.name}.yaml"
 
         if self.kml_session:
             kml_server_filename = os.path.join(self.kml_session.kml_folder, logname)
             try:
-                with open(fullname) as f:
-                    resp = self.kml_session.post(
-                        "/realtime_kml",
-                        data={"path": self.kml_session.kml_folder},
-                        files=[("files[]", f)],
-                    )
+                resp = self.kml_session.post(
+                    "/realtime_kml",
+                    data={"path": self.kml_session.kml_folder},
+                    files=[("files[]", (logname, yaml.dump(dump, indent=2)))],
+                )
                 resp.raise_for_status()
-                kml_path = os.path.join(self.log_path, "kml")
-                os.makedirs(kml_path, exist_ok=True)
-                with open(os.path.join(kml_path, f"{basename}.kml"), "w") as f:
+                os.makedirs(self.kml_path, exist_ok=True)
+                with open(os.path.join(self.kml_path, f"{entry.name}.kml"), "w") as f:
                     f.write(resp.content.decode("utf-8"))
             except OSError as e:
                 print(f"Error posting {kml_server_filename} to KML server: {e}")
 
         return logname
 
+    def entries(
+        self,
+        from_time: datetime.datetime | None = None,
+        prefix_codes: Container[str] | None = None,
+    ) -> list[LogEntry]:
+        """List index entries of tracer log entries, ordered by time logged."""
+        return self.log.entries(from_time=from_time, kinds=prefix_codes)
+
+    def find(self, logname: str) -> LogEntry | None:
+        """Find the index entry of the tracer log entry with the specified name (as returned by log_new)."""
+        name = logname.removesuffix(".yaml")
+        prefix_code = name.split("_", 2)[-1]
+        for entry in self.log.entries(kinds={prefix_code}):
+            if entry.name == name:
+                return entry
+        return None
+
+    def read(self, entries: Iterable[LogEntry]) -> Iterator[tuple[LogEntry, dict]]:
+        """Read the content of the specified tracer log entries, in the order specified."""
+        return self.log.read(entries)
+
+    def clear(self) -> int:
+        """Remove all tracer log entries and their KMLs.
+
+        Returns: Number of files removed.
+        """
+        num_removed = self.log.clear()
+        for folder, suffix in ((self.log_path, ".yaml"), (self.kml_path, ".kml")):
+            if not os.path.exists(folder):
+                continue
+            for fname in os.listdir(folder):
+                if fname.endswith(suffix):
+                    os.remove(os.path.join(folder, fname))
+                    num_removed += 1
+        return num_removed
+
 
 class DummyLogger(Logger):
     def __init__(self):
@@ -67,3 +105,19 @@ class DummyLogger(Logger):
 
     def log_new(self, content: TracerLogEntry) -> str:
         return "dummy"
+
+    def entries(
+        self,
+        from_time: datetime.datetime | None = None,
+        prefix_codes: Container[str] | None = None,
+    ) -> list[LogEntry]:
+        return []
+
+    def find(self, logname: str) -> LogEntry | None:
+        return None
+
+    def read(self, entries: Iterable[LogEntry]) -> Iterator[tuple[LogEntry, dict]]:
+        return iter(())
+
+    def clear(self) -> int:
+        return 0
@@ -0,0 +1,32 @@
+import datetime
+
+from implicitdict import ImplicitDict, StringBasedDateTime
+
+from monitoring.mock_uss.tracer.log_types import TracerLogEntry, TracerShutdown
+from monitoring.mock_uss.tracer.tracerlog import Logger
+
+
+def _shutdown() -> TracerShutdown:
+    return TracerShutdown(
+        recorded_at=StringBasedDateTime(datetime.datetime.now(datetime.UTC))
+    )
+
+
+def test_log_and_find(tmp_path):
+    tracer_logger = Logger(str(tmp_path))
+    lognames = [tracer_logger.log_new(_shutdown()) for _ in range(3)]
+    assert len(set(lognames)) == 3
+
+    entry = tracer_logger.find(lognames[1])
+    assert entry is not None
+    assert entry.kind == TracerShutdown.prefix_code()
+    [(_, content)] = list(tracer_logger.read([entry]))
+    assert TracerLogEntry.entry_type(content["object_type"]) is TracerShutdown
+    ImplicitDict.parse(content, TracerShutdown)
+
+    assert tracer_logger.find("20240101T000000-1-0000_000000_tracer_stop") is None
+    assert [e.name for e in tracer_logger.entries(prefix_codes={"poll_ops"})] == []
+
+    tracer_logger.clear()
+    assert tracer_logger.entries() == []
+    assert tracer_logger.find(lognames[0]) is None
@@ -0,0 +1,31 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from monitoring.mock_uss.app import webapp
+
+
+class WorkerPool:
+    """Bounded pool of worker threads for concurrent queries, created on first use in each process."""
+
+    def __init__(self, max_workers_key: str, name: str):
+        """
+        :param max_workers_key: Configuration key of the maximum number of worker threads
+        :param name: Prefix of the names of the worker threads
+        """
+        self._max_workers_key = max_workers_key
+        self._name = name
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def get(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Worker threads do not survive a fork, so each process needs its own pool
+                self._executor = ThreadPoolExecutor(
+                    max_workers=webapp.config[self._max_workers_key],
+                    thread_name_prefix=self._name,
+                )
+                self._pid = os.getpid()
+            return self._executor
@@ -1,3 +1,5 @@
+from typing import Any
+
 from implicitdict import ImplicitDict
 from uas_standards.astm.f3548.v21 import api
 from uas_standards.astm.f3548.v21.api import OperationalIntentState
@@ -191,9 +193,13 @@ def notify_operational_intent_details_changed(
     utm_client: UTMClientSession,
     uss_base_url: str,
     update: api.PutOperationalIntentDetailsParameters,
+    timeout_seconds: float | None = None,
 ) -> Query:
     url = f"{uss_base_url}/uss/v1/operational_intents"
     subject = f"notifyOperationalIntentDetailsChanged to {url}"
+    kwargs: dict[str, Any] = (
+        {} if timeout_seconds is None else {"timeout": timeout_seconds}
+    )
     query = fetch.query_and_describe(
         utm_client,
         "POST",
@@ -201,6 +207,7 @@ def notify_operational_intent_details_changed(
         QueryType.F3548v21USSNotifyOperationalIntentDetailsChanged,
         json=update,
         scope=scd.SCOPE_SC,
+        **kwargs,
     )
     call_query_hooks(query)
     if query.status_code != 204 and query.status_code != 200:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import Any
 
 import s2sphere
@@ -1173,7 +1174,11 @@ def uss_flights(
     rid_version: RIDVersion,
     session: UTMClientSession,
     participant_id: str | None = None,
+    timeout_seconds: float | None = None,
 ) -> FetchedUSSFlights:
+    kwargs: dict[str, Any] = (
+        {} if timeout_seconds is None else {"timeout": timeout_seconds}
+    )
     if rid_version == RIDVersion.f3411_19:
         query = fetch.query_and_describe(
             session,
@@ -1188,6 +1193,7 @@ def uss_flights(
             scope=v19.constants.Scope.Read,
             query_type=QueryType.F3411v19USSSearchFlights,
             participant_id=participant_id,
+            **kwargs,
         )
         return FetchedUSSFlights(v19_query=query)
     elif rid_version == RIDVersion.f3411_22a:
@@ -1204,6 +1210,7 @@ def uss_flights(
             scope=v22a.constants.Scope.DisplayProvider,
             query_type=QueryType.F3411v22aUSSSearchFlights,
             participant_id=participant_id,
+            **kwargs,
         )
         return FetchedUSSFlights(v22a_query=query)
     else:
@@ -1369,7 +1376,16 @@ def all_flights(
     dss_base_url: str = "",
     enhanced_details: bool = False,
     dss_participant_id: str | None = None,
+    max_concurrent_queries: int = 1,
 ) -> FetchedFlights:
+    """Fetch all flights in the specified area from the USSs with ISAs in the DSS, as a Display Provider would.
+
+    Args:
+        max_concurrent_queries: Maximum number of queries to USSs (for flights and flight details) to have in progress
+            at once.  If greater than 1, USS queries are performed concurrently from a bounded pool of threads sharing
+            `session`; otherwise, they are performed sequentially.  Either way, the result contains the same queries in
+            the same order, and each query's timing reflects that individual query.
+    """
     t = datetime.datetime.now(datetime.UTC)
     isa_list = isas(
         geo.get_latlngrect_vertices(area),
@@ -1381,10 +1397,8 @@ def all_flights(
         participant_id=dss_participant_id,
     )
 
-    uss_flight_queries: dict[str, FetchedUSSFlights] = {}
-    uss_flight_details_queries: dict[str, FetchedUSSFlightDetails] = {}
-    for flights_url in isa_list.flights_urls:
-        flights_for_url = uss_flights(
+    def get_uss_flights(flights_url: str) -> FetchedUSSFlights:
+        return uss_flights(
             flights_url,
             area,
             include_recent_positions,
@@ -1394,19 +1408,58 @@ def all_flights(
             # this can only be determined later by comparing injected and observed flights.
             participant_id=None,
         )
-        uss_flight_queries[flights_url] = flights_for_url
-
-        if get_details and flights_for_url.success:
-            for flight in flights_for_url.flights:
-                details = flight_details(
-                    flights_url,
-                    flight.id,
-                    enhanced_details,
-                    rid_version,
-                    session,
-                    participant_id=None,
-                )
-                uss_flight_details_queries[flight.id] = details
+
+    def get_flight_details(flights_url: str, flight_id: str) -> FetchedUSSFlightDetails:
+        return flight_details(
+            flights_url,
+            flight_id,
+            enhanced_details,
+            rid_version,
+            session,
+            participant_id=None,
+        )
+
+    uss_flight_queries: dict[str, FetchedUSSFlights] = {}
+    uss_flight_details_queries: dict[str, FetchedUSSFlightDetails] = {}
+    if max_concurrent_queries <= 1:
+        for flights_url in isa_list.flights_urls:
+            flights_for_url = get_uss_flights(flights_url)
+            uss_flight_queries[flights_url] = flights_for_url
+
+            if get_details and flights_for_url.success:
+                for flight in flights_for_url.flights:
+                    uss_flight_details_queries[flight.id] = get_flight_details(
+                        flights_url, flight.id
+                    )
+    else:
+        with ThreadPoolExecutor(max_workers=max_concurrent_queries) as executor:
+            flights_futures = {
+                executor.submit(get_uss_flights, flights_url): flights_url
+                for flights_url in isa_list.flights_urls
+            }
+            fetched_flights: dict[str, FetchedUSSFlights] = {}
+            details_futures: dict[
+                str, list[tuple[str, Future[FetchedUSSFlightDetails]]]
+            ] = {}
+            # Request details for each USS's flights as soon as that USS's flights are obtained
+            for future in as_completed(flights_futures):
+                flights_url = flights_futures[future]
+                flights_for_url = future.result()
+                fetched_flights[flights_url] = flights_for_url
+                if get_details and flights_for_url.success:
+                    details_futures[flights_url] = [
+                        (
+                            flight.id,
+                            executor.submit(get_flight_details, flights_url, flight.id),
+                        )
+                        for flight in flights_for_url.flights
+                    ]
+
+            # Assemble results in the same order they would be obtained sequentially
+            for flights_url in isa_list.flights_urls:
+                uss_flight_queries[flights_url] = fetched_flights[flights_url]
+                for flight_id, details_future in details_futures.get(flights_url, []):
+                    uss_flight_details_queries[flight_id] = details_future.result()
 
     return FetchedFlights(
         dss_isa_query=isa_list,
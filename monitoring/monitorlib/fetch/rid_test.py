@@ -0,0 +1,81 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import s2sphere
+
+from monitoring.monitorlib.fetch import rid
+from monitoring.monitorlib.rid import RIDVersion
+
+FLIGHTS_BY_URL = {
+    "https://uss1/flights": ["f1", "f2", "f3"],
+    "https://uss2/flights": [],
+    "https://uss3/flights": ["f4"],
+    "https://uss4/flights": ["f5", "f6"],
+}
+
+
+class _FakeUSSs:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_progress = 0
+        self.max_in_progress = 0
+
+    def _query(self, delay: float):
+        with self._lock:
+            self.in_progress += 1
+            self.max_in_progress = max(self.max_in_progress, self.in_progress)
+        time.sleep(delay)
+        with self._lock:
+            self.in_progress -= 1
+
+    def isas(self, *args, **kwargs):
+        return SimpleNamespace(flights_urls={url: "uss" for url in FLIGHTS_BY_URL})
+
+    def uss_flights(self, flights_url: str, *args, **kwargs):
+        # Earlier USSs respond more slowly
+        self._query(
+            0.05 * (len(FLIGHTS_BY_URL) - list(FLIGHTS_BY_URL).index(flights_url))
+        )
+        return SimpleNamespace(
+            success=True,
+            url=flights_url,
+            flights=[SimpleNamespace(id=f) for f in FLIGHTS_BY_URL[flights_url]],
+        )
+
+    def flight_details(self, flights_url: str, flight_id: str, *args, **kwargs):
+        self._query(0.01)
+        return SimpleNamespace(url=flights_url, flight_id=flight_id)
+
+
+@pytest.mark.parametrize("max_concurrent_queries", [1, 3])
+def test_all_flights(mocker, max_concurrent_queries: int):
+    fake = _FakeUSSs()
+    mocker.patch.object(rid, "isas", fake.isas)
+    mocker.patch.object(rid, "uss_flights", fake.uss_flights)
+    mocker.patch.object(rid, "flight_details", fake.flight_details)
+
+    result = rid.all_flights(
+        area=s2sphere.LatLngRect.full(),
+        include_recent_positions=True,
+        get_details=True,
+        rid_version=RIDVersion.f3411_22a,
+        session=mocker.Mock(),
+        max_concurrent_queries=max_concurrent_queries,
+    )
+
+    assert list(result.uss_flight_queries) == list(FLIGHTS_BY_URL)
+    for url, flights in result.uss_flight_queries.items():
+        assert flights.url == url
+    assert list(result.uss_flight_details_queries) == [
+        f for flights in FLIGHTS_BY_URL.values() for f in flights
+    ]
+    for flight_id, details in result.uss_flight_details_queries.items():
+        assert details.flight_id == flight_id
+        assert flight_id in FLIGHTS_BY_URL[str(details.url)]
+
+    if max_concurrent_queries == 1:
+        assert fake.max_in_progress == 1
+    else:
+        assert 1 < fake.max_in_progress <= max_concurrent_queries
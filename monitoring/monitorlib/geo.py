@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import functools
 import math
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from enum import StrEnum
 
 import numpy as np
@@ -826,6 +827,178 @@ def unflatten(
     )
 
 
+def _flatten_arrays(
+    reference: s2sphere.LatLng, lats: np.ndarray, lngs: np.ndarray
+) -> np.ndarray:
+    """Vectorized version of `flatten`; returns an array of (dx, dy) rows in meters from reference."""
+    x = (
+        (lngs - reference.lng().degrees)
+        * EARTH_CIRCUMFERENCE_KM
+        * math.cos(reference.lat().radians)
+        * 1000
+        / 360
+    )
+    y = (lats - reference.lat().degrees) * EARTH_CIRCUMFERENCE_KM * 1000 / 360
+    return np.column_stack((x, y))
+
+
+def _field(d: dict, key: str):
+    """Get an optional field of an ImplicitDict without the overhead of attribute access."""
+    return d[key] if key in d else None
+
+
+_DEGREES_PER_METER = 360 / (EARTH_CIRCUMFERENCE_KM * 1000)
+"""Degrees of latitude per meter of flattened distance (see `flatten`)."""
+
+_EPSILON_DEG = 1e-9
+"""Tolerance for bounding box comparisons so that rounding never rejects pairs of touching footprints."""
+
+
+class Volume3DArray:
+    """Many Volume3Ds packed into NumPy arrays so intersections between them may be evaluated in batches.
+
+    Bounding boxes are kept in degrees so that pairs of volumes may be rejected without choosing a common reference
+    point.  Pairs which are not rejected are evaluated exactly as in `Volume3D.intersects_vol3`: both footprints are
+    flattened (see `flatten`) relative to the reference point of the first volume of the pair.  As in
+    `Volume3D.intersects_vol3`, altitudes are compared by value; unspecified altitude bounds are treated as unbounded.
+    """
+
+    def __init__(self, volumes: Sequence[Volume3D]):
+        self.volumes = list(volumes)
+        n = len(self.volumes)
+
+        # Fields are read with item access since ImplicitDict attribute access is comparatively slow
+        self._lats: list[np.ndarray] = []
+        self._lngs: list[np.ndarray] = []
+        """Center of each circular footprint, or vertices of each polygonal footprint (degrees)"""
+        self._is_circle = np.zeros(n, dtype=bool)
+        """Whether each footprint is circular (rather than polygonal)"""
+        self._radii = np.zeros(n, dtype=float)
+        """Radius of each circular footprint (meters), or 0 for polygonal footprints"""
+        self.alt_lo = np.full(n, -np.inf)
+        self.alt_hi = np.full(n, np.inf)
+        for i, v in enumerate(self.volumes):
+            if altitude_lower := _field(v, "altitude_lower"):
+                self.alt_lo[i] = altitude_lower["value"]
+            if altitude_upper := _field(v, "altitude_upper"):
+                self.alt_hi[i] = altitude_upper["value"]
+            if circle := _field(v, "outline_circle"):
+                radius = circle["radius"]
+                if radius["units"] != "M":
+                    raise NotImplementedError(
+                        f"Unsupported circle radius units: {radius['units']}"
+                    )
+                self._lats.append(np.array([circle["center"]["lat"]], dtype=float))
+                self._lngs.append(np.array([circle["center"]["lng"]], dtype=float))
+                self._is_circle[i] = True
+                self._radii[i] = radius["value"]
+            elif polygon := _field(v, "outline_polygon"):
+                vertices = polygon["vertices"]
+                self._lats.append(np.array([p["lat"] for p in vertices], dtype=float))
+                self._lngs.append(np.array([p["lng"] for p in vertices], dtype=float))
+            else:
+                raise ValueError("Neither outline_circle nor outline_polygon specified")
+
+        self.ref_lat = np.array([lats[0] for lats in self._lats], dtype=float)
+        """Latitude of the reference point of each volume (see `reference`)"""
+        radii_deg = self._radii * _DEGREES_PER_METER
+        self.lat_lo = np.array([lats.min() for lats in self._lats]) - radii_deg
+        self.lat_hi = np.array([lats.max() for lats in self._lats]) + radii_deg
+        self.lng_lo = np.array([lngs.min() for lngs in self._lngs])
+        self.lng_hi = np.array([lngs.max() for lngs in self._lngs])
+        """Longitude bounds of each footprint's center or vertices; the longitude extent of a circle depends on the
+        reference point relative to which it is flattened"""
+
+        self._footprints: list[shapely.Geometry | None] = [None] * n
+
+    def __len__(self) -> int:
+        return len(self.volumes)
+
+    def reference(self, i: int) -> s2sphere.LatLng:
+        """Point relative to which `self.volumes[i].intersects_vol3` flattens footprints."""
+        return s2sphere.LatLng.from_degrees(self._lats[i][0], self._lngs[i][0])
+
+    def footprint(self, i: int, reference: s2sphere.LatLng) -> shapely.Geometry:
+        """Footprint of the i-th volume flattened relative to the specified reference point, constructed in the same
+        way as in `Volume3D.intersects_vol3`."""
+        points = _flatten_arrays(reference, self._lats[i], self._lngs[i])
+        if self._is_circle[i]:
+            return shapely.geometry.Point(*points[0]).buffer(self._radii[i])
+        return shapely.geometry.Polygon(points)
+
+    def own_footprint(self, i: int) -> shapely.Geometry:
+        """Footprint of the i-th volume flattened relative to its own reference point (cached)."""
+        footprint = self._footprints[i]
+        if footprint is None:
+            footprint = self.footprint(i, self.reference(i))
+            self._footprints[i] = footprint
+        return footprint
+
+    def intersections(
+        self, other: Volume3DArray, candidates: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Determine which volumes in this array intersect which volumes in another array.
+
+        Pairs whose bounding boxes (footprint and altitude) do not overlap are rejected without constructing or testing
+        footprint geometries.  Each remaining pair is then evaluated as `self.volumes[i].intersects_vol3` would.
+
+        Args:
+            other: Volumes to test against.
+            candidates: If specified, boolean array of shape (len(self), len(other)) indicating the only pairs which
+                may intersect (e.g., because their time ranges overlap).
+
+        Returns: Boolean array of shape (len(self), len(other)) where element [i, j] indicates whether self.volumes[i]
+            intersects other.volumes[j].
+        """
+        # Degrees of longitude per meter when flattening relative to the reference point of each volume in this array
+        lng_scale = _DEGREES_PER_METER / np.cos(np.radians(self.ref_lat))
+        lng_lo1 = (self.lng_lo - self._radii * lng_scale)[:, np.newaxis]
+        lng_hi1 = (self.lng_hi + self._radii * lng_scale)[:, np.newaxis]
+        lng_lo2 = other.lng_lo[np.newaxis, :] - np.outer(lng_scale, other._radii)
+        lng_hi2 = other.lng_hi[np.newaxis, :] + np.outer(lng_scale, other._radii)
+        mask = (
+            (self.alt_lo[:, np.newaxis] <= other.alt_hi[np.newaxis, :])
+            & (other.alt_lo[np.newaxis, :] <= self.alt_hi[:, np.newaxis])
+            & (self.lat_lo[:, np.newaxis] <= other.lat_hi[np.newaxis, :] + _EPSILON_DEG)
+            & (other.lat_lo[np.newaxis, :] <= self.lat_hi[:, np.newaxis] + _EPSILON_DEG)
+            & (lng_lo1 <= lng_hi2 + _EPSILON_DEG)
+            & (lng_lo2 <= lng_hi1 + _EPSILON_DEG)
+        )
+        if candidates is not None:
+            mask &= candidates
+
+        result = np.zeros(mask.shape, dtype=bool)
+        for i in np.flatnonzero(mask.any(axis=1)).tolist():
+            cols = np.flatnonzero(mask[i])
+            reference = self.reference(i)
+            footprints2 = np.array(
+                [other.footprint(j, reference) for j in cols.tolist()], dtype=object
+            )
+            result[i, cols] = shapely.intersects(self.own_footprint(i), footprints2)
+        return result
+
+
+def intersection_matrix_vol3s(
+    vol3s_1: Sequence[Volume3D],
+    vol3s_2: Sequence[Volume3D],
+    candidates: np.ndarray | None = None,
+) -> np.ndarray:
+    """Determine which of the volumes in vol3s_1 intersect which of the volumes in vol3s_2.
+
+    Element [i, j] of the result is the same as `vol3s_1[i].intersects_vol3(vol3s_2[j])`.
+
+    Args:
+        vol3s_1: First set of volumes (N).
+        vol3s_2: Second set of volumes (M).
+        candidates: If specified, boolean N×M array indicating the only pairs which may intersect.
+
+    Returns: Boolean N×M array where element [i, j] indicates whether vol3s_1[i] intersects vol3s_2[j].
+    """
+    if not vol3s_1 or not vol3s_2 or (candidates is not None and not candidates.any()):
+        return np.zeros((len(vol3s_1), len(vol3s_2)), dtype=bool)
+    return Volume3DArray(vol3s_1).intersections(Volume3DArray(vol3s_2), candidates)
+
+
 def area_of_latlngrect(rect: s2sphere.LatLngRect) -> float:
     """Compute the approximate surface area within a lat-lng rectangle."""
     return EARTH_AREA_M2 * rect.area() / (4 * math.pi)
@@ -925,18 +1098,14 @@ def latitude_degrees(distance_meters: float) -> float:
     return 360 * distance_meters / EARTH_CIRCUMFERENCE_M
 
 
+EGM96_OFFSET_CACHE_SIZE = 4096
+"""Number of most recently requested points at which EGM96 geoid offsets are retained by egm96_geoid_offset."""
+
 _egm96: Spline | None = None
 """Cached EGM96 geoid interpolation function with inverted latitude"""
 
 
-def egm96_geoid_offset(p: s2sphere.LatLng) -> float:
-    """Estimate the EGM96 geoid height above the WGS84 ellipsoid.
-
-    Args:
-        p: Point where offset should be estimated.
-
-    Returns: Meters above WGS84 ellipsoid of the EGM96 geoid at p.
-    """
+def _egm96_spline() -> Spline:
     global _egm96
     if _egm96 is None:
         grid_size = 0.25  # degrees
@@ -947,18 +1116,64 @@ def egm96_geoid_offset(p: s2sphere.LatLng) -> float:
         grid_path = os.path.join(os.path.dirname(__file__), "assets/WW15MGH.DAC")
         grid = np.fromfile(grid_path, ">i2").reshape(lats.size, lngs.size) / 100
         _egm96 = Spline(lats, lngs, grid)
-    lng = math.fmod(p.lng().degrees, 360)
-    while lng < 0:
-        lng += 360
-    lat = p.lat().degrees
-    if lat < -90 or lat > 90:
-        raise ValueError(f"Cannot compute EGM96 geoid offset at latitude {lat} degrees")
+    return _egm96
+
+
+def load_egm96() -> None:
+    """Load the EGM96 geoid model now rather than on first use.
+
+    Each process otherwise loads its own copy of the model.  Processes forked after this is called (e.g., gunicorn
+    workers with preloading) instead share the memory of the model loaded here until they modify it.
+    """
+    _egm96_spline()
+
+
+def egm96_geoid_offsets(
+    lats: Sequence[float] | np.ndarray, lngs: Sequence[float] | np.ndarray
+) -> np.ndarray:
+    """Estimate the EGM96 geoid height above the WGS84 ellipsoid at many points at once.
+
+    Args:
+        lats: Latitude (degrees) of each point where offset should be estimated.
+        lngs: Longitude (degrees) of each point where offset should be estimated.
+
+    Returns: Meters above WGS84 ellipsoid of the EGM96 geoid at each point.
+    """
+    lat = np.asarray(lats, dtype=np.float64)
+    lng = np.asarray(lngs, dtype=np.float64)
+    if lat.shape != lng.shape:
+        raise ValueError(
+            f"Cannot compute EGM96 geoid offsets for {lat.shape} latitudes and {lng.shape} longitudes"
+        )
+    out_of_range = (lat < -90) | (lat > 90)
+    if np.any(out_of_range):
+        raise ValueError(
+            f"Cannot compute EGM96 geoid offset at latitude {lat[out_of_range].flat[0]} degrees"
+        )
+    lng = np.fmod(lng, 360)
+    lng[lng < 0] += 360
 
     # Negative latitude because the grid file lists offsets from 90 to -90
     # degrees latitude, but Splines must have increasing X so latitudes must be
     # listed -90 to 90.  Since latitude data are symmetric, we can simply
     # convert "-90 to 90" to "90 to -90" by inverting the requested latitude.
-    return _egm96.ev(-lat, lng).item()
+    return _egm96_spline().ev(-lat, lng)
+
+
+@functools.lru_cache(maxsize=EGM96_OFFSET_CACHE_SIZE)
+def _egm96_geoid_offset_at(lat: float, lng: float) -> float:
+    return egm96_geoid_offsets(np.array([lat]), np.array([lng])).item()
+
+
+def egm96_geoid_offset(p: s2sphere.LatLng) -> float:
+    """Estimate the EGM96 geoid height above the WGS84 ellipsoid.
+
+    Args:
+        p: Point where offset should be estimated.
+
+    Returns: Meters above WGS84 ellipsoid of the EGM96 geoid at p.
+    """
+    return _egm96_geoid_offset_at(p.lat().degrees, p.lng().degrees)
 
 
 def egm2008_geoid_offset(p: s2sphere.LatLng) -> float:
@@ -1,5 +1,7 @@
+import random
 import unittest
 
+import pytest
 from s2sphere import LatLng
 
 from monitoring.monitorlib.geo import (
@@ -14,9 +16,12 @@ from monitoring.monitorlib.geo import (
     RelativeTranslation,
     Volume3D,
     apply_rotation,
+    egm96_geoid_offset,
+    egm96_geoid_offsets,
     flatten,
     generate_area_in_vicinity,
     generate_slight_overlap_area,
+    intersection_matrix_vol3s,
     make_rotation_matrix,
     unflatten,
 )
@@ -333,3 +338,99 @@ def test_generate_area_in_vicinity():
         generate_area_in_vicinity(_points([(-1, -1), (0, -1), (0, 0), (-1, 0)]), 2),
         _points([(-2.0, -2.0), (-2.0, -2.5), (-2.5, -2.5), (-2.5, -2.0)]),
     )
+
+
+def _random_vol3(rng: random.Random) -> Volume3D:
+    lat = 34 + rng.uniform(0, 0.02)
+    lng = -118 + rng.uniform(0, 0.02)
+    alt = rng.uniform(0, 200)
+    vol3 = Volume3D(
+        altitude_lower=Altitude.w84m(alt),
+        altitude_upper=Altitude.w84m(alt + rng.uniform(10, 100)),
+    )
+    if rng.random() < 0.5:
+        vol3.outline_circle = Circle.from_meters(lat, lng, rng.uniform(10, 500))
+    else:
+        vol3.outline_polygon = Polygon.from_coords(
+            [
+                (lat + rng.uniform(-0.005, 0.005), lng + rng.uniform(-0.005, 0.005))
+                for _ in range(rng.randint(3, 6))
+            ]
+        )
+    return vol3
+
+
+def test_intersection_matrix_vol3s():
+    rng = random.Random(0)
+    vol3s_1 = [_random_vol3(rng) for _ in range(10)]
+    vol3s_2 = [_random_vol3(rng) for _ in range(40)]
+
+    matrix = intersection_matrix_vol3s(vol3s_1, vol3s_2)
+
+    assert matrix.shape == (10, 40)
+    assert matrix.any()
+    assert not matrix.all()
+    for i, v1 in enumerate(vol3s_1):
+        for j, v2 in enumerate(vol3s_2):
+            assert matrix[i, j] == v1.intersects_vol3(v2)
+
+    assert intersection_matrix_vol3s([], vol3s_2).shape == (0, 40)
+
+
+def test_intersection_matrix_vol3s_across_latitudes():
+    rng = random.Random(0)
+    vol3s = []
+    for lat in (-60, 0, 45, 60):
+        for _ in range(6):
+            vol3 = _random_vol3(rng)
+            vol3.altitude_lower = Altitude.w84m(0)
+            vol3.altitude_upper = Altitude.w84m(100)
+            if vol3.outline_circle:
+                vol3.outline_circle.center.lat += lat - 34
+            elif vol3.outline_polygon:
+                for p in vol3.outline_polygon.vertices:
+                    p.lat += lat - 34
+            vol3s.append(vol3)
+    # Circles 2100 m apart at the equator do not intersect, whichever other volumes are evaluated with them
+    a = Volume3D(
+        outline_circle=Circle.from_meters(0, 0, 1000),
+        altitude_lower=Altitude.w84m(0),
+        altitude_upper=Altitude.w84m(100),
+    )
+    b = Volume3D(
+        outline_circle=Circle.from_meters(0, 2100 * 360 / 40075000, 1000),
+        altitude_lower=Altitude.w84m(0),
+        altitude_upper=Altitude.w84m(100),
+    )
+    # A circle of zero radius has an empty footprint, so does not intersect even a circle at the same center
+    zero = Volume3D(
+        outline_circle=Circle.from_meters(0, 0, 0),
+        altitude_lower=Altitude.w84m(0),
+        altitude_upper=Altitude.w84m(100),
+    )
+    vol3s.extend([a, b, zero])
+
+    matrix = intersection_matrix_vol3s(vol3s, vol3s)
+
+    assert not a.intersects_vol3(b)
+    assert not zero.intersects_vol3(a)
+    assert matrix.any()
+    for i, v1 in enumerate(vol3s):
+        for j, v2 in enumerate(vol3s):
+            assert matrix[i, j] == v1.intersects_vol3(v2)
+
+
+def test_egm96_geoid_offsets():
+    lats = [0, 45.5, -33.25, 90, -90, 12.3]
+    lngs = [0, -122.1, 151.75, 10, -10, 359.9]
+    offsets = egm96_geoid_offsets(lats, lngs)
+    assert offsets.shape == (len(lats),)
+    for lat, lng, offset in zip(lats, lngs, offsets):
+        p = LatLng.from_degrees(lat, lng)
+        assert egm96_geoid_offset(p) == offset
+        assert egm96_geoid_offset(p) == offset  # cached
+    assert egm96_geoid_offsets([10], [-190]) == egm96_geoid_offsets([10], [170])
+    with pytest.raises(ValueError):
+        egm96_geoid_offsets([91], [0])
+    with pytest.raises(ValueError):
+        egm96_geoid_offsets([0, 1], [0])
@@ -3,6 +3,7 @@ from __future__ import annotations
 import math
 from datetime import datetime, timedelta
 
+import numpy as np
 import s2sphere as s2sphere
 from implicitdict import ImplicitDict, Optional, StringBasedTimeDelta
 from uas_standards.astm.f3548.v21 import api as f3548v21
@@ -198,7 +199,10 @@ class Volume4D(ImplicitDict):
             lng_radius = (
                 360
                 * circle.radius.value
-                / (geo.EARTH_CIRCUMFERENCE_M * math.cos(math.radians(lat_radius)))
+                / (
+                    geo.EARTH_CIRCUMFERENCE_M
+                    * math.cos(math.radians(circle.center.lat))
+                )
             )
             lat_min = min(lat_min, circle.center.lat - lat_radius)
             lat_max = max(lat_max, circle.center.lat + lat_radius)
@@ -436,7 +440,10 @@ class Volume4DCollection(list[Volume4D]):
                 lng_radius = (
                     360
                     * circle.radius.value
-                    / (geo.EARTH_CIRCUMFERENCE_M * math.cos(math.radians(lat_radius)))
+                    / (
+                        geo.EARTH_CIRCUMFERENCE_M
+                        * math.cos(math.radians(circle.center.lat))
+                    )
                 )
                 lat_min = min(lat_min, circle.center.lat - lat_radius)
                 lat_max = max(lat_max, circle.center.lat + lat_radius)
@@ -506,12 +513,38 @@ class Volume4DCollection(list[Volume4D]):
             )
         return alt_lo, alt_hi
 
+    def _time_bounds(self) -> np.ndarray:
+        """Start and end timestamps of each volume (infinite when unspecified), as an N×2 array."""
+        bounds = np.empty((len(self), 2))
+        for i, v in enumerate(self):
+            # Fields are read with item access since ImplicitDict attribute access is comparatively slow
+            time_start = v["time_start"] if "time_start" in v else None
+            time_end = v["time_end"] if "time_end" in v else None
+            bounds[i, 0] = time_start.datetime.timestamp() if time_start else -np.inf
+            bounds[i, 1] = time_end.datetime.timestamp() if time_end else np.inf
+        return bounds
+
+    def intersection_matrix(self, vol4s_2: Volume4DCollection) -> np.ndarray:
+        """Determine which volumes in this collection intersect which volumes in vol4s_2.
+
+        Time and bounding box overlaps are evaluated for all pairs at once; exact footprint intersection is only
+        evaluated for pairs which pass those checks.  See `geo.intersection_matrix_vol3s`.
+
+        Returns: Boolean N×M array where element [i, j] indicates whether self[i] intersects vol4s_2[j].
+        """
+        t1 = self._time_bounds()
+        t2 = vol4s_2._time_bounds()
+        overlapping_times = (t1[:, np.newaxis, 0] <= t2[np.newaxis, :, 1]) & (
+            t2[np.newaxis, :, 0] <= t1[:, np.newaxis, 1]
+        )
+        return geo.intersection_matrix_vol3s(
+            [v.volume for v in self],
+            [v.volume for v in vol4s_2],
+            overlapping_times,
+        )
+
     def intersects_vol4s(self, vol4s_2: Volume4DCollection) -> bool:
-        for v1 in self:
-            for v2 in vol4s_2:
-                if v1.intersects_vol4(v2):
-                    return True
-        return False
+        return bool(self.intersection_matrix(vol4s_2).any())
 
     @staticmethod
     def from_f3548v21(vol4s: list[f3548v21.Volume4D]) -> Volume4DCollection:
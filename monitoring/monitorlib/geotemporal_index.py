@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Hashable, Iterator
+from datetime import timedelta
+from typing import Generic, NamedTuple, TypeVar
+
+from monitoring.monitorlib import geo
+from monitoring.monitorlib.geotemporal import Volume4D, Volume4DCollection
+
+TKey = TypeVar("TKey", bound=Hashable)
+
+DEFAULT_CELL_SIZE_DEG = 0.01
+"""Size (degrees of latitude and longitude) of each cell of the spatial grid; roughly 1 km in latitude."""
+
+DEFAULT_TIME_BUCKET = timedelta(minutes=15)
+"""Duration of each time bucket of the temporal grid."""
+
+MAX_GRID_KEYS = 1024
+"""Volumes that would occupy more than this many grid (lat cell, lng cell, time bucket) keys are not placed on the grid, and are
+instead considered candidates for every query."""
+
+BOUNDS_MARGIN_FRACTION = 0.01
+"""Fraction of a volume's lat/lng extent by which its bounds are padded."""
+
+
+class VolumeBounds(NamedTuple):
+    """Axis-aligned bounds of a Volume4D; unspecified bounds are infinite."""
+
+    lat_lo: float
+    lat_hi: float
+    lng_lo: float
+    lng_hi: float
+    alt_lo: float
+    alt_hi: float
+    t_lo: float
+    t_hi: float
+
+    def intersects(self, other: VolumeBounds) -> bool:
+        return (
+            self.lat_lo <= other.lat_hi
+            and other.lat_lo <= self.lat_hi
+            and self.lng_lo <= other.lng_hi
+            and other.lng_lo <= self.lng_hi
+            and self.alt_lo <= other.alt_hi
+            and other.alt_lo <= self.alt_hi
+            and self.t_lo <= other.t_hi
+            and other.t_lo <= self.t_hi
+        )
+
+    @staticmethod
+    def from_volume4d(vol4: Volume4D) -> VolumeBounds:
+        rect = vol4.rect_bounds
+        lat_lo, lat_hi = rect.lat_lo().degrees, rect.lat_hi().degrees
+        lng_lo, lng_hi = rect.lng_lo().degrees, rect.lng_hi().degrees
+        # Exact intersection flattens footprints relative to a reference point, so pad the lat/lng bounds slightly to
+        # make sure they remain conservative.
+        lat_margin = (
+            lat_hi - lat_lo
+        ) * BOUNDS_MARGIN_FRACTION + geo.COORD_TOLERANCE_DEG
+        lng_margin = (
+            lng_hi - lng_lo
+        ) * BOUNDS_MARGIN_FRACTION + geo.COORD_TOLERANCE_DEG
+        vol3 = vol4.volume
+        return VolumeBounds(
+            lat_lo=lat_lo - lat_margin,
+            lat_hi=lat_hi + lat_margin,
+            lng_lo=lng_lo - lng_margin,
+            lng_hi=lng_hi + lng_margin,
+            alt_lo=vol3.altitude_lower.value if vol3.altitude_lower else -math.inf,
+            alt_hi=vol3.altitude_upper.value if vol3.altitude_upper else math.inf,
+            t_lo=vol4.time_start.datetime.timestamp() if vol4.time_start else -math.inf,
+            t_hi=vol4.time_end.datetime.timestamp() if vol4.time_end else math.inf,
+        )
+
+
+GridKey = tuple[int, int, int]
+"""Latitude cell number, longitude cell number, and time bucket number."""
+
+
+class Volume4DIndex(Generic[TKey]):  # noqa: UP046 (see SynchronizedValue)
+    """In-process spatio-temporal index of entries that each occupy a Volume4DCollection.
+
+    Each entry is placed in a grid of (lat/lng cell, time bucket) keys covering the bounds of its volumes, so that the
+    candidates which may intersect a query volume can be found without examining every entry.  Candidates are then
+    narrowed using the lat/lng, altitude, and time bounds of the individual volumes.  The index is conservative: an
+    entry that intersects the query is always a candidate, but exact intersection (e.g.,
+    `Volume4DCollection.intersects_vol4s`) must still be evaluated for each candidate.
+
+    Altitudes are compared by value, consistent with `Volume3D.intersects_vol3`.
+    """
+
+    def __init__(
+        self,
+        cell_size_deg: float = DEFAULT_CELL_SIZE_DEG,
+        time_bucket: timedelta = DEFAULT_TIME_BUCKET,
+    ):
+        self._cell_size_deg = cell_size_deg
+        self._time_bucket_seconds = time_bucket.total_seconds()
+
+        self._bounds: dict[TKey, list[VolumeBounds]] = {}
+        self._grid_keys: dict[TKey, set[GridKey]] = {}
+        self._grid: dict[GridKey, set[TKey]] = {}
+        self._off_grid: set[TKey] = set()
+
+    def _grid_keys_of(self, bounds: VolumeBounds) -> set[GridKey] | None:
+        """Determine the grid keys occupied by the specified bounds, or None if they should not be placed on the grid."""
+        if math.isinf(bounds.t_lo) or math.isinf(bounds.t_hi):
+            return None
+        bucket_lo = math.floor(bounds.t_lo / self._time_bucket_seconds)
+        bucket_hi = math.floor(bounds.t_hi / self._time_bucket_seconds)
+        n_buckets = bucket_hi - bucket_lo + 1
+
+        lat_lo = math.floor(bounds.lat_lo / self._cell_size_deg)
+        lat_hi = math.floor(bounds.lat_hi / self._cell_size_deg)
+        lng_lo = math.floor(bounds.lng_lo / self._cell_size_deg)
+        lng_hi = math.floor(bounds.lng_hi / self._cell_size_deg)
+        if (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1) * n_buckets > MAX_GRID_KEYS:
+            return None
+
+        return {
+            (lat, lng, bucket)
+            for lat in range(lat_lo, lat_hi + 1)
+            for lng in range(lng_lo, lng_hi + 1)
+            for bucket in range(bucket_lo, bucket_hi + 1)
+        }
+
+    def _place(
+        self, volumes: Volume4DCollection
+    ) -> tuple[list[VolumeBounds], set[GridKey] | None]:
+        all_bounds = []
+        all_grid_keys: set[GridKey] | None = set()
+        for vol4 in volumes:
+            bounds = VolumeBounds.from_volume4d(vol4)
+            all_bounds.append(bounds)
+            if all_grid_keys is not None:
+                grid_keys = self._grid_keys_of(bounds)
+                if grid_keys is None:
+                    all_grid_keys = None
+                else:
+                    all_grid_keys |= grid_keys
+        if all_grid_keys is not None and len(all_grid_keys) > MAX_GRID_KEYS:
+            all_grid_keys = None
+        return all_bounds, all_grid_keys
+
+    def set(self, key: TKey, volumes: Volume4DCollection) -> None:
+        """Add an entry occupying the specified volumes to the index, replacing any existing entry with the same key."""
+        self.remove(key)
+        all_bounds, grid_keys = self._place(volumes)
+        self._bounds[key] = all_bounds
+        if grid_keys is None:
+            self._off_grid.add(key)
+        else:
+            self._grid_keys[key] = grid_keys
+            for grid_key in grid_keys:
+                self._grid.setdefault(grid_key, set()).add(key)
+
+    def remove(self, key: TKey) -> None:
+        """Remove the entry with the specified key from the index, if present."""
+        if self._bounds.pop(key, None) is None:
+            return
+        self._off_grid.discard(key)
+        for grid_key in self._grid_keys.pop(key, set()):
+            keys = self._grid[grid_key]
+            keys.discard(key)
+            if not keys:
+                del self._grid[grid_key]
+
+    def candidates(self, volumes: Volume4DCollection) -> set[TKey]:
+        """Find the keys of all entries with volumes that may intersect any of the specified volumes."""
+        query_bounds, grid_keys = self._place(volumes)
+        if grid_keys is None:
+            possible = self._bounds.keys()
+        else:
+            possible = set(self._off_grid)
+            for grid_key in grid_keys:
+                possible.update(self._grid.get(grid_key, ()))
+
+        return {
+            key
+            for key in possible
+            if any(b1.intersects(b2) for b1 in query_bounds for b2 in self._bounds[key])
+        }
+
+    def __contains__(self, key: TKey) -> bool:
+        return key in self._bounds
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __iter__(self) -> Iterator[TKey]:
+        return iter(self._bounds)
@@ -0,0 +1,136 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+from monitoring.monitorlib.geo import (
+    Altitude,
+    AltitudeDatum,
+    Circle,
+    DistanceUnits,
+    LatLngPoint,
+    Radius,
+    Volume3D,
+)
+from monitoring.monitorlib.geotemporal import Volume4D, Volume4DCollection
+from monitoring.monitorlib.geotemporal_index import Volume4DIndex
+from monitoring.monitorlib.temporal import Time
+
+
+def _random_flight(
+    rng: random.Random, t0: datetime, area_deg: float, duration: timedelta
+) -> Volume4DCollection:
+    lat = 34 + rng.uniform(0, area_deg)
+    lng = -118 + rng.uniform(0, area_deg)
+    t = t0 + rng.uniform(0, 1) * duration
+    volumes = Volume4DCollection()
+    for _ in range(rng.randint(1, 3)):
+        dt = timedelta(minutes=rng.uniform(5, 30))
+        alt = rng.uniform(0, 300)
+        volumes.append(
+            Volume4D(
+                volume=Volume3D(
+                    outline_circle=Circle(
+                        center=LatLngPoint(lat=lat, lng=lng),
+                        radius=Radius(
+                            value=rng.uniform(50, 1000), units=DistanceUnits.M
+                        ),
+                    ),
+                    altitude_lower=Altitude(
+                        value=alt, reference=AltitudeDatum.W84, units=DistanceUnits.M
+                    ),
+                    altitude_upper=Altitude(
+                        value=alt + 50,
+                        reference=AltitudeDatum.W84,
+                        units=DistanceUnits.M,
+                    ),
+                ),
+                time_start=Time(t),
+                time_end=Time(t + dt),
+            )
+        )
+        lat += rng.uniform(-0.01, 0.01)
+        lng += rng.uniform(-0.01, 0.01)
+        t += dt
+    return volumes
+
+
+def main(n_flights: int, n_plans: int, area_deg: float, hours: float) -> int:
+    rng = random.Random(0)
+    t0 = datetime.now(UTC)
+    duration = timedelta(hours=hours)
+    flights = [_random_flight(rng, t0, area_deg, duration) for _ in range(n_flights)]
+    plans = [_random_flight(rng, t0, area_deg, duration) for _ in range(n_plans)]
+
+    t_start = time.monotonic()
+    index = Volume4DIndex[int]()
+    for i, flight in enumerate(flights):
+        index.set(i, flight)
+    build_s = time.monotonic() - t_start
+    print(f"Indexed {n_flights} existing flights in {build_s:.2f}s")
+
+    t_start = time.monotonic()
+    linear_conflicts = [
+        {i for i, flight in enumerate(flights) if plan.intersects_vol4s(flight)}
+        for plan in plans
+    ]
+    linear_s = time.monotonic() - t_start
+
+    t_start = time.monotonic()
+    n_candidates = 0
+    indexed_conflicts = []
+    for plan in plans:
+        candidates = index.candidates(plan)
+        n_candidates += len(candidates)
+        indexed_conflicts.append(
+            {i for i in candidates if plan.intersects_vol4s(flights[i])}
+        )
+    indexed_s = time.monotonic() - t_start
+
+    if indexed_conflicts != linear_conflicts:
+        print("Indexed conflicts did not match exhaustive conflicts")
+        return os.EX_SOFTWARE
+
+    n_conflicts = sum(len(c) for c in linear_conflicts)
+    print(
+        f"Planned {n_plans} flights against {n_flights} existing flights ({n_conflicts} conflicts found):"
+    )
+    print(f"  Exhaustive: {1000 * linear_s / n_plans:.2f}ms per flight planned")
+    print(
+        f"  Indexed:    {1000 * indexed_s / n_plans:.2f}ms per flight planned ({n_candidates / n_plans:.1f} candidates per flight)"
+    )
+    return os.EX_OK
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare exhaustive and indexed conflict detection when planning flights among many existing flights"
+    )
+
+    parser.add_argument(
+        "--flights", type=int, default=10000, help="Number of existing flights"
+    )
+    parser.add_argument(
+        "--plans", type=int, default=100, help="Number of flights to plan"
+    )
+    parser.add_argument(
+        "--area",
+        type=float,
+        default=0.5,
+        help="Size (degrees of latitude and longitude) of the area in which flights are located",
+    )
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=24,
+        help="Duration of the period in which flights start",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    sys.exit(main(args.flights, args.plans, args.area, args.hours))
@@ -0,0 +1,128 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from monitoring.monitorlib.geo import (
+    Altitude,
+    AltitudeDatum,
+    Circle,
+    DistanceUnits,
+    LatLngPoint,
+    Radius,
+    Volume3D,
+)
+from monitoring.monitorlib.geotemporal import Volume4D, Volume4DCollection
+from monitoring.monitorlib.geotemporal_index import Volume4DIndex
+from monitoring.monitorlib.temporal import Time
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _volume(
+    lat: float,
+    lng: float,
+    radius: float,
+    alt_lo: float,
+    alt_hi: float,
+    t_start: timedelta,
+    t_end: timedelta,
+) -> Volume4D:
+    return Volume4D(
+        volume=Volume3D(
+            outline_circle=Circle(
+                center=LatLngPoint(lat=lat, lng=lng),
+                radius=Radius(value=radius, units=DistanceUnits.M),
+            ),
+            altitude_lower=Altitude(
+                value=alt_lo, reference=AltitudeDatum.W84, units=DistanceUnits.M
+            ),
+            altitude_upper=Altitude(
+                value=alt_hi, reference=AltitudeDatum.W84, units=DistanceUnits.M
+            ),
+        ),
+        time_start=Time(T0 + t_start),
+        time_end=Time(T0 + t_end),
+    )
+
+
+def _random_volumes(rng: random.Random) -> Volume4DCollection:
+    start = timedelta(minutes=rng.uniform(0, 180))
+    return Volume4DCollection(
+        [
+            _volume(
+                lat=rng.uniform(34.0, 34.1),
+                lng=rng.uniform(-118.1, -118.0),
+                radius=rng.uniform(50, 1000),
+                alt_lo=(alt := rng.uniform(0, 300)),
+                alt_hi=alt + 50,
+                t_start=start,
+                t_end=start + timedelta(minutes=rng.uniform(1, 30)),
+            )
+            for _ in range(rng.randint(1, 3))
+        ]
+    )
+
+
+def test_candidates_include_all_intersections():
+    rng = random.Random(12345)
+    index = Volume4DIndex[int]()
+    entries = {i: _random_volumes(rng) for i in range(300)}
+    for key, volumes in entries.items():
+        index.set(key, volumes)
+    assert len(index) == len(entries)
+
+    pruned = 0
+    for _ in range(50):
+        query = _random_volumes(rng)
+        candidates = index.candidates(query)
+        for key, volumes in entries.items():
+            if query.intersects_vol4s(volumes):
+                assert key in candidates
+        pruned += len(entries) - len(candidates)
+    assert pruned > 0
+
+
+def test_set_and_remove():
+    index = Volume4DIndex[str]()
+    here = Volume4DCollection(
+        [_volume(34, -118, 100, 0, 100, timedelta(0), timedelta(minutes=10))]
+    )
+    later = Volume4DCollection(
+        [_volume(34, -118, 100, 0, 100, timedelta(hours=2), timedelta(hours=3))]
+    )
+    higher = Volume4DCollection(
+        [_volume(34, -118, 100, 200, 300, timedelta(0), timedelta(minutes=10))]
+    )
+    elsewhere = Volume4DCollection(
+        [_volume(35, -118, 100, 0, 100, timedelta(0), timedelta(minutes=10))]
+    )
+    index.set("a", here)
+    index.set("b", later)
+    index.set("c", higher)
+    index.set("d", elsewhere)
+    assert index.candidates(here) == {"a"}
+
+    index.set("b", here)
+    assert index.candidates(here) == {"a", "b"}
+    assert index.candidates(later) == set()
+
+    index.remove("a")
+    index.remove("a")
+    assert "a" not in index
+    assert index.candidates(here) == {"b"}
+
+
+def test_large_and_unbounded_volumes():
+    index = Volume4DIndex[str]()
+    small = Volume4DCollection(
+        [_volume(34, -118, 100, 0, 100, timedelta(0), timedelta(minutes=10))]
+    )
+    large = Volume4DCollection(
+        [_volume(34.5, -118, 100000, 0, 100, timedelta(0), timedelta(days=2))]
+    )
+    untimed = Volume4D(volume=small[0].volume)
+    index.set("small", small)
+    index.set("large", large)
+    index.set("untimed", Volume4DCollection([untimed]))
+
+    assert index.candidates(small) == {"small", "large", "untimed"}
+    assert index.candidates(large) == {"small", "large", "untimed"}
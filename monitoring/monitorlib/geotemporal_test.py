@@ -136,3 +136,57 @@ class Volume4DCollectionIsEquivalentTest(unittest.TestCase):
         c1 = Volume4DCollection([self.v1, self.v2])
         c2 = Volume4DCollection([self.v1, self.v3])
         self.assertFalse(c1.is_equivalent(c2))
+
+
+class Volume4DCollectionIntersectionTest(unittest.TestCase):
+    def setUp(self):
+        self.t0 = datetime.now()
+
+    def _vol4(
+        self, lng: float, alt: float, start_minutes: float, radius: float = 100
+    ) -> Volume4D:
+        return Volume4D(
+            volume=Volume3D(
+                outline_circle=Circle(
+                    center=LatLngPoint(lat=10, lng=lng),
+                    radius=Radius(value=radius, units=DistanceUnits.M),
+                ),
+                altitude_lower=Altitude(
+                    value=alt, reference=AltitudeDatum.W84, units=DistanceUnits.M
+                ),
+                altitude_upper=Altitude(
+                    value=alt + 50, reference=AltitudeDatum.W84, units=DistanceUnits.M
+                ),
+            ),
+            time_start=Time(self.t0 + timedelta(minutes=start_minutes)),
+            time_end=Time(self.t0 + timedelta(minutes=start_minutes + 10)),
+        )
+
+    def test_intersection_matrix(self):
+        c1 = Volume4DCollection([self._vol4(10, 0, 0), self._vol4(10.1, 0, 0)])
+        c2 = Volume4DCollection(
+            [
+                self._vol4(10, 0, 5),  # Intersects c1[0]
+                self._vol4(10, 0, 20),  # Later
+                self._vol4(10, 100, 0),  # Higher
+                self._vol4(10.1001, 0, 10),  # Intersects c1[1] at its end time
+            ]
+        )
+        matrix = c1.intersection_matrix(c2)
+        self.assertEqual(
+            matrix.tolist(),
+            [[True, False, False, False], [False, False, False, True]],
+        )
+        self.assertTrue(c1.intersects_vol4s(c2))
+        self.assertFalse(c1.intersects_vol4s(Volume4DCollection(c2[1:3])))
+        self.assertFalse(c1.intersects_vol4s(Volume4DCollection()))
+
+    def test_intersection_matrix_zero_radius(self):
+        c1 = Volume4DCollection([self._vol4(10, 0, 0, radius=0)])
+        c2 = Volume4DCollection([self._vol4(10, 0, 0, radius=50)])
+        self.assertEqual(
+            c1.intersection_matrix(c2).tolist(),
+            [[c1[0].volume.intersects_vol3(c2[0].volume)]],
+        )
+        self.assertFalse(c1.intersects_vol4s(c2))
+        self.assertFalse(c2.intersects_vol4s(c1))
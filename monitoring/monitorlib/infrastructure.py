@@ -7,7 +7,7 @@ import threading
 import time
 import urllib.parse
 import weakref
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
 
 import jwt
@@ -26,6 +26,8 @@ ALL_SCOPES = [
 
 EPOCH = datetime.datetime.fromtimestamp(0, datetime.UTC)
 TOKEN_REFRESH_MARGIN = datetime.timedelta(seconds=15)
+TOKEN_BACKGROUND_REFRESH_MARGIN = datetime.timedelta(seconds=60)
+"""Tokens used since they were issued are refreshed in the background this long before they expire."""
 CLIENT_TIMEOUT = 10  # seconds
 SOCKET_KEEP_ALIVE_LIMIT = 57  # seconds.
 
@@ -43,11 +45,218 @@ class AdditionalHeaders:
     token_issuance_seconds: float | None = None
 
 
+TokenCacheKey = tuple[str, str]
+"""Intended audience and space-separated scopes of a cached token."""
+
+
+@dataclass
+class TokenCacheMetrics:
+    hits: int = 0
+    """Number of requests for a token satisfied by a cached token."""
+
+    misses: int = 0
+    """Number of requests for a token which required a token to be issued before responding."""
+
+    background_refreshes: int = 0
+    """Number of tokens issued in the background to replace tokens about to expire."""
+
+    background_refresh_failures: int = 0
+    """Number of attempts to issue a token in the background that failed."""
+
+    issuances: int = 0
+    """Total number of tokens issued (synchronously and in the background)."""
+
+    total_issuance_seconds: float = 0
+    """Total time spent issuing tokens."""
+
+    max_issuance_seconds: float = 0
+    """Longest time spent issuing a single token."""
+
+    @property
+    def mean_issuance_seconds(self) -> float | None:
+        return self.total_issuance_seconds / self.issuances if self.issuances else None
+
+
+@dataclass
+class _CachedToken:
+    token: str
+    expires: datetime.datetime
+    sub: str | None
+    used: bool = False
+    """True if this token has been retrieved from the cache since it was issued."""
+
+    refresh_timer: threading.Timer | None = field(default=None, repr=False)
+
+
+class TokenCache:
+    """Thread-safe cache of access tokens issued by AuthAdapters, keyed by (adapter, audience, scopes).
+
+    Only one token is issued at a time for a given key; concurrent requesters for that key wait for the token being
+    issued rather than each issuing their own.  Tokens which have been used are proactively refreshed in the background
+    shortly before they expire so that requesters rarely need to wait for a token to be issued.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens: weakref.WeakKeyDictionary[
+            AuthAdapter, dict[TokenCacheKey, _CachedToken]
+        ] = weakref.WeakKeyDictionary()
+        self._issuance_locks: weakref.WeakKeyDictionary[
+            AuthAdapter, dict[TokenCacheKey, threading.Lock]
+        ] = weakref.WeakKeyDictionary()
+        self._metrics = TokenCacheMetrics()
+
+    @property
+    def metrics(self) -> TokenCacheMetrics:
+        """Snapshot of this cache's metrics."""
+        with self._lock:
+            return replace(self._metrics)
+
+    def get_token(
+        self, adapter: AuthAdapter, intended_audience: str, scopes: list[str]
+    ) -> tuple[str, float | None]:
+        """Get a valid token from the specified adapter, issuing a new one if necessary.
+
+        Returns:
+            * Token
+            * Seconds spent issuing the token, or None if a cached token was used
+        """
+        key = (intended_audience, " ".join(scopes))
+        token = self._get_valid(adapter, key)
+        if token is not None:
+            return token, None
+
+        with self._issuance_lock(adapter, key):
+            # Another thread may have issued the token while we were waiting
+            token = self._get_valid(adapter, key)
+            if token is not None:
+                return token, None
+
+            with self._lock:
+                self._metrics.misses += 1
+            cached, dt_s = self._issue(adapter, key, scopes)
+            return cached.token, dt_s
+
+    def get_sub(self, adapter: AuthAdapter) -> str | None:
+        """Retrieve `sub` claim from one of the tokens cached for the specified adapter."""
+        with self._lock:
+            for cached in self._tokens.get(adapter, {}).values():
+                if cached.sub is not None:
+                    return cached.sub
+        return None
+
+    def _get_valid(self, adapter: AuthAdapter, key: TokenCacheKey) -> str | None:
+        now = datetime.datetime.now(datetime.UTC)
+        with self._lock:
+            cached = self._tokens.get(adapter, {}).get(key, None)
+            if cached is None or now > cached.expires - TOKEN_REFRESH_MARGIN:
+                return None
+            cached.used = True
+            self._metrics.hits += 1
+            return cached.token
+
+    def _issuance_lock(
+        self, adapter: AuthAdapter, key: TokenCacheKey
+    ) -> threading.Lock:
+        with self._lock:
+            locks = self._issuance_locks.setdefault(adapter, {})
+            if key not in locks:
+                locks[key] = threading.Lock()
+            return locks[key]
+
+    def _issue(
+        self, adapter: AuthAdapter, key: TokenCacheKey, scopes: list[str]
+    ) -> tuple[_CachedToken, float]:
+        """Issue a new token and cache it; the issuance lock for the key must be held."""
+        t0 = time.monotonic()
+        token = adapter.issue_token(key[0], scopes)
+        dt_s = time.monotonic() - t0
+
+        payload = jwt.decode(token, options={"verify_signature": False})
+        cached = _CachedToken(
+            token=token,
+            expires=EPOCH + datetime.timedelta(seconds=payload["exp"]),
+            sub=payload.get("sub", None),
+        )
+
+        with self._lock:
+            self._metrics.issuances += 1
+            self._metrics.total_issuance_seconds += dt_s
+            self._metrics.max_issuance_seconds = max(
+                self._metrics.max_issuance_seconds, dt_s
+            )
+            tokens = self._tokens.setdefault(adapter, {})
+            old = tokens.get(key, None)
+            if old is not None and old.refresh_timer is not None:
+                old.refresh_timer.cancel()
+            tokens[key] = cached
+            cached.refresh_timer = self._schedule_refresh(adapter, key, scopes, cached)
+        return cached, dt_s
+
+    def _schedule_refresh(
+        self,
+        adapter: AuthAdapter,
+        key: TokenCacheKey,
+        scopes: list[str],
+        cached: _CachedToken,
+    ) -> threading.Timer | None:
+        delay = (
+            cached.expires
+            - TOKEN_BACKGROUND_REFRESH_MARGIN
+            - datetime.datetime.now(datetime.UTC)
+        ).total_seconds()
+        if delay <= 0:
+            # Token lifetime is too short to refresh in the background; it will be refreshed when next requested
+            return None
+        timer = threading.Timer(
+            delay,
+            self._refresh_in_background,
+            args=(weakref.ref(adapter), key, scopes, cached),
+        )
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _refresh_in_background(
+        self,
+        adapter_ref: weakref.ref[AuthAdapter],
+        key: TokenCacheKey,
+        scopes: list[str],
+        cached: _CachedToken,
+    ) -> None:
+        adapter = adapter_ref()
+        if adapter is None:
+            return
+        with self._issuance_lock(adapter, key):
+            with self._lock:
+                if self._tokens.get(adapter, {}).get(key, None) is not cached:
+                    # This token has already been replaced
+                    return
+                if not cached.used:
+                    # Nobody has needed this token, so don't spend effort refreshing it
+                    return
+            try:
+                self._issue(adapter, key, scopes)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to refresh token for {key[0]} with scopes {key[1]} in the background: {str(e)}"
+                )
+                with self._lock:
+                    self._metrics.background_refresh_failures += 1
+                return
+            with self._lock:
+                self._metrics.background_refreshes += 1
+
+
+token_cache = TokenCache()
+"""Token cache shared by all AuthAdapters."""
+
+
 class AuthAdapter:
     """Base class for an adapter that add JWTs to requests."""
 
     def __init__(self):
-        self._tokens = {}
+        pass
 
     def issue_token(self, intended_audience: str, scopes: list[str]) -> str:
         """Subclasses must return a bearer token for the given audience."""
@@ -65,23 +274,7 @@ class AuthAdapter:
         if not intended_audience:
             return AdditionalHeaders(headers={})
 
-        scope_string = " ".join(scopes)
-        if intended_audience not in self._tokens:
-            self._tokens[intended_audience] = {}
-        if scope_string not in self._tokens[intended_audience]:
-            t0 = time.monotonic()
-            token = self.issue_token(intended_audience, scopes)
-            dt_s = time.monotonic() - t0
-        else:
-            token = self._tokens[intended_audience][scope_string]
-            dt_s = None
-        payload = jwt.decode(token, options={"verify_signature": False})
-        expires = EPOCH + datetime.timedelta(seconds=payload["exp"])
-        if datetime.datetime.now(datetime.UTC) > expires - TOKEN_REFRESH_MARGIN:
-            t0 = time.monotonic()
-            token = self.issue_token(intended_audience, scopes)
-            dt_s = (dt_s or 0) + (time.monotonic() - t0)
-        self._tokens[intended_audience][scope_string] = token
+        token, dt_s = token_cache.get_token(self, intended_audience, scopes)
         return AdditionalHeaders(
             headers={"Authorization": "Bearer " + token}, token_issuance_seconds=dt_s
         )
@@ -99,12 +292,7 @@ class AuthAdapter:
 
     def get_sub(self) -> str | None:
         """Retrieve `sub` claim from one of the existing tokens"""
-        for _, tokens_by_scope in self._tokens.items():
-            for token in tokens_by_scope.values():
-                payload = jwt.decode(token, options={"verify_signature": False})
-                if "sub" in payload:
-                    return payload["sub"]
-        return None
+        return token_cache.get_sub(self)
 
 
 class UTMClientSession(requests.Session):
@@ -129,6 +317,7 @@ class UTMClientSession(requests.Session):
     _closure_timer: threading.Timer | None = None
     _closure_lock: threading.Lock
     _last_used: float | None = None
+    _requests_in_progress: int = 0
 
     def __init__(
         self,
@@ -174,6 +363,7 @@ class UTMClientSession(requests.Session):
         with self._closure_lock:
             if (
                 self._last_used
+                and not self._requests_in_progress
                 and time.monotonic() - self._last_used > SOCKET_KEEP_ALIVE_LIMIT
             ):
                 logger.debug(
@@ -243,10 +433,15 @@ class UTMClientSession(requests.Session):
         if "auth" not in kwargs:
             kwargs = self.adjust_request_kwargs(kwargs)
 
+        # Only hold the closure lock while bookkeeping so that multiple threads may use this session concurrently
         with self._closure_lock:
-            result = super().request(method, url, *args, **kwargs)
-            self._last_used = time.monotonic()
-            return result
+            self._requests_in_progress += 1
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            with self._closure_lock:
+                self._requests_in_progress -= 1
+                self._last_used = time.monotonic()
 
     def get_prefix_url(self):
         return self._prefix_url
@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import jwt
+
+from monitoring.monitorlib import infrastructure
+from monitoring.monitorlib.infrastructure import AuthAdapter, TokenCache
+
+SCOPES = ["utm.strategic_coordination"]
+SIGNING_KEY = "infrastructure_test signing key of sufficient length"
+
+
+class _CountingAuth(AuthAdapter):
+    def __init__(self, lifetime_s: float = 3600, issuance_delay_s: float = 0):
+        super().__init__()
+        self.lifetime_s = lifetime_s
+        self.issuance_delay_s = issuance_delay_s
+        self.issued = 0
+        self._lock = threading.Lock()
+
+    def issue_token(self, intended_audience: str, scopes: list[str]) -> str:
+        time.sleep(self.issuance_delay_s)
+        with self._lock:
+            self.issued += 1
+            n = self.issued
+        return jwt.encode(
+            {
+                "sub": "counting_sub",
+                "aud": intended_audience,
+                "scope": " ".join(scopes),
+                "exp": int(time.time() + self.lifetime_s),
+                "jti": str(n),
+            },
+            SIGNING_KEY,
+            algorithm="HS256",
+        )
+
+
+def _use_new_cache(monkeypatch) -> TokenCache:
+    cache = TokenCache()
+    monkeypatch.setattr(infrastructure, "token_cache", cache)
+    return cache
+
+
+def test_concurrent_requests_issue_one_token(monkeypatch):
+    cache = _use_new_cache(monkeypatch)
+    adapter = _CountingAuth(issuance_delay_s=0.1)
+
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        headers = list(
+            executor.map(
+                lambda _: adapter.get_headers("https://uss1.example.com/foo", SCOPES),
+                range(20),
+            )
+        )
+
+    assert adapter.issued == 1
+    assert len({h.headers["Authorization"] for h in headers}) == 1
+    assert sum(1 for h in headers if h.token_issuance_seconds is not None) == 1
+    metrics = cache.metrics
+    assert metrics.misses == 1
+    assert metrics.hits == 19
+    assert metrics.issuances == 1
+    assert metrics.max_issuance_seconds >= 0.1
+
+    adapter.get_headers("https://uss2.example.com/foo", SCOPES)
+    adapter.get_headers("https://uss1.example.com/bar", ["utm.constraint_management"])
+    other_adapter = _CountingAuth()
+    other_adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+    assert adapter.issued == 3
+    assert other_adapter.issued == 1
+    assert adapter.get_sub() == "counting_sub"
+
+
+def test_tokens_near_expiry_are_reissued(monkeypatch):
+    cache = _use_new_cache(monkeypatch)
+    adapter = _CountingAuth(
+        lifetime_s=infrastructure.TOKEN_REFRESH_MARGIN.total_seconds() - 1
+    )
+
+    adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+    adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+
+    assert adapter.issued == 2
+    assert cache.metrics.misses == 2
+    assert cache.metrics.hits == 0
+
+
+def test_used_tokens_are_refreshed_in_background(monkeypatch):
+    cache = _use_new_cache(monkeypatch)
+    monkeypatch.setattr(
+        infrastructure,
+        "TOKEN_BACKGROUND_REFRESH_MARGIN",
+        infrastructure.TOKEN_REFRESH_MARGIN,
+    )
+    lifetime_s = infrastructure.TOKEN_REFRESH_MARGIN.total_seconds() + 1.5
+    used_adapter = _CountingAuth(lifetime_s=lifetime_s)
+    unused_adapter = _CountingAuth(lifetime_s=lifetime_s)
+
+    first = used_adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+    unused_adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+    used_adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+
+    deadline = time.monotonic() + 5
+    while cache.metrics.background_refreshes < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert used_adapter.issued == 2
+    # Tokens are only refreshed in the background after they have been retrieved from the cache
+    assert unused_adapter.issued == 1
+    assert cache.metrics.background_refreshes == 1
+
+    refreshed = used_adapter.get_headers("https://uss1.example.com/foo", SCOPES)
+    assert refreshed.token_issuance_seconds is None
+    assert refreshed.headers != first.headers
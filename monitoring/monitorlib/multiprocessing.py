@@ -1,12 +1,66 @@
 import json
 import multiprocessing
 import multiprocessing.shared_memory
-from collections.abc import Callable
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterator, MutableMapping
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
 from multiprocessing.synchronize import RLock as RLockT
 from typing import Generic, TypeVar
 
+from loguru import logger
+
 TValue = TypeVar("TValue")
 
+SEQUENCE_BYTES = 8
+"""Number of bytes dedicated to a sequence number guarding a region of shared memory (see `_optimistic_read`)."""
+
+MAX_OPTIMISTIC_READS = 100
+"""Number of lock-free read attempts a reader makes before falling back to acquiring the writers' lock."""
+
+
+def _read_sequence(buf: memoryview, offset: int) -> int:
+    return int.from_bytes(buf[offset : offset + SEQUENCE_BYTES], "big")
+
+
+def _write_sequence(buf: memoryview, offset: int, sequence: int) -> None:
+    buf[offset : offset + SEQUENCE_BYTES] = sequence.to_bytes(SEQUENCE_BYTES, "big")
+
+
+def _optimistic_read[TResult](
+    buf: memoryview,
+    sequence_offset: int,
+    lock: RLockT,
+    read: Callable[[], TResult],
+) -> TResult:
+    """Perform `read` without acquiring `lock`, retrying if the read overlapped a write.
+
+    Writers always hold `lock`, make the sequence number at `sequence_offset` odd before modifying the memory it
+    guards, and make it even again once they are done (i.e., a seqlock).  A read is therefore consistent if the
+    sequence number was even before the read and unchanged after it.  Readers never block writers or each other, and
+    only acquire `lock` (blocking writers) if a consistent read was not obtained in MAX_OPTIMISTIC_READS attempts.
+
+    `read` must not have side effects since its result may be discarded.
+    """
+    for _ in range(MAX_OPTIMISTIC_READS):
+        before = _read_sequence(buf, sequence_offset)
+        if before % 2 == 0:
+            try:
+                result = read()
+            except Exception:
+                if _read_sequence(buf, sequence_offset) == before:
+                    raise
+                continue  # Exception was likely caused by reading partially-written content
+            if _read_sequence(buf, sequence_offset) == before:
+                return result
+        time.sleep(0)  # Let the writer make progress
+    with lock:
+        return read()
+
 
 # Note: attempts to change the below to SynchronizedValue[TValue] causes problems because IntelliJ does not reliably
 # understand the newer syntax and therefore fails to provide contextual information for specific TValues.
@@ -91,10 +145,16 @@ class SynchronizedValue(Generic[TValue]):  # noqa: UP046 (same reason as above)
         tx.value['foo'] = 'baz'
     print(json.dumps(db.value))
         >  {"foo":"baz"}
+
+    Only one transaction may be in progress at a time, but reading the value
+    (via .value or .snapshot) does not block, and is not blocked by, other
+    readers or transactions.
     """
 
     SIZE_BYTES = 4
-    """Number of bytes at the beginning of the memory buffer dedicated to defining the size of the content."""
+    """Number of bytes following the sequence number at the beginning of the memory buffer dedicated to defining the size of the content."""
+
+    _CONTENT_OFFSET = SEQUENCE_BYTES + SIZE_BYTES
 
     _lock: RLockT
     _shared_memory: multiprocessing.shared_memory.SharedMemory
@@ -102,6 +162,9 @@ class SynchronizedValue(Generic[TValue]):  # noqa: UP046 (same reason as above)
     _decoder: Callable[[bytes], TValue]
     _transaction: Transaction | None
 
+    _snapshot: tuple[int, TValue] | None
+    """Sequence number and decoded value of the most recent snapshot taken in this process"""
+
     def __init__(
         self,
         initial_value: TValue,
@@ -118,7 +181,7 @@ class SynchronizedValue(Generic[TValue]):  # noqa: UP046 (same reason as above)
         """
         self._lock = multiprocessing.RLock()
         self._shared_memory = multiprocessing.shared_memory.SharedMemory(
-            create=True, size=int(capacity_bytes + self.SIZE_BYTES)
+            create=True, size=int(capacity_bytes + self._CONTENT_OFFSET)
         )
         self._encoder = (
             encoder
@@ -129,47 +192,929 @@ class SynchronizedValue(Generic[TValue]):  # noqa: UP046 (same reason as above)
             decoder if decoder is not None else lambda b: json.loads(b.decode("utf-8"))
         )
         self._transaction = None
+        self._snapshot = None
         self._set_value(initial_value)
 
-    def _get_value(self) -> TValue:
+    @property
+    def _buf(self) -> memoryview:
         if self._shared_memory.buf is None:
             raise RuntimeError(
-                "SynchronizedValue attempted to get value when shared memory buffer was None"
+                "SynchronizedValue attempted to access shared memory when shared memory buffer was None"
             )
+        return self._shared_memory.buf
+
+    def _read_content(self) -> bytes:
+        buf = self._buf
         content_len = int.from_bytes(
-            bytes(self._shared_memory.buf[0 : self.SIZE_BYTES]), "big"
+            bytes(buf[SEQUENCE_BYTES : self._CONTENT_OFFSET]), "big"
         )
-        if content_len + self.SIZE_BYTES > self._shared_memory.size:
+        if content_len + self._CONTENT_OFFSET > self._shared_memory.size:
             raise RuntimeError(
-                f"Shared memory claims to have {content_len} bytes of content when buffer size only allows {self._shared_memory.size - self.SIZE_BYTES}"
+                f"Shared memory claims to have {content_len} bytes of content when buffer size only allows {self._shared_memory.size - self._CONTENT_OFFSET}"
             )
-        content = bytes(
-            self._shared_memory.buf[self.SIZE_BYTES : content_len + self.SIZE_BYTES]
-        )
-        return self._decoder(content)
+        return bytes(buf[self._CONTENT_OFFSET : content_len + self._CONTENT_OFFSET])
+
+    def _get_value(self) -> TValue:
+        return self._decoder(self._read_content())
 
     def _set_value(self, value: TValue):
+        buf = self._buf
+        content = self._encoder(value)
+        content_len = len(content)
+        if content_len + self._CONTENT_OFFSET > self._shared_memory.size:
+            raise RuntimeError(
+                f"Tried to write {content_len} bytes into a SynchronizedValue with only {self._shared_memory.size - self._CONTENT_OFFSET} bytes of capacity"
+            )
+        sequence = _read_sequence(buf, 0)
+        _write_sequence(buf, 0, sequence + 1)
+        try:
+            buf[SEQUENCE_BYTES : self._CONTENT_OFFSET] = content_len.to_bytes(
+                self.SIZE_BYTES, "big"
+            )
+            buf[self._CONTENT_OFFSET : content_len + self._CONTENT_OFFSET] = content
+        finally:
+            _write_sequence(buf, 0, sequence + 2)
+
+    @property
+    def generation(self) -> int:
+        """Number that increases every time a new value is committed; may be used to detect changes without reading the value."""
+        return _read_sequence(self._buf, 0) // 2
+
+    @property
+    def value(self) -> TValue:
+        """Newly-decoded copy of the current value.  Changes made to it are not saved; use `transact` to make changes."""
+        return self._decoder(
+            _optimistic_read(self._buf, 0, self._lock, self._read_content)
+        )
+
+    @property
+    def snapshot(self) -> TValue:
+        """Current value, shared with other readers in this process.  MUST NOT be mutated.
+
+        The value is only decoded when it has changed since the last snapshot taken in this process, so this is the
+        preferred way for read-only operations to access the value.
+        """
+        buf = self._buf
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == _read_sequence(buf, 0):
+            return snapshot[1]
+        sequence, content = _optimistic_read(
+            buf, 0, self._lock, lambda: (_read_sequence(buf, 0), self._read_content())
+        )
+        value = self._decoder(content)
+        self._snapshot = (sequence, value)
+        return value
+
+    def transact(self) -> Transaction[TValue]:
+        return Transaction[TValue](self._lock, self._get_value, self._set_value)
+
+
+class _MapTransactionView(MutableMapping[str, TValue]):
+    """Mapping exposed by a MapTransaction; decodes entries only as they are accessed."""
+
+    _map: "SynchronizedMap[TValue]"
+    _loaded: dict[str, TValue]
+    """Entries accessed or assigned during this transaction"""
+
+    _original: dict[str, bytes]
+    """Encoded content of entries, as they were when read from shared memory during this transaction"""
+
+    _original_index_keys: dict[str, dict[str, str | None]]
+    """Index keys of entries, as they were when read from shared memory during this transaction"""
+
+    _deleted: set[str]
+    """Keys of entries removed during this transaction"""
+
+    def __init__(self, synchronized_map: "SynchronizedMap[TValue]"):
+        self._map = synchronized_map
+        self._loaded = {}
+        self._original = {}
+        self._original_index_keys = {}
+        self._deleted = set()
+
+    def __getitem__(self, key: str) -> TValue:
+        if key in self._deleted:
+            raise KeyError(key)
+        if key not in self._loaded:
+            slot = self._map._slots.get(key)
+            if slot is None:
+                raise KeyError(key)
+            content = self._map._read_content(slot)
+            value = self._map._decoder(content)
+            self._original[key] = content
+            self._original_index_keys[key] = self._map._index_keys(value)
+            self._loaded[key] = value
+        return self._loaded[key]
+
+    def __setitem__(self, key: str, value: TValue) -> None:
+        self._loaded[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._loaded.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key) -> bool:
+        if key in self._deleted:
+            return False
+        return key in self._loaded or key in self._map._slots
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._map._slots:
+            if key not in self._deleted:
+                yield key
+        for key in self._loaded:
+            if key not in self._map._slots:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def _commit(self) -> None:
+        # Encode and validate everything before writing anything so a failed commit leaves shared memory unchanged
+        to_write: dict[str, bytes] = {}
+        for key, value in self._loaded.items():
+            content = self._map._encoder(value)
+            if self._original.get(key) == content:
+                continue  # Entry was read but not changed
+            self._map._check_entry(key, content)
+            to_write[key] = content
+        to_delete = [key for key in self._deleted if key in self._map._slots]
+        new_keys = sum(1 for key in to_write if key not in self._map._slots)
+        available = len(self._map._free_slots) + len(to_delete)
+        if new_keys > available:
+            raise RuntimeError(
+                f"Tried to add {new_keys} entries to a SynchronizedMap with only {available} free slots out of {self._map.max_entries}"
+            )
+        if to_write or to_delete:
+            self._map._commit(
+                to_write, to_delete, self._index_changes(to_write, to_delete)
+            )
+
+    def _index_changes(
+        self, to_write: dict[str, bytes], to_delete: list[str]
+    ) -> dict[str, tuple[dict[str, bytes], list[str]]]:
+        """Determine the entries to write and remove in each index map to reflect the specified changes."""
+        if not self._map._indexes:
+            return {}
+        old_index_keys: dict[str, dict[str, str | None]] = {}
+        new_index_keys: dict[str, dict[str, str | None]] = {}
+        for key in list(to_write) + to_delete:
+            if key in self._original_index_keys:
+                old_index_keys[key] = self._original_index_keys[key]
+            elif key in self._map._slots:
+                # Entry was replaced or removed without being read in this transaction
+                old_index_keys[key] = self._map._index_keys(
+                    self._map._decoder(self._map._read_content(self._map._slots[key]))
+                )
+            if key in to_write:
+                new_index_keys[key] = self._map._index_keys(self._loaded[key])
+
+        changes = {}
+        for index, (_, index_map) in self._map._indexes.items():
+            index_map._refresh_directory()
+            writes: dict[str, bytes] = {}
+            for key, index_keys in new_index_keys.items():
+                index_key = index_keys[index]
+                if index_key is None:
+                    continue
+                if old_index_keys.get(key, {}).get(index) == index_key:
+                    continue  # Index is already correct for this entry
+                content = index_map._encoder(key)
+                index_map._check_entry(index_key, content)
+                writes[index_key] = content
+            deletes = []
+            for key, index_keys in old_index_keys.items():
+                index_key = index_keys[index]
+                if index_key is None or index_key in writes:
+                    continue
+                if new_index_keys.get(key, {}).get(index) == index_key:
+                    continue  # Entry still has the same index key
+                slot = index_map._slots.get(index_key)
+                if slot is not None and index_map._read_content(
+                    slot
+                ) == index_map._encoder(key):
+                    deletes.append(index_key)
+            new_index_entries = sum(1 for k in writes if k not in index_map._slots)
+            if new_index_entries > len(index_map._free_slots) + len(deletes):
+                raise RuntimeError(
+                    f"Index '{index}' of SynchronizedMap does not have capacity for {new_index_entries} additional entries"
+                )
+            if writes or deletes:
+                changes[index] = (writes, deletes)
+        return changes
+
+
+class MapTransaction(Generic[TValue]):  # noqa: UP046 (same reason as above)
+    _map: "SynchronizedMap[TValue]"
+    _view: _MapTransactionView[TValue]
+    """This field is only valid when _locked is True"""
+
+    _locked: bool
+    """True when the map's lock is held and _view is valid"""
+
+    def __init__(self, synchronized_map: "SynchronizedMap[TValue]"):
+        self._map = synchronized_map
+        self._locked = False
+
+    def __enter__(self):
+        if self._locked:
+            raise RuntimeError(
+                "SynchronizedMap Transaction started when Transaction was already in progress"
+            )
+        self._map._lock.__enter__()
+        try:
+            self._map._refresh_directory()
+        except BaseException:
+            self._map._lock.release()
+            raise
+        self._view = _MapTransactionView[TValue](self._map)
+        self._locked = True
+        return self
+
+    @property
+    def value(self) -> MutableMapping[str, TValue]:
+        """Entries exposed for this transaction.  Mutate entries, or add, replace, or remove entries, to make changes during the transaction."""
+        if not self._locked:
+            raise RuntimeError(
+                "Transaction value accessed when transaction was not active (e.g., outside a `with` block)"
+            )
+        return self._view
+
+    def abort(self):
+        """Do not save any changes made to entries during this transaction and release the lock on the synchronized map."""
+        self._unlock()
+
+    def _unlock(self, exc_type=None, exc_val=None, exc_tb=None):
+        self._map._lock.__exit__(exc_type, exc_val, exc_tb)
+        self._locked = False
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self._locked:
+            return
+        try:
+            if exc_type is None:
+                self._view._commit()
+        finally:
+            self._unlock()
+
+
+class SynchronizedMap(Generic[TValue]):  # noqa: UP046 (same reason as above)
+    """Represents a collection of values, keyed by string, synchronized across multiple processes.
+
+    Unlike SynchronizedValue, each entry is stored in its own fixed-size slot of shared memory along with a version
+    that changes every time the entry is written.  Reading an entry decodes only that entry, and only if its version
+    has changed since it was last decoded in this process.  A transaction decodes only the entries it accesses and
+    rewrites only the entries it changed.  Example:
+
+    db = SynchronizedMap[dict]()
+    with db.transact() as tx:
+        tx.value['foo'] = {'bar': 'baz'}
+    print(json.dumps(db.get('foo')))
+        >  {"bar":"baz"}
+
+    Only one transaction may be in progress at a time, but reads outside a transaction do not block, and are not
+    blocked by, other readers or transactions.  Each entry read is consistent, but reading multiple entries (e.g., via
+    `items`) is not atomic with respect to transactions.  Values obtained outside a transaction are shared by all
+    readers in the process and must not be mutated; use a transaction to make changes.
+    """
+
+    MAX_KEY_BYTES = 128
+    """Maximum number of bytes in the UTF-8 encoding of an entry's key."""
+
+    _HEADER_FIELDS = struct.Struct(">QQ")
+    """Directory generation (changes whenever the set of keys changes), last version assigned.  Follows the map's sequence number."""
+
+    _SLOT_FIELDS = struct.Struct(f">QHI{MAX_KEY_BYTES}s")
+    """Entry version (0 when slot is empty), key length, content length, key.  Follows the slot's sequence number."""
+
+    _HEADER_BYTES = SEQUENCE_BYTES + _HEADER_FIELDS.size
+    _SLOT_HEADER_BYTES = SEQUENCE_BYTES + _SLOT_FIELDS.size
+
+    max_entries: int
+    entry_capacity_bytes: int
+
+    _lock: RLockT
+    _shared_memory: multiprocessing.shared_memory.SharedMemory
+    _encoder: Callable[[TValue], bytes]
+    _decoder: Callable[[bytes], TValue]
+    _data_offset: int
+
+    _directory_generation: int
+    """Directory generation in shared memory when _slots was last updated in this process"""
+
+    _slots: dict[str, int]
+    """Slot index of each entry's key.  Replaced rather than mutated so lock-free readers can iterate it."""
+
+    _free_slots: list[int]
+    """Indices of slots not currently holding an entry"""
+
+    _cache: dict[str, tuple[int, TValue]]
+    """Version and decoded value of entries read in this process, by key"""
+
+    _indexes: dict[str, tuple[Callable[[TValue], str | None], "SynchronizedMap[str]"]]
+    """Function computing an entry's index key, and map from index key to entry key, by index name"""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        entry_capacity_bytes: int = 100000,
+        encoder: Callable[[TValue], bytes] | None = None,
+        decoder: Callable[[bytes], TValue] | None = None,
+        indexes: dict[str, Callable[[TValue], str | None]] | None = None,
+    ):
+        """Creates an empty collection of values synchronized across multiple processes.
+
+        :param max_entries: Maximum number of entries the collection may hold at once
+        :param entry_capacity_bytes: Maximum number of bytes required to represent any one entry's value
+        :param encoder: Function that converts an entry's value into bytes
+        :param decoder: Function that converts bytes into an entry's value
+        :param indexes: Secondary indexes to maintain, by name.  Each function computes the key (unique among entries,
+            or None when not indexed) under which an entry's value can be found with `lookup`.
+        """
+        self.max_entries = max_entries
+        self.entry_capacity_bytes = entry_capacity_bytes
+        self._lock = multiprocessing.RLock()
+        self._data_offset = self._HEADER_BYTES + max_entries * self._SLOT_HEADER_BYTES
+        # Note that shared memory is allocated lazily by the OS, so unused entry capacity does not consume memory
+        self._shared_memory = multiprocessing.shared_memory.SharedMemory(
+            create=True,
+            size=int(self._data_offset + max_entries * entry_capacity_bytes),
+        )
+        self._encoder = (
+            encoder
+            if encoder is not None
+            else lambda obj: json.dumps(obj).encode("utf-8")
+        )
+        self._decoder = (
+            decoder if decoder is not None else lambda b: json.loads(b.decode("utf-8"))
+        )
+        self._directory_generation = 0
+        self._slots = {}
+        self._free_slots = list(range(max_entries))
+        self._cache = {}
+        self._indexes = {}
+        for index, index_key in (indexes or {}).items():
+            index_map = SynchronizedMap[str](
+                max_entries=max_entries,
+                entry_capacity_bytes=self.MAX_KEY_BYTES,
+                encoder=lambda k: k.encode("utf-8"),
+                decoder=lambda b: b.decode("utf-8"),
+            )
+            index_map._lock = (
+                self._lock
+            )  # Index maps are only changed within this map's transactions
+            self._indexes[index] = (index_key, index_map)
+
+    @property
+    def _buf(self) -> memoryview:
         if self._shared_memory.buf is None:
             raise RuntimeError(
-                "SynchronizedValue attempted to set value when shared memory buffer was None"
+                "SynchronizedMap attempted to access shared memory when shared memory buffer was None"
             )
-        content = self._encoder(value)
-        content_len = len(content)
-        if content_len + self.SIZE_BYTES > self._shared_memory.size:
+        return self._shared_memory.buf
+
+    def _read_header(self) -> tuple[int, int]:
+        return self._HEADER_FIELDS.unpack_from(self._buf, SEQUENCE_BYTES)
+
+    def _slot_offset(self, slot: int) -> int:
+        return self._HEADER_BYTES + slot * self._SLOT_HEADER_BYTES
+
+    def _read_slot(self, slot: int) -> tuple[int, int, int, bytes]:
+        return self._SLOT_FIELDS.unpack_from(
+            self._buf, self._slot_offset(slot) + SEQUENCE_BYTES
+        )
+
+    def _read_slot_version(self, slot: int) -> int:
+        return self._read_slot(slot)[0]
+
+    def _refresh_directory(self) -> None:
+        """Update this process's map of keys to slots if the set of keys has changed."""
+        buf = self._buf
+        generation, _ = _optimistic_read(buf, 0, self._lock, self._read_header)
+        if generation == self._directory_generation:
+            return
+
+        def scan() -> tuple[int, dict[str, int], list[int]]:
+            generation, _ = self._read_header()
+            slots = {}
+            free_slots = []
+            for slot in range(self.max_entries):
+                version, key_len, _, key = self._read_slot(slot)
+                if version:
+                    slots[key[0:key_len].decode("utf-8")] = slot
+                else:
+                    free_slots.append(slot)
+            return generation, slots, free_slots
+
+        generation, slots, free_slots = _optimistic_read(buf, 0, self._lock, scan)
+        self._slots = slots
+        self._free_slots = free_slots
+        self._directory_generation = generation
+        for key in [k for k in self._cache if k not in slots]:
+            self._cache.pop(key, None)
+
+    def _read_content(self, slot: int) -> bytes:
+        _, _, content_len, _ = self._read_slot(slot)
+        if content_len > self.entry_capacity_bytes:
+            raise RuntimeError(
+                f"SynchronizedMap slot {slot} claims to have {content_len} bytes of content when entry capacity only allows {self.entry_capacity_bytes}"
+            )
+        offset = self._data_offset + slot * self.entry_capacity_bytes
+        return bytes(self._buf[offset : offset + content_len])
+
+    def _check_entry(self, key: str, content: bytes) -> None:
+        if len(key.encode("utf-8")) > self.MAX_KEY_BYTES:
+            raise ValueError(
+                f"SynchronizedMap key '{key}' is longer than {self.MAX_KEY_BYTES} bytes"
+            )
+        if len(content) > self.entry_capacity_bytes:
             raise RuntimeError(
-                f"Tried to write {content_len} bytes into a SynchronizedValue with only {self._shared_memory.size - self.SIZE_BYTES} bytes of capacity"
+                f"Tried to write {len(content)} bytes into a SynchronizedMap entry with only {self.entry_capacity_bytes} bytes of capacity"
+            )
+
+    def _index_keys(self, value: TValue) -> dict[str, str | None]:
+        return {
+            index: index_key(value) for index, (index_key, _) in self._indexes.items()
+        }
+
+    def _commit(
+        self,
+        to_write: dict[str, bytes],
+        to_delete: list[str],
+        index_changes: dict[str, tuple[dict[str, bytes], list[str]]],
+    ) -> None:
+        """Write validated changes into shared memory.  Lock must be held and directory must be fresh."""
+        buf = self._buf
+        sequence = _read_sequence(buf, 0)
+        generation, version = self._read_header()
+        slots = dict(self._slots)
+        free_slots = list(self._free_slots)
+        _write_sequence(buf, 0, sequence + 1)
+        try:
+            for key in to_delete:
+                slot = slots.pop(key)
+                slot_offset = self._slot_offset(slot)
+                slot_sequence = _read_sequence(buf, slot_offset)
+                _write_sequence(buf, slot_offset, slot_sequence + 1)
+                self._SLOT_FIELDS.pack_into(
+                    buf, slot_offset + SEQUENCE_BYTES, 0, 0, 0, b""
+                )
+                _write_sequence(buf, slot_offset, slot_sequence + 2)
+                free_slots.append(slot)
+                generation += 1
+                version += 1
+
+            for key, content in to_write.items():
+                slot = slots.get(key)
+                if slot is None:
+                    slot = free_slots.pop(0)
+                    slots[key] = slot
+                    generation += 1
+                version += 1
+                slot_offset = self._slot_offset(slot)
+                slot_sequence = _read_sequence(buf, slot_offset)
+                _write_sequence(buf, slot_offset, slot_sequence + 1)
+                offset = self._data_offset + slot * self.entry_capacity_bytes
+                buf[offset : offset + len(content)] = content
+                key_bytes = key.encode("utf-8")
+                self._SLOT_FIELDS.pack_into(
+                    buf,
+                    slot_offset + SEQUENCE_BYTES,
+                    version,
+                    len(key_bytes),
+                    len(content),
+                    key_bytes,
+                )
+                _write_sequence(buf, slot_offset, slot_sequence + 2)
+
+            self._HEADER_FIELDS.pack_into(buf, SEQUENCE_BYTES, generation, version)
+
+            for index, (index_writes, index_deletes) in index_changes.items():
+                self._indexes[index][1]._commit(index_writes, index_deletes, {})
+        finally:
+            _write_sequence(buf, 0, sequence + 2)
+        self._slots = slots
+        self._free_slots = free_slots
+        self._directory_generation = generation
+
+    def _read_entry(
+        self, slot: int, key_bytes: bytes, cached_version: int | None
+    ) -> tuple[int, bytes | None] | None:
+        """Read the version of the entry in the specified slot, and its content if the version is not cached_version.
+
+        Returns None if the slot no longer holds the entry for key_bytes.
+        """
+        version, key_len, _, slot_key = self._read_slot(slot)
+        if not version or slot_key[0:key_len] != key_bytes:
+            return None
+        if version == cached_version:
+            return version, None
+        return version, self._read_content(slot)
+
+    def _get(self, key: str) -> TValue:
+        """Get the current value of the entry for the specified key, raising KeyError if there is no such entry."""
+        buf = self._buf
+        key_bytes = key.encode("utf-8")
+        for _ in range(2):
+            slot = self._slots.get(key)
+            if slot is None:
+                raise KeyError(key)
+            cached = self._cache.get(key)
+            cached_version = cached[0] if cached is not None else None
+            result = _optimistic_read(
+                buf,
+                self._slot_offset(slot),
+                self._lock,
+                partial(self._read_entry, slot, key_bytes, cached_version),
             )
-        self._shared_memory.buf[0 : self.SIZE_BYTES] = content_len.to_bytes(
-            self.SIZE_BYTES, "big"
+            if result is None:
+                # Entry was moved or removed since the directory was refreshed
+                self._directory_generation = -1
+                self._refresh_directory()
+                continue
+            version, content = result
+            if content is None and cached is not None:
+                return cached[1]
+            assert content is not None
+            value = self._decoder(content)
+            self._cache[key] = (version, value)
+            return value
+        raise KeyError(key)
+
+    @property
+    def generation(self) -> int:
+        """Number that increases every time an entry is written or removed; may be used to detect changes without reading entries."""
+        return _optimistic_read(self._buf, 0, self._lock, self._read_header)[1]
+
+    def versions(self) -> dict[str, int]:
+        """Current version of every entry, read without decoding any entries.
+
+        An entry's version changes every time it is written, so this may be used to determine which entries need to be
+        re-read to keep a derived structure up to date.
+        """
+
+        def scan() -> dict[str, int]:
+            result = {}
+            for slot in range(self.max_entries):
+                version, key_len, _, key = self._read_slot(slot)
+                if version:
+                    result[key[0:key_len].decode("utf-8")] = version
+            return result
+
+        return _optimistic_read(self._buf, 0, self._lock, scan)
+
+    def __contains__(self, key: str) -> bool:
+        self._refresh_directory()
+        return key in self._slots
+
+    def __len__(self) -> int:
+        self._refresh_directory()
+        return len(self._slots)
+
+    def keys(self) -> list[str]:
+        self._refresh_directory()
+        return list(self._slots)
+
+    def get(self, key: str, default: TValue | None = None) -> TValue | None:
+        self._refresh_directory()
+        try:
+            return self._get(key)
+        except KeyError:
+            return default
+
+    def items(self) -> list[tuple[str, TValue]]:
+        self._refresh_directory()
+        result = []
+        for key in list(self._slots):
+            try:
+                result.append((key, self._get(key)))
+            except KeyError:
+                pass  # Entry was removed while reading other entries
+        return result
+
+    def values(self) -> list[TValue]:
+        return [v for _, v in self.items()]
+
+    def lookup(self, index: str, index_key: str) -> tuple[str, TValue] | None:
+        """Find the entry with the specified key in the specified secondary index.
+
+        :param index: Name of index (as provided to the constructor) in which to look up index_key
+        :param index_key: Key of the desired entry in the index
+        :return: Key and value of the entry found, or None if no entry has the specified index key
+        """
+        index_key_of, index_map = self._indexes[index]
+
+        def find() -> tuple[str, TValue] | None:
+            key = index_map.get(index_key)
+            if key is None:
+                return None
+            self._refresh_directory()
+            try:
+                return key, self._get(key)
+            except KeyError:
+                return None
+
+        # Index maps are updated within the same sequence-guarded commit as this map, so guarding the lookup with this
+        # map's sequence ensures the index and entries are consistent with each other
+        result = _optimistic_read(self._buf, 0, self._lock, find)
+        if result is None or index_key_of(result[1]) != index_key:
+            return None
+        return result
+
+    def transact(self) -> MapTransaction[TValue]:
+        return MapTransaction[TValue](self)
+
+
+class SynchronizedLocks:
+    """Exclusive locks identified by string keys, shared across multiple processes.  Example:
+
+    locks = SynchronizedLocks()
+    locks.acquire("flight1", timeout=timedelta(seconds=5), description="updating flight1")
+    try:
+        ...
+    finally:
+        locks.release("flight1")
+
+    Each key in use occupies a slot of a shared-memory table holding the first-in-first-out queue of lock requests for
+    that key; the request at the head of the queue holds the lock, so locks are granted in the order they are
+    requested.  Waiting for a lock reads only that slot.  Waiters in the process releasing a lock are woken
+    immediately; waiters in other processes observe the release within MAX_POLL_INTERVAL.  A request held by a process
+    that no longer exists is discarded by the next waiter to notice.
+
+    Waiting never blocks the thread in the way an OS-level semaphore would, so waits cooperate with green threads.
+    Locks are not reentrant; a lock may be released by any thread of the process that acquired it.
+    """
+
+    MAX_KEY_BYTES = 128
+    """Maximum number of bytes in the UTF-8 encoding of a lock's key."""
+
+    MAX_DESCRIPTION_BYTES = 128
+    """Number of bytes of the UTF-8 encoding of a lock holder's description retained for diagnostics."""
+
+    MAX_POLL_INTERVAL = 0.02
+    """Maximum number of seconds between checks of whether a lock has been released by another process."""
+
+    _HEADER_FIELDS = struct.Struct(f">H{MAX_KEY_BYTES}sHdH{MAX_DESCRIPTION_BYTES}s")
+    """Key length, key, number of queued requests, time lock was granted to current holder, description length, description."""
+
+    max_keys: int
+    max_waiters: int
+
+    _lock: RLockT
+    _shared_memory: multiprocessing.shared_memory.SharedMemory
+    _slot_fields: struct.Struct
+    """Header fields followed by the token of each queued request."""
+
+    _slots: dict[str, int]
+    """Slot index at which each key was last found, local to this process; must be verified before use."""
+
+    _held: dict[str, int]
+    """Token of the request holding each lock held by this process."""
+
+    _next_token: int
+    _pid: int | None
+    _released: threading.Condition | None
+
+    def __init__(self, max_keys: int = 1000, max_waiters: int = 32):
+        """Creates an empty table of locks synchronized across multiple processes.
+
+        :param max_keys: Maximum number of distinct keys which may be locked or waited for at once
+        :param max_waiters: Maximum number of requests (including the holder) which may be queued for any one key
+        """
+        self.max_keys = max_keys
+        self.max_waiters = max_waiters
+        self._lock = multiprocessing.RLock()
+        self._slot_fields = struct.Struct(
+            self._HEADER_FIELDS.format + "Q" * max_waiters
         )
-        self._shared_memory.buf[self.SIZE_BYTES : content_len + self.SIZE_BYTES] = (
-            content
+        self._shared_memory = multiprocessing.shared_memory.SharedMemory(
+            create=True, size=max_keys * self._slot_fields.size
         )
+        self._slots = {}
+        self._held = {}
+        self._next_token = 0
+        self._pid = None
+        self._released = None
 
     @property
-    def value(self) -> TValue:
+    def _buf(self) -> memoryview:
+        if self._shared_memory.buf is None:
+            raise RuntimeError(
+                "SynchronizedLocks attempted to access shared memory when shared memory buffer was None"
+            )
+        return self._shared_memory.buf
+
+    def _local_state(self) -> threading.Condition:
+        """Reset process-local state if this is the first use in this process (e.g., after a fork)."""
+        pid = os.getpid()
+        if self._pid != pid or self._released is None:
+            # Created on first use in each process so that it uses the threading implementation in effect there
+            self._released = threading.Condition()
+            self._held = {}
+            self._pid = pid
+        return self._released
+
+    def _read_slot(self, slot: int) -> tuple[str, list[int], float, str]:
+        """Key, queued request tokens, time granted, and holder description of the specified slot.  Lock must be held."""
+        fields = self._slot_fields.unpack_from(self._buf, slot * self._slot_fields.size)
+        key_len, key, n_queued, held_since, desc_len, desc = fields[0:6]
+        return (
+            key[0:key_len].decode("utf-8"),
+            list(fields[6 : 6 + n_queued]),
+            held_since,
+            desc[0:desc_len].decode("utf-8", errors="replace"),
+        )
+
+    def _write_slot(
+        self, slot: int, key: str, queue: list[int], held_since: float, description: str
+    ) -> None:
+        """Lock must be held."""
+        key_bytes = key.encode("utf-8") if queue else b""
+        desc_bytes = description.encode("utf-8")[0 : self.MAX_DESCRIPTION_BYTES]
+        self._slot_fields.pack_into(
+            self._buf,
+            slot * self._slot_fields.size,
+            len(key_bytes),
+            key_bytes,
+            len(queue),
+            held_since,
+            len(desc_bytes),
+            desc_bytes,
+            *(queue + [0] * (self.max_waiters - len(queue))),
+        )
+
+    def _find_slot(self, key: str, allocate: bool) -> int | None:
+        """Find the slot in use for the specified key, or a free slot if allocate is True.  Lock must be held."""
+        slot = self._slots.get(key)
+        if slot is not None and self._read_slot(slot)[0] == key:
+            return slot
+        free_slot = None
+        for slot in range(self.max_keys):
+            slot_key, queue, _, _ = self._read_slot(slot)
+            if queue and slot_key == key:
+                self._slots[key] = slot
+                return slot
+            if not queue and free_slot is None:
+                free_slot = slot
+        if not allocate:
+            return None
+        if free_slot is None:
+            raise RuntimeError(
+                f"Tried to lock '{key}' when all {self.max_keys} slots of SynchronizedLocks were in use"
+            )
+        self._slots[key] = free_slot
+        return free_slot
+
+    @staticmethod
+    def _pid_of(token: int) -> int:
+        return token >> 32
+
+    @staticmethod
+    def _process_exists(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _enqueue(self, key: str, description: str) -> int:
+        """Add a request for the specified lock to the end of its queue.  Lock must be held."""
+        if len(key.encode("utf-8")) > self.MAX_KEY_BYTES:
+            raise ValueError(
+                f"SynchronizedLocks key '{key}' is longer than {self.MAX_KEY_BYTES} bytes"
+            )
+        slot = self._find_slot(key, allocate=True)
+        assert slot is not None
+        _, queue, held_since, holder_description = self._read_slot(slot)
+        if len(queue) >= self.max_waiters:
+            raise RuntimeError(
+                f"Tried to lock '{key}' when {len(queue)} requests were already queued for that lock, which is the maximum"
+            )
+        self._next_token = (self._next_token + 1) % (1 << 32)
+        token = (os.getpid() << 32) | self._next_token
+        queue.append(token)
+        if len(queue) == 1:
+            held_since = time.time()
+            holder_description = description
+        self._write_slot(slot, key, queue, held_since, holder_description)
+        return token
+
+    def _check(self, key: str, token: int, description: str) -> bool:
+        """Determine whether the specified request holds the lock, discarding requests of defunct processes ahead of it.
+
+        Lock must be held."""
+        slot = self._find_slot(key, allocate=False)
+        if slot is None:
+            raise RuntimeError(f"Request for lock '{key}' was lost")
+        _, queue, held_since, holder_description = self._read_slot(slot)
+        if token not in queue:
+            raise RuntimeError(f"Request for lock '{key}' was lost")
+        defunct = [
+            t
+            for t in queue[0 : queue.index(token)]
+            if not self._process_exists(self._pid_of(t))
+        ]
+        if defunct:
+            if queue[0] in defunct:
+                logger.warning(
+                    f"Discarding lock '{key}' held by process {self._pid_of(queue[0])}, which no longer exists ({holder_description})"
+                )
+            head = queue[0]
+            queue = [t for t in queue if t not in defunct]
+            if queue[0] != head:
+                held_since = time.time()
+                holder_description = ""
+        if queue[0] == token and not holder_description:
+            holder_description = description
+        if defunct or queue[0] == token:
+            self._write_slot(slot, key, queue, held_since, holder_description)
+        return queue[0] == token
+
+    def _dequeue(self, key: str, token: int) -> None:
+        """Remove the specified request from its lock's queue.  Lock must be held."""
+        slot = self._find_slot(key, allocate=False)
+        if slot is None:
+            return
+        _, queue, held_since, holder_description = self._read_slot(slot)
+        if token not in queue:
+            return
+        if queue[0] == token:
+            # Lock passes to the next request in the queue
+            held_since = time.time()
+            holder_description = ""
+        queue.remove(token)
+        self._write_slot(slot, key, queue, held_since, holder_description)
+
+    def describe(self, key: str) -> str:
+        """Describe the current state of the specified lock, for diagnostics."""
         with self._lock:
-            return self._get_value()
+            slot = self._find_slot(key, allocate=False)
+            if slot is None:
+                return f"Lock '{key}' is not held"
+            _, queue, held_since, holder_description = self._read_slot(slot)
+        holder = self._pid_of(queue[0])
+        held_s = time.time() - held_since
+        waiters = ", ".join(str(self._pid_of(t)) for t in queue[1:]) or "none"
+        return f"Lock '{key}' has been held by process {holder} for {held_s:.1f}s ({holder_description or 'no description'}); waiting processes: {waiters}"
 
-    def transact(self) -> Transaction[TValue]:
-        return Transaction[TValue](self._lock, self._get_value, self._set_value)
+    def acquire(
+        self, key: str, timeout: float | timedelta, description: str = ""
+    ) -> None:
+        """Acquire the lock for the specified key, waiting for any earlier requests for it to be released first.
+
+        :param key: Identity of the lock to acquire
+        :param timeout: Maximum time to wait (seconds if float); RuntimeError is raised if the lock is not acquired
+        :param description: Description of the holder's activity, reported to anyone waiting too long for this lock
+        """
+        released = self._local_state()
+        if isinstance(timeout, timedelta):
+            timeout = timeout.total_seconds()
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            token = self._enqueue(key, description)
+        poll_interval = 0.001
+        while True:
+            with self._lock:
+                if self._check(key, token, description):
+                    self._held[key] = token
+                    return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                diagnostics = self.describe(key)
+                with self._lock:
+                    self._dequeue(key, token)
+                raise RuntimeError(
+                    f"Deadlock while waiting {timeout:.1f}s to acquire lock ({description or 'no description'}): {diagnostics}"
+                )
+            with released:
+                released.wait(min(poll_interval, remaining))
+            poll_interval = min(poll_interval * 2, self.MAX_POLL_INTERVAL)
+
+    def release(self, key: str) -> None:
+        """Release the lock for the specified key, which must be held by this process."""
+        released = self._local_state()
+        token = self._held.pop(key, None)
+        if token is None:
+            raise RuntimeError(
+                f"Tried to release lock '{key}' which is not held by this process"
+            )
+        with self._lock:
+            self._dequeue(key, token)
+        with released:
+            released.notify_all()
+
+    @contextmanager
+    def hold(
+        self, key: str, timeout: float | timedelta, description: str = ""
+    ) -> Iterator[None]:
+        """Context manager which holds the lock for the specified key (see `acquire`)."""
+        self.acquire(key, timeout, description)
+        try:
+            yield
+        finally:
+            self.release(key)
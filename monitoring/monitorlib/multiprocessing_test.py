@@ -0,0 +1,267 @@
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+from monitoring.monitorlib.multiprocessing import (
+    SynchronizedLocks,
+    SynchronizedMap,
+    SynchronizedValue,
+)
+
+
+def _set_entry(db: SynchronizedMap[dict], key: str, value: dict):
+    with db.transact() as tx:
+        tx.value[key] = value
+
+
+def _write_values(db: SynchronizedValue[dict], n: int):
+    for i in range(n):
+        with db.transact() as tx:
+            tx.value["a"] = i
+            tx.value["b"] = -i
+
+
+def _write_entries(db: SynchronizedMap[dict], n: int):
+    for i in range(n):
+        _set_entry(db, "foo", {"a": i, "b": -i, "padding": "x" * (i % 50)})
+
+
+def _hold_lock(locks: SynchronizedLocks, key: str, seconds: float, release: bool):
+    locks.acquire(key, timeout=5, description="held by child")
+    time.sleep(seconds)
+    if release:
+        locks.release(key)
+    else:
+        os._exit(0)
+
+
+def test_value_snapshot():
+    db = SynchronizedValue[dict]({"a": 0})
+    generation = db.generation
+    snapshot = db.snapshot
+    assert snapshot == {"a": 0}
+    assert db.snapshot is snapshot
+    assert db.value is not snapshot
+
+    with db.transact() as tx:
+        tx.value["a"] = 1
+    assert db.generation > generation
+    assert db.snapshot == {"a": 1}
+
+    with db.transact() as tx:
+        tx.abort()
+    assert db.snapshot == {"a": 1}
+
+
+def test_value_reads_consistent_during_writes():
+    db = SynchronizedValue[dict]({"a": 0, "b": 0})
+    p = multiprocessing.get_context("fork").Process(
+        target=_write_values, args=(db, 2000)
+    )
+    p.start()
+    deadline = time.monotonic() + 30
+    while db.snapshot["a"] < 1999 and time.monotonic() < deadline:
+        value = db.value
+        assert value["a"] == -value["b"]
+        snapshot = db.snapshot
+        assert snapshot["a"] == -snapshot["b"]
+    p.join()
+    assert p.exitcode == 0
+    assert db.snapshot == {"a": 1999, "b": -1999}
+
+
+def test_map_reads_consistent_during_writes():
+    db = SynchronizedMap[dict](max_entries=4, entry_capacity_bytes=200)
+    _set_entry(db, "foo", {"a": 0, "b": 0})
+    p = multiprocessing.get_context("fork").Process(
+        target=_write_entries, args=(db, 2000)
+    )
+    p.start()
+    deadline = time.monotonic() + 30
+    value = {"a": 0}
+    while value["a"] < 1999 and time.monotonic() < deadline:
+        value = db.get("foo")
+        assert value is not None
+        assert value["a"] == -value["b"]
+    p.join()
+    assert p.exitcode == 0
+    assert db.get("foo") == {"a": 1999, "b": -1999, "padding": "x" * 49}
+
+
+def test_map_transaction():
+    db = SynchronizedMap[dict](max_entries=4, entry_capacity_bytes=100)
+    assert len(db) == 0
+    assert db.get("foo") is None
+
+    with db.transact() as tx:
+        tx.value["foo"] = {"bar": 1}
+        tx.value["baz"] = {"bar": 2}
+    assert db.get("foo") == {"bar": 1}
+    assert sorted(db.keys()) == ["baz", "foo"]
+
+    with db.transact() as tx:
+        tx.value["foo"]["bar"] = 3
+        del tx.value["baz"]
+        assert "baz" not in tx.value
+        assert list(tx.value) == ["foo"]
+    assert db.items() == [("foo", {"bar": 3})]
+
+    with db.transact() as tx:
+        tx.value["foo"]["bar"] = 4
+        tx.abort()
+    assert db.get("foo") == {"bar": 3}
+
+
+def test_map_unchanged_entries_not_rewritten():
+    db = SynchronizedMap[dict](max_entries=4, entry_capacity_bytes=100)
+    with db.transact() as tx:
+        tx.value["foo"] = {"bar": 1}
+        tx.value["baz"] = {"bar": 2}
+    foo = db.get("foo")
+    versions = db.versions()
+    assert set(versions) == {"foo", "baz"}
+
+    with db.transact() as tx:
+        assert tx.value["foo"] == {"bar": 1}
+        tx.value["baz"]["bar"] = 5
+
+    new_versions = db.versions()
+    assert new_versions["foo"] == versions["foo"]
+    assert new_versions["baz"] > versions["baz"]
+    assert db.get("foo") is foo  # Cached decoded value was reused
+    assert db.get("baz") == {"bar": 5}
+
+
+def test_map_capacity():
+    db = SynchronizedMap[dict](max_entries=2, entry_capacity_bytes=20)
+    with pytest.raises(RuntimeError):
+        _set_entry(db, "foo", {"bar": "x" * 20})
+    assert len(db) == 0
+
+    with pytest.raises(RuntimeError):
+        with db.transact() as tx:
+            for k in ("a", "b", "c"):
+                tx.value[k] = {}
+    assert len(db) == 0
+
+    with pytest.raises(ValueError):
+        _set_entry(db, "k" * (SynchronizedMap.MAX_KEY_BYTES + 1), {})
+
+    _set_entry(db, "a", {})
+    _set_entry(db, "b", {})
+    with db.transact() as tx:
+        del tx.value["a"]
+        tx.value["c"] = {}
+    assert sorted(db.keys()) == ["b", "c"]
+
+
+def test_map_shared_across_processes():
+    db = SynchronizedMap[dict](max_entries=4, entry_capacity_bytes=100)
+    _set_entry(db, "foo", {"bar": 1})
+    assert db.get("foo") == {"bar": 1}
+
+    ctx = multiprocessing.get_context("fork")
+    p = ctx.Process(target=_set_entry, args=(db, "foo", {"bar": 2}))
+    p.start()
+    p.join()
+    assert p.exitcode == 0
+    assert db.get("foo") == {"bar": 2}
+
+    p = ctx.Process(target=_set_entry, args=(db, "baz", {"bar": 3}))
+    p.start()
+    p.join()
+    assert sorted(db.keys()) == ["baz", "foo"]
+
+
+def test_map_index():
+    db = SynchronizedMap[dict | None](
+        max_entries=4,
+        entry_capacity_bytes=1000,
+        indexes={"name": lambda v: v["name"] if v else None},
+    )
+    with db.transact() as tx:
+        tx.value["a"] = {"name": "alpha"}
+        tx.value["b"] = None
+    assert db.lookup("name", "alpha") == ("a", {"name": "alpha"})
+    assert db.lookup("name", "beta") is None
+
+    with db.transact() as tx:
+        tx.value["b"] = {"name": "beta"}
+        a = tx.value["a"]
+        assert a is not None
+        a["name"] = "gamma"
+    assert db.lookup("name", "alpha") is None
+    assert db.lookup("name", "beta") == ("b", {"name": "beta"})
+    assert db.lookup("name", "gamma") == ("a", {"name": "gamma"})
+
+    # Replace and remove entries without reading them first
+    with db.transact() as tx:
+        tx.value["a"] = {"name": "delta"}
+        del tx.value["b"]
+    assert db.lookup("name", "gamma") is None
+    assert db.lookup("name", "beta") is None
+    assert db.lookup("name", "delta") == ("a", {"name": "delta"})
+
+    with pytest.raises(ValueError):
+        with db.transact() as tx:
+            tx.value["c"] = {"name": "n" * (SynchronizedMap.MAX_KEY_BYTES + 1)}
+    assert "c" not in db
+
+
+def test_locks_across_processes():
+    locks = SynchronizedLocks(max_keys=4)
+    ctx = multiprocessing.get_context("fork")
+    p = ctx.Process(target=_hold_lock, args=(locks, "flight1", 0.5, True))
+    p.start()
+    while "not held" in locks.describe("flight1"):
+        time.sleep(0.01)
+    assert "held by child" in locks.describe("flight1")
+
+    with pytest.raises(RuntimeError, match="held by child"):
+        locks.acquire("flight1", timeout=0.1)
+
+    # Unrelated locks are not affected
+    with locks.hold("flight2", timeout=0.1):
+        pass
+
+    t0 = time.monotonic()
+    locks.acquire("flight1", timeout=5)
+    waited = time.monotonic() - t0
+    assert waited < 0.5 + 10 * SynchronizedLocks.MAX_POLL_INTERVAL
+    locks.release("flight1")
+    p.join()
+    assert p.exitcode == 0
+
+    # Locks held by processes that no longer exist are discarded
+    p = ctx.Process(target=_hold_lock, args=(locks, "flight1", 0, False))
+    p.start()
+    p.join()
+    with locks.hold("flight1", timeout=1):
+        pass
+    assert "not held" in locks.describe("flight1")
+
+
+def test_locks_granted_in_order():
+    locks = SynchronizedLocks(max_keys=4)
+    order = []
+    locks.acquire("flight1", timeout=1)
+
+    def wait_for_lock(i: int):
+        with locks.hold("flight1", timeout=5):
+            order.append(i)
+
+    threads = []
+    for i in range(5):
+        thread = threading.Thread(target=wait_for_lock, args=(i,))
+        thread.start()
+        threads.append(thread)
+        # Ensure each thread has queued its request before the next thread starts
+        while locks.describe("flight1").count(str(os.getpid())) < i + 2:
+            time.sleep(0.001)
+    locks.release("flight1")
+    for thread in threads:
+        thread.join()
+    assert order == list(range(5))
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import bisect
+import datetime
+import math
+from collections.abc import Hashable, Iterable
+from typing import Generic, TypeVar
+
+import arrow
+import numpy as np
+import s2sphere
+from uas_standards.interuss.automated_testing.rid.v1.injection import (
+    RIDFlightDetails,
+    TestFlightDetails,
+)
+
+from monitoring.monitorlib.rid_automated_testing.telemetry import CompiledTelemetry
+
+TKey = TypeVar("TKey", bound=Hashable)
+
+DEFAULT_CELL_SIZE_DEG = 0.01
+"""Size (degrees of latitude and longitude) of each cell of the spatial index; roughly 1 km in latitude."""
+
+MAX_QUERY_CELLS = 4096
+"""Views covering more than this many cells are answered by considering every flight a candidate."""
+
+GridCell = tuple[int, int]
+"""Latitude cell number and longitude cell number."""
+
+
+class DetailsTimeline:
+    """Details of a test flight as a function of time, compiled for O(log n) lookup."""
+
+    ids: set[str]
+    """All flight IDs reported by this flight at any time."""
+
+    def __init__(self, details_responses: Iterable[TestFlightDetails]):
+        responses = sorted(
+            (
+                (arrow.get(r.effective_after).datetime.timestamp(), i, r.details)
+                for i, r in enumerate(details_responses)
+            ),
+            key=lambda r: (r[0], r[1]),
+        )
+        self._times = [r[0] for r in responses]
+        self._details = [r[2] for r in responses]
+        self.ids = {d.id for d in self._details if d.get("id")}
+
+    def at(self, t: datetime.datetime) -> RIDFlightDetails | None:
+        """Equivalent to TestFlight.get_details."""
+        i = bisect.bisect_right(self._times, t.timestamp()) - 1
+        if i < 0:
+            return None
+        # When multiple responses are effective after the same time, TestFlight.get_details uses the first one
+        i = bisect.bisect_left(self._times, self._times[i])
+        return self._details[i]
+
+
+class FlightIndex(Generic[TKey]):  # noqa: UP046 (see SynchronizedValue)
+    """In-process index of test flights by the locations of their telemetry and by the IDs they report.
+
+    Each flight is placed in the cells of a latitude/longitude grid containing any of its telemetry positions.  Since
+    a flight can only be relevant to a view when one of its telemetry positions is within that view, the flights
+    which may be relevant to a view are those in the grid cells overlapping the view.
+    """
+
+    def __init__(self, cell_size_deg: float = DEFAULT_CELL_SIZE_DEG):
+        self._cell_size_deg = cell_size_deg
+        self._cells: dict[TKey, list[GridCell]] = {}
+        self._grid: dict[GridCell, set[TKey]] = {}
+        self._ids: dict[TKey, set[str]] = {}
+        self._flights_by_id: dict[str, set[TKey]] = {}
+
+    def set(
+        self, key: TKey, telemetry: CompiledTelemetry, details: DetailsTimeline
+    ) -> None:
+        """Add a flight to the index, replacing any existing flight with the same key."""
+        self.remove(key)
+
+        lat_cells = np.floor(telemetry.lat / self._cell_size_deg).astype(np.int64)
+        lng_cells = np.floor(telemetry.lng / self._cell_size_deg).astype(np.int64)
+        cells: list[GridCell] = [
+            (int(lat), int(lng))
+            for lat, lng in np.unique(np.stack([lat_cells, lng_cells], axis=1), axis=0)
+        ]
+        self._cells[key] = cells
+        for cell in cells:
+            self._grid.setdefault(cell, set()).add(key)
+
+        self._ids[key] = details.ids
+        for flight_id in details.ids:
+            self._flights_by_id.setdefault(flight_id, set()).add(key)
+
+    def remove(self, key: TKey) -> None:
+        """Remove the flight with the specified key from the index, if present."""
+        for cell in self._cells.pop(key, []):
+            keys = self._grid[cell]
+            keys.discard(key)
+            if not keys:
+                del self._grid[cell]
+        for flight_id in self._ids.pop(key, set()):
+            keys = self._flights_by_id[flight_id]
+            keys.discard(key)
+            if not keys:
+                del self._flights_by_id[flight_id]
+
+    def _lng_cell_ranges(self, view: s2sphere.LatLngRect) -> list[range]:
+        lng_lo = math.floor(view.lng_lo().degrees / self._cell_size_deg)
+        lng_hi = math.floor(view.lng_hi().degrees / self._cell_size_deg)
+        if view.lng().is_inverted():
+            # View crosses the antimeridian
+            return [
+                range(lng_lo, math.floor(180 / self._cell_size_deg) + 1),
+                range(math.floor(-180 / self._cell_size_deg), lng_hi + 1),
+            ]
+        return [range(lng_lo, lng_hi + 1)]
+
+    def in_view(self, view: s2sphere.LatLngRect) -> set[TKey]:
+        """Find the keys of all flights with telemetry positions which may be within the specified view."""
+        lat_cells = range(
+            math.floor(view.lat_lo().degrees / self._cell_size_deg),
+            math.floor(view.lat_hi().degrees / self._cell_size_deg) + 1,
+        )
+        lng_ranges = self._lng_cell_ranges(view)
+        n_cells = len(lat_cells) * sum(len(r) for r in lng_ranges)
+        if n_cells > MAX_QUERY_CELLS or n_cells > len(self._grid):
+            # Cheaper to check each occupied cell than each cell in the view
+            return {
+                key
+                for (lat, lng), keys in self._grid.items()
+                if lat in lat_cells and any(lng in r for r in lng_ranges)
+                for key in keys
+            }
+
+        result = set()
+        for lat in lat_cells:
+            for lng_cells in lng_ranges:
+                for lng in lng_cells:
+                    keys = self._grid.get((lat, lng), None)
+                    if keys:
+                        result.update(keys)
+        return result
+
+    def with_id(self, flight_id: str) -> set[TKey]:
+        """Find the keys of all flights which report the specified flight ID at some time."""
+        return set(self._flights_by_id.get(flight_id, ()))
+
+    def __contains__(self, key: TKey) -> bool:
+        return key in self._cells
+
+    def __len__(self) -> int:
+        return len(self._cells)
@@ -0,0 +1,203 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+
+import s2sphere
+from implicitdict import StringBasedDateTime
+from uas_standards.astm.f3411.v22a.constants import NetMaxNearRealTimeDataPeriodSeconds
+from uas_standards.interuss.automated_testing.rid.v1.injection import (
+    RIDAircraftPosition,
+    RIDAircraftState,
+    RIDFlightDetails,
+    TestFlightDetails,
+)
+
+from monitoring.monitorlib.rid_automated_testing.flight_index import (
+    DetailsTimeline,
+    FlightIndex,
+)
+from monitoring.monitorlib.rid_automated_testing.telemetry import CompiledTelemetry
+
+RECENT_DATA_PERIOD = timedelta(seconds=NetMaxNearRealTimeDataPeriodSeconds)
+
+
+def _random_flight(
+    rng: random.Random, t0: datetime, area_deg: float, n_points: int, flight_id: str
+) -> tuple[CompiledTelemetry, DetailsTimeline]:
+    lat = 34 + rng.uniform(0, area_deg)
+    lng = -118 + rng.uniform(0, area_deg)
+    heading_lat = rng.uniform(-1e-4, 1e-4)
+    heading_lng = rng.uniform(-1e-4, 1e-4)
+    telemetry = []
+    for i in range(n_points):
+        lat += heading_lat
+        lng += heading_lng
+        telemetry.append(
+            RIDAircraftState(
+                timestamp=StringBasedDateTime(t0 + timedelta(seconds=i)),
+                position=RIDAircraftPosition(lat=lat, lng=lng, alt=100.0),
+            )
+        )
+    details = [
+        TestFlightDetails(
+            effective_after=StringBasedDateTime(t0 - timedelta(seconds=1)),
+            details=RIDFlightDetails(id=flight_id),
+        )
+    ]
+    return CompiledTelemetry(telemetry), DetailsTimeline(details)
+
+
+def _random_view(
+    rng: random.Random, area_deg: float, view_deg: float
+) -> s2sphere.LatLngRect:
+    lat = 34 + rng.uniform(0, area_deg)
+    lng = -118 + rng.uniform(0, area_deg)
+    size = rng.uniform(0, view_deg)
+    return s2sphere.LatLngRect.from_point_pair(
+        s2sphere.LatLng.from_degrees(lat, lng),
+        s2sphere.LatLng.from_degrees(lat + size, lng + size),
+    )
+
+
+def _visible_ids(
+    flights: list[tuple[CompiledTelemetry, DetailsTimeline]],
+    candidates,
+    view: s2sphere.LatLngRect,
+    t: datetime,
+) -> set[str]:
+    result = set()
+    for i in candidates:
+        telemetry, details = flights[i]
+        flight_details = details.at(t)
+        if flight_details and telemetry.select_relevant_states(
+            view, t - RECENT_DATA_PERIOD, t
+        ):
+            result.add(flight_details.id)
+    return result
+
+
+def main(
+    n_flights: int,
+    n_queries: int,
+    n_points: int,
+    area_deg: float,
+    view_deg: float,
+) -> int:
+    rng = random.Random(0)
+    t0 = datetime.now(UTC)
+    t_start = time.monotonic()
+    flights = [
+        _random_flight(rng, t0, area_deg, n_points, f"flight{i}")
+        for i in range(n_flights)
+    ]
+    print(f"Compiled {n_flights} injected flights in {time.monotonic() - t_start:.2f}s")
+
+    t_start = time.monotonic()
+    index = FlightIndex[int]()
+    for i, (telemetry, details) in enumerate(flights):
+        index.set(i, telemetry, details)
+    print(f"Indexed {n_flights} injected flights in {time.monotonic() - t_start:.2f}s")
+
+    views = [_random_view(rng, area_deg, view_deg) for _ in range(n_queries)]
+    times = [t0 + timedelta(seconds=rng.uniform(0, n_points)) for _ in range(n_queries)]
+    ids = [f"flight{rng.randrange(n_flights)}" for _ in range(n_queries)]
+
+    t_start = time.monotonic()
+    linear_results = [
+        _visible_ids(flights, range(n_flights), view, t)
+        for view, t in zip(views, times)
+    ]
+    linear_s = time.monotonic() - t_start
+
+    t_start = time.monotonic()
+    n_candidates = 0
+    indexed_results = []
+    for view, t in zip(views, times):
+        candidates = sorted(index.in_view(view))
+        n_candidates += len(candidates)
+        indexed_results.append(_visible_ids(flights, candidates, view, t))
+    indexed_s = time.monotonic() - t_start
+
+    if indexed_results != linear_results:
+        print("Indexed view query results did not match exhaustive results")
+        return os.EX_SOFTWARE
+
+    t_start = time.monotonic()
+    linear_details = [
+        [
+            i
+            for i, (_, details) in enumerate(flights)
+            if (d := details.at(t)) and d.id == flight_id
+        ]
+        for flight_id, t in zip(ids, times)
+    ]
+    linear_details_s = time.monotonic() - t_start
+
+    t_start = time.monotonic()
+    indexed_details = [
+        [
+            i
+            for i in sorted(index.with_id(flight_id))
+            if (d := flights[i][1].at(t)) and d.id == flight_id
+        ]
+        for flight_id, t in zip(ids, times)
+    ]
+    indexed_details_s = time.monotonic() - t_start
+
+    if indexed_details != linear_details:
+        print("Indexed details query results did not match exhaustive results")
+        return os.EX_SOFTWARE
+
+    n_visible = sum(len(r) for r in linear_results)
+    print(
+        f"Queried {n_queries} views among {n_flights} injected flights ({n_visible / n_queries:.1f} visible flights per view):"
+    )
+    print(f"  Exhaustive: {1000 * linear_s / n_queries:.2f}ms per view")
+    print(
+        f"  Indexed:    {1000 * indexed_s / n_queries:.2f}ms per view ({n_candidates / n_queries:.1f} candidates per view)"
+    )
+    print(f"Queried details of {n_queries} flights among {n_flights} injected flights:")
+    print(f"  Exhaustive: {1000 * linear_details_s / n_queries:.3f}ms per query")
+    print(f"  Indexed:    {1000 * indexed_details_s / n_queries:.3f}ms per query")
+    return os.EX_OK
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare exhaustive and indexed RID Service Provider queries among many concurrently-injected flights"
+    )
+
+    parser.add_argument(
+        "--flights", type=int, default=5000, help="Number of injected flights"
+    )
+    parser.add_argument(
+        "--queries", type=int, default=200, help="Number of queries of each type"
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=120,
+        help="Number of telemetry points (one per second) in each injected flight",
+    )
+    parser.add_argument(
+        "--area",
+        type=float,
+        default=0.5,
+        help="Size (degrees of latitude and longitude) of the area in which flights are located",
+    )
+    parser.add_argument(
+        "--view",
+        type=float,
+        default=0.05,
+        help="Maximum size (degrees of latitude and longitude) of each view queried",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    sys.exit(main(args.flights, args.queries, args.points, args.area, args.view))
@@ -0,0 +1,116 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import s2sphere
+from implicitdict import ImplicitDict
+from uas_standards.interuss.automated_testing.rid.v1 import injection
+
+from monitoring.monitorlib.rid_automated_testing import injection_api
+from monitoring.monitorlib.rid_automated_testing.flight_index import (
+    DetailsTimeline,
+    FlightIndex,
+)
+from monitoring.monitorlib.rid_automated_testing.telemetry import CompiledTelemetry
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _flight(
+    rng: random.Random, lat: float, lng: float, flight_id: str
+) -> injection_api.TestFlight:
+    telemetry = []
+    for i in range(20):
+        lat += rng.uniform(-0.005, 0.005)
+        lng = (lng + rng.uniform(-0.005, 0.005) + 180) % 360 - 180
+        telemetry.append(
+            {
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "timestamp_accuracy": 0,
+                "operational_status": "Airborne",
+                "position": {"lat": lat, "lng": lng, "alt": 100},
+                "track": 0,
+                "speed": 10,
+                "speed_accuracy": "SA1mps",
+                "vertical_speed": 0,
+            }
+        )
+    details_responses = [
+        {
+            "effective_after": (T0 + timedelta(seconds=dt)).isoformat(),
+            "details": {"id": f"{flight_id}_{n}"},
+        }
+        for n, dt in enumerate((20, 0, 10, 10))
+    ]
+    return injection_api.TestFlight(
+        ImplicitDict.parse(
+            {
+                "injection_id": flight_id,
+                "telemetry": telemetry,
+                "details_responses": details_responses,
+            },
+            injection.TestFlight,
+        )
+    )
+
+
+def test_in_view_includes_all_flights_in_view():
+    rng = random.Random(12345)
+    for lng0 in (-118.0, 179.95):
+        flights = [
+            _flight(rng, 34 + rng.uniform(0, 0.1), lng0 + rng.uniform(0, 0.1), f"f{i}")
+            for i in range(30)
+        ]
+        telemetry = [CompiledTelemetry(f.telemetry) for f in flights]
+        index = FlightIndex[int]()
+        for i, flight in enumerate(flights):
+            index.set(i, telemetry[i], DetailsTimeline(flight.details_responses))
+        assert len(index) == len(flights)
+
+        n_found = 0
+        for _ in range(100):
+            lat = 34 + rng.uniform(0, 0.1)
+            lng = lng0 + rng.uniform(0, 0.1)
+            size = rng.uniform(0.001, 0.05)
+            view = s2sphere.LatLngRect.from_point_pair(
+                s2sphere.LatLng.from_degrees(lat - size, lng - size).normalized(),
+                s2sphere.LatLng.from_degrees(lat + size, lng + size).normalized(),
+            )
+            expected = {
+                i
+                for i, t in enumerate(telemetry)
+                if t.contained_in(view, 0, len(t)).any()
+            }
+            candidates = index.in_view(view)
+            assert expected <= candidates
+            n_found += len(expected)
+        assert n_found > 0
+
+
+def test_details_and_removal():
+    rng = random.Random(12345)
+    flight = _flight(rng, 34, -118, "f1")
+    details = DetailsTimeline(flight.details_responses)
+    for dt in (-1, 0, 5, 10, 15, 20, 25):
+        t = T0 + timedelta(seconds=dt)
+        assert details.at(t) == flight.get_details(t)
+    assert details.ids == {"f1_0", "f1_1", "f1_2", "f1_3"}
+
+    index = FlightIndex[str]()
+    index.set("a", CompiledTelemetry(flight.telemetry), details)
+    index.set("b", CompiledTelemetry(flight.telemetry), details)
+    assert index.with_id("f1_2") == {"a", "b"}
+    assert index.with_id("f2_0") == set()
+
+    index.remove("a")
+    assert "a" not in index
+    assert index.with_id("f1_2") == {"b"}
+    view = s2sphere.LatLngRect.from_point_pair(
+        s2sphere.LatLng.from_degrees(33.9, -118.1),
+        s2sphere.LatLng.from_degrees(34.1, -117.9),
+    )
+    assert index.in_view(view) == {"b"}
+
+    index.remove("b")
+    assert len(index) == 0
+    assert index.in_view(view) == set()
+    assert index.with_id("f1_2") == set()
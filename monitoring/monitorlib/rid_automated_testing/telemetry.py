@@ -0,0 +1,97 @@
+import datetime
+from collections.abc import Iterable
+
+import numpy as np
+import s2sphere
+from uas_standards.interuss.automated_testing.rid.v1.injection import (
+    RIDAircraftState,
+)
+
+
+class CompiledTelemetry:
+    """Telemetry of a test flight compiled into time-ordered columnar arrays.
+
+    Compiling telemetry once allows the states relevant to a query to be selected with a binary search over time and a
+    vectorized containment test rather than examining every telemetry point individually.
+    """
+
+    states: list[RIDAircraftState]
+    """Telemetry states with a timestamp and position, ordered by timestamp."""
+
+    timestamps: np.ndarray
+    """POSIX timestamp of each state."""
+
+    lat: np.ndarray
+    """Latitude (degrees) of each state."""
+
+    lng: np.ndarray
+    """Longitude (degrees) of each state."""
+
+    alt: np.ndarray
+    """Altitude of each state, or NaN when not specified."""
+
+    def __init__(self, telemetry: Iterable[RIDAircraftState]):
+        points: list[
+            tuple[datetime.datetime, float, float, float, RIDAircraftState]
+        ] = []
+        for state in telemetry:
+            timestamp = state.get("timestamp")
+            position = state.get("position")
+            if not timestamp or not position:
+                continue
+            lat = position.get("lat")
+            lng = position.get("lng")
+            if lat is None or lng is None:
+                continue
+            alt = position.get("alt")
+            points.append(
+                (
+                    timestamp.datetime,
+                    lat,
+                    lng,
+                    alt if alt is not None else np.nan,
+                    state,
+                )
+            )
+        points.sort(key=lambda p: p[0])
+
+        self.states = [p[4] for p in points]
+        self.timestamps = np.array([p[0].timestamp() for p in points], dtype=np.float64)
+        self.lat = np.array([p[1] for p in points], dtype=np.float64)
+        self.lng = np.array([p[2] for p in points], dtype=np.float64)
+        self.alt = np.array([p[3] for p in points], dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def contained_in(self, view: s2sphere.LatLngRect, i0: int, i1: int) -> np.ndarray:
+        """Determine which states in the index range [i0, i1) are located within the specified view."""
+        lat = self.lat[i0:i1]
+        lng = self.lng[i0:i1]
+        inside = (lat >= view.lat_lo().degrees) & (lat <= view.lat_hi().degrees)
+        lng_lo = view.lng_lo().degrees
+        lng_hi = view.lng_hi().degrees
+        if view.lng().is_inverted():
+            # View crosses the antimeridian
+            inside &= (lng >= lng_lo) | (lng <= lng_hi)
+        else:
+            inside &= (lng >= lng_lo) & (lng <= lng_hi)
+        return inside
+
+    def select_relevant_states(
+        self, view: s2sphere.LatLngRect, t0: datetime.datetime, t1: datetime.datetime
+    ) -> list[RIDAircraftState]:
+        """Select the states between t0 and t1 (inclusive) relevant to the specified view.
+
+        Equivalent to TestFlight.select_relevant_states, except that each relevant state is only included once: states
+        inside the view are relevant, as are the states immediately before entering and after leaving the view.
+        """
+        i0 = int(np.searchsorted(self.timestamps, t0.timestamp(), side="left"))
+        i1 = int(np.searchsorted(self.timestamps, t1.timestamp(), side="right"))
+        if i0 >= i1:
+            return []
+        inside = self.contained_in(view, i0, i1)
+        relevant = inside.copy()
+        relevant[1:] |= inside[:-1]
+        relevant[:-1] |= inside[1:]
+        return [self.states[i0 + i] for i in np.flatnonzero(relevant).tolist()]
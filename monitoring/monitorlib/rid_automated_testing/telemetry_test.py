@@ -0,0 +1,74 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+import s2sphere
+from implicitdict import ImplicitDict
+from uas_standards.interuss.automated_testing.rid.v1 import injection
+
+from monitoring.monitorlib.rid_automated_testing import injection_api
+from monitoring.monitorlib.rid_automated_testing.telemetry import CompiledTelemetry
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _flight(rng: random.Random, lng0: float) -> injection_api.TestFlight:
+    telemetry = []
+    lat, lng = 34.0, lng0
+    for i in range(200):
+        lat += rng.uniform(-0.001, 0.001)
+        lng = (lng + rng.uniform(-0.001, 0.001) + 180) % 360 - 180
+        telemetry.append(
+            {
+                "timestamp": (T0 + timedelta(seconds=i)).isoformat(),
+                "timestamp_accuracy": 0,
+                "operational_status": "Airborne",
+                "position": {"lat": lat, "lng": lng, "alt": 100},
+                "track": 0,
+                "speed": 10,
+                "speed_accuracy": "SA1mps",
+                "vertical_speed": 0,
+            }
+        )
+    flight = injection_api.TestFlight(
+        ImplicitDict.parse(
+            {
+                "injection_id": "flight1",
+                "telemetry": telemetry,
+                "details_responses": [],
+            },
+            injection.TestFlight,
+        )
+    )
+    flight.order_telemetry()
+    return flight
+
+
+def test_select_relevant_states_matches_test_flight():
+    rng = random.Random(12345)
+    for lng0 in (-118.0, 179.99):
+        flight = _flight(rng, lng0)
+        compiled = CompiledTelemetry(flight.telemetry)
+        assert len(compiled) == 200
+        n_selected = 0
+        for _ in range(100):
+            lat = 34.0 + rng.uniform(-0.01, 0.01)
+            lng = lng0 + rng.uniform(-0.01, 0.01)
+            size = rng.uniform(0.001, 0.01)
+            view = s2sphere.LatLngRect.from_point_pair(
+                s2sphere.LatLng.from_degrees(lat - size, lng - size).normalized(),
+                s2sphere.LatLng.from_degrees(lat + size, lng + size).normalized(),
+            )
+            t0 = T0 + timedelta(seconds=rng.uniform(-10, 200))
+            t1 = t0 + timedelta(seconds=rng.uniform(0, 60))
+
+            expected = flight.select_relevant_states(view, t0, t1)
+            # TestFlight may report a state twice when the flight briefly exits and re-enters the view
+            expected_unique = [
+                s
+                for i, s in enumerate(expected)
+                if all(s is not e for e in expected[:i])
+            ]
+            actual = compiled.select_relevant_states(view, t0, t1)
+            assert actual == expected_unique
+            n_selected += len(actual)
+        assert n_selected > 0
@@ -1,13 +1,18 @@
 import os.path
+import threading
+from collections.abc import Iterable
 from dataclasses import dataclass
 from enum import StrEnum
 from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
 
 import jsonschema.validators
 import yaml
 from bc_jsonpath_ng.parser import parse
 from implicitdict import ImplicitDict
 from implicitdict.jsonschema import SchemaVars, make_json_schema
+from jsonschema.protocols import Validator
 
 
 class F3411_19(StrEnum):
@@ -108,27 +113,66 @@ def _collect_errors(e: jsonschema.ValidationError) -> list[ValidationError]:
         return [ValidationError(message=e.message, json_path=e.json_path)]
 
 
-def validate(
-    openapi_path: str, object_path: str, instance: dict
-) -> list[ValidationError]:
-    """Validate an object instance against the OpenAPI schema definition for that object type.
-
-    Args:
-        openapi_path: Path to OpenAPI file, relative to repository root.
-        object_path: JSONPath to object schema within OpenAPI file content.
-        instance: Instance to validate against schema.
-
-    Returns: List of ValidationErrors (or empty list when validation passes).
-    """
+def _resolve_openapi_path(openapi_path: str) -> tuple[str, str]:
+    """Absolute path to the OpenAPI file and to the folder containing it."""
     base_path = os.path.split(openapi_path)[0]
     if not os.path.isabs(base_path):
         repo_root = os.path.realpath(os.path.join(os.path.split(__file__)[0], "../.."))
         base_path = os.path.join(repo_root, base_path)
-    openapi_path = os.path.join(base_path, os.path.split(openapi_path)[1])
+    return os.path.join(base_path, os.path.split(openapi_path)[1]), base_path
+
+
+def _resolve_local_ref(document: dict, ref: str) -> Any:
+    node = document
+    for token in ref[2:].split("/"):
+        token = unquote(token).replace("~1", "/").replace("~0", "~")
+        node = node[int(token)] if isinstance(node, list) else node[token]
+    return node
+
+
+def _inline_local_refs(schema: Any, document: dict, siblings_ignored: bool) -> Any:
+    """Copy of schema with each reference to a location within document replaced by the schema it refers to.
+
+    A schema referenced multiple times is inlined as a single shared object, so recursive schemas become cyclic
+    structures rather than infinitely deep ones.
+
+    Args:
+        schema: Schema (or portion of a schema) in which to inline references.
+        document: Document containing schema, relative to which local references are resolved.
+        siblings_ignored: True if keywords alongside $ref are ignored (as in JSON Schema draft 4), False if they apply
+            in addition to the referenced schema.
+    """
+    inlined: dict[str, Any] = {}
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, list):
+            return [inline(v) for v in node]
+        if not isinstance(node, dict):
+            return node
+        ref = node.get("$ref")
+        if not isinstance(ref, str) or not ref.startswith("#/"):
+            return {k: inline(v) for k, v in node.items()}
+
+        if ref not in inlined:
+            target = _resolve_local_ref(document, ref)
+            if isinstance(target, dict):
+                # Register the (initially empty) inlined schema before inlining its content so recursive references
+                # find it
+                inlined[ref] = {}
+                inlined[ref].update(inline(target))
+            else:
+                inlined[ref] = inline(target)
+        if siblings_ignored or len(node) == 1:
+            return inlined[ref]
+        siblings = {k: inline(v) for k, v in node.items() if k != "$ref"}
+        return {"allOf": [inlined[ref]], **siblings}
+
+    return inline(schema)
+
+
+def _compile_validator(openapi_path: str, object_path: str) -> Validator:
+    openapi_path, base_path = _resolve_openapi_path(openapi_path)
     openapi_content = _get_openapi_content(openapi_path)
-    resolver = jsonschema.validators.RefResolver(
-        base_uri=f"{Path(base_path).as_uri()}/", referrer=openapi_content
-    )
     schema_matches = parse(object_path).find(openapi_content)
     if len(schema_matches) != 1:
         raise ValueError(
@@ -149,13 +193,80 @@ def validate(
         )
 
     validator_class.check_schema(schema)
-    validator = validator_class(schema, resolver=resolver)
+    schema = _inline_local_refs(
+        schema,
+        openapi_content,
+        siblings_ignored=validator_class is jsonschema.Draft4Validator,
+    )
+    # References to other files are still resolved during validation
+    resolver = jsonschema.validators.RefResolver(
+        base_uri=f"{Path(base_path).as_uri()}/", referrer=openapi_content
+    )
+    return validator_class(schema, resolver=resolver)
+
+
+_validators = threading.local()
+"""Compiled validators by OpenAPI path and object path.  Per thread because validators' reference resolvers are not
+thread-safe."""
+
+
+def get_validator(openapi_path: str, object_path: str) -> Validator:
+    """Validator for the OpenAPI schema definition of an object type, compiled on first use in each thread.
+
+    Args:
+        openapi_path: Path to OpenAPI file, relative to repository root.
+        object_path: JSONPath to object schema within OpenAPI file content.
+    """
+    cache: dict[tuple[str, str], Validator] | None = getattr(_validators, "cache", None)
+    if cache is None:
+        cache = {}
+        _validators.cache = cache
+    key = (openapi_path, object_path)
+    validator = cache.get(key)
+    if validator is None:
+        validator = _compile_validator(openapi_path, object_path)
+        cache[key] = validator
+    return validator
+
+
+def _errors_of(validator: Validator, instance: Any) -> list[ValidationError]:
     result = []
     for e in validator.iter_errors(instance):
         result.extend(_collect_errors(e))
     return result
 
 
+def validate(
+    openapi_path: str, object_path: str, instance: dict
+) -> list[ValidationError]:
+    """Validate an object instance against the OpenAPI schema definition for that object type.
+
+    Args:
+        openapi_path: Path to OpenAPI file, relative to repository root.
+        object_path: JSONPath to object schema within OpenAPI file content.
+        instance: Instance to validate against schema.
+
+    Returns: List of ValidationErrors (or empty list when validation passes).
+    """
+    return _errors_of(get_validator(openapi_path, object_path), instance)
+
+
+def validate_many(
+    openapi_path: str, object_path: str, instances: Iterable[dict]
+) -> list[list[ValidationError]]:
+    """Validate many object instances against the OpenAPI schema definition for their object type.
+
+    Args:
+        openapi_path: Path to OpenAPI file, relative to repository root.
+        object_path: JSONPath to object schema within OpenAPI file content.
+        instances: Instances to validate against schema.
+
+    Returns: List of ValidationErrors (or empty list when validation passes) for each instance, in order.
+    """
+    validator = get_validator(openapi_path, object_path)
+    return [_errors_of(validator, instance) for instance in instances]
+
+
 def _definitions_resolver(t: type) -> SchemaVars:
     def path_to(t_dest: type, t_src: type) -> str:
         return "#/definitions/" + (
@@ -176,13 +287,16 @@ def _make_implicitdict_schema(t: type[ImplicitDict]) -> dict:
     return schema
 
 
+_implicitdict_validators: dict[type[ImplicitDict], Validator] = {}
+
+
 def validate_implicitdict_object(
     obj: dict, t: type[ImplicitDict]
 ) -> list[ValidationError]:
-    schema = _make_implicitdict_schema(t)
-    jsonschema.Draft202012Validator.check_schema(schema)
-    validator = jsonschema.Draft202012Validator(schema)
-    result = []
-    for e in validator.iter_errors(obj):
-        result.extend(_collect_errors(e))
-    return result
+    validator = _implicitdict_validators.get(t)
+    if validator is None:
+        schema = _make_implicitdict_schema(t)
+        jsonschema.Draft202012Validator.check_schema(schema)
+        validator = jsonschema.Draft202012Validator(schema)
+        _implicitdict_validators[t] = validator
+    return _errors_of(validator, obj)
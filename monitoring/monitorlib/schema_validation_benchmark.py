@@ -0,0 +1,150 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import jsonschema.validators
+import yaml
+from bc_jsonpath_ng.parser import parse
+
+from monitoring.monitorlib import schema_validation
+
+_OBJECT_PATH = "components.schemas.QueryResponse"
+
+_OPENAPI = {
+    "openapi": "3.0.3",
+    "components": {
+        "schemas": {
+            "QueryResponse": {
+                "type": "object",
+                "required": ["references"],
+                "properties": {
+                    "references": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Reference"},
+                    }
+                },
+            },
+            "Reference": {
+                "type": "object",
+                "required": ["id", "manager", "version", "time_start", "time_end"],
+                "properties": {
+                    "id": {"$ref": "#/components/schemas/EntityID"},
+                    "manager": {"type": "string"},
+                    "version": {"type": "integer", "minimum": 0},
+                    "time_start": {"$ref": "#/components/schemas/Time"},
+                    "time_end": {"$ref": "#/components/schemas/Time"},
+                    "uss_base_url": {"type": "string", "format": "uri"},
+                },
+            },
+            "EntityID": {"type": "string", "minLength": 1, "maxLength": 36},
+            "Time": {
+                "type": "object",
+                "required": ["value", "format"],
+                "properties": {
+                    "value": {"type": "string"},
+                    "format": {"type": "string", "enum": ["RFC3339"]},
+                },
+            },
+        }
+    },
+}
+
+
+def _validate_per_call(openapi_path: str, object_path: str, instance: dict) -> int:
+    """Validation as performed before validators were compiled and cached: schema located, checked, and wrapped in a
+    new validator and reference resolver on every call."""
+    base_path = os.path.split(openapi_path)[0]
+    openapi_content = schema_validation._get_openapi_content(openapi_path)
+    resolver = jsonschema.validators.RefResolver(
+        base_uri=f"{Path(base_path).as_uri()}/", referrer=openapi_content
+    )
+    schema = parse(object_path).find(openapi_content)[0].value
+    jsonschema.Draft4Validator.check_schema(schema)
+    validator = jsonschema.Draft4Validator(schema, resolver=resolver)
+    return sum(1 for _ in validator.iter_errors(instance))
+
+
+def _random_response(rng: random.Random, n_references: int) -> dict:
+    return {
+        "references": [
+            {
+                "id": f"{rng.getrandbits(64):016x}",
+                "manager": "uss1",
+                "version": rng.randint(0, 10),
+                "time_start": {"value": "2024-01-01T00:00:00Z", "format": "RFC3339"},
+                "time_end": {"value": "2024-01-01T01:00:00Z", "format": "RFC3339"},
+                "uss_base_url": "https://uss1.example.com",
+            }
+            for _ in range(n_references)
+        ]
+    }
+
+
+def main(n_instances: int, n_references: int) -> int:
+    rng = random.Random(0)
+    instances = [_random_response(rng, n_references) for _ in range(n_instances)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        openapi_path = os.path.join(tmp_dir, "openapi.yaml")
+        with open(openapi_path, "w") as f:
+            yaml.dump(_OPENAPI, f)
+
+        t_start = time.monotonic()
+        per_call_errors = [
+            _validate_per_call(openapi_path, _OBJECT_PATH, instance)
+            for instance in instances
+        ]
+        per_call_s = time.monotonic() - t_start
+
+        t_start = time.monotonic()
+        compiled_errors = [
+            len(schema_validation.validate(openapi_path, _OBJECT_PATH, instance))
+            for instance in instances
+        ]
+        compiled_s = time.monotonic() - t_start
+
+        t_start = time.monotonic()
+        batch_errors = [
+            len(errors)
+            for errors in schema_validation.validate_many(
+                openapi_path, _OBJECT_PATH, instances
+            )
+        ]
+        batch_s = time.monotonic() - t_start
+
+    if not (per_call_errors == compiled_errors == batch_errors):
+        print("Compiled validation results did not match per-call validation results")
+        return os.EX_SOFTWARE
+
+    print(f"Validated {n_instances} responses with {n_references} references each:")
+    print(f"  Per call:      {1000 * per_call_s / n_instances:.3f}ms per response")
+    print(f"  Compiled:      {1000 * compiled_s / n_instances:.3f}ms per response")
+    print(f"  validate_many: {1000 * batch_s / n_instances:.3f}ms per response")
+    return os.EX_OK
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare per-call and compiled OpenAPI schema validation of many responses"
+    )
+
+    parser.add_argument(
+        "--responses", type=int, default=2000, help="Number of responses to validate"
+    )
+    parser.add_argument(
+        "--references",
+        type=int,
+        default=3,
+        help="Number of references in each response",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    sys.exit(main(args.responses, args.references))
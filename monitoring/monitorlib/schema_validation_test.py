@@ -0,0 +1,74 @@
+import jsonschema.validators
+import yaml
+
+from monitoring.monitorlib import schema_validation
+
+_OPENAPI = {
+    "components": {
+        "schemas": {
+            "Node": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {
+                    "name": {"$ref": "#/components/schemas/Name"},
+                    "children": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Node"},
+                    },
+                    "size": {
+                        "$ref": "#/components/schemas/Size",
+                        "maximum": 10,
+                    },
+                },
+            },
+            "Name": {"type": "string", "minLength": 1},
+            "Size": {"type": "integer", "minimum": 0},
+        }
+    },
+}
+
+_INSTANCES = [
+    {"name": "root", "children": [{"name": "a"}, {"name": "b", "children": []}]},
+    {"name": "root", "children": [{"name": ""}, {"children": [{"name": 1}]}]},
+    {"name": "root", "size": -1},
+    {"name": "root", "size": 20},
+    {"children": "none"},
+]
+
+
+def _uncompiled_errors(content: dict, instance: dict) -> list[str]:
+    """Validate without inlining references, as a reference for the compiled validator."""
+    if content["openapi"].startswith("3.0"):
+        validator_class = jsonschema.Draft4Validator
+    else:
+        validator_class = jsonschema.Draft202012Validator
+    resolver = jsonschema.validators.RefResolver(base_uri="", referrer=content)
+    validator = validator_class(
+        content["components"]["schemas"]["Node"], resolver=resolver
+    )
+    return sorted(
+        f"{e.json_path}: {e.message}" for e in validator.iter_errors(instance)
+    )
+
+
+def test_compiled_validators(tmp_path):
+    for openapi_version in ("3.0.3", "3.1.0"):
+        content = {"openapi": openapi_version, **_OPENAPI}
+        openapi_path = str(tmp_path / f"openapi{openapi_version}.yaml")
+        with open(openapi_path, "w") as f:
+            yaml.dump(content, f)
+        object_path = "components.schemas.Node"
+
+        results = schema_validation.validate_many(openapi_path, object_path, _INSTANCES)
+        assert not results[0]
+        for instance, errors in zip(_INSTANCES, results):
+            assert sorted(
+                f"{e.json_path}: {e.message}" for e in errors
+            ) == _uncompiled_errors(content, instance)
+            assert (
+                schema_validation.validate(openapi_path, object_path, instance)
+                == errors
+            )
+        assert schema_validation.get_validator(
+            openapi_path, object_path
+        ) is schema_validation.get_validator(openapi_path, object_path)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import secrets
+import threading
+from collections.abc import Container, Iterable, Iterator
+from typing import BinaryIO, NamedTuple
+
+from loguru import logger
+
+DEFAULT_MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+"""Segment files are rotated once they reach this size."""
+
+SEGMENT_EXTENSION = ".jsonl"
+INDEX_EXTENSION = ".idx"
+
+
+class LogEntry(NamedTuple):
+    """Index entry describing the location of one record in a SegmentedLog."""
+
+    segment: str
+    """Base name (without extension) of the segment file containing the record."""
+
+    seq: int
+    """Sequence number of the record among records appended by the same writer."""
+
+    timestamp: float
+    """POSIX timestamp of the record."""
+
+    kind: str
+    """Caller-defined kind of the record."""
+
+    offset: int
+    """Byte offset of the record within its segment file."""
+
+    length: int
+    """Length of the record in bytes."""
+
+    @property
+    def time(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.timestamp, datetime.UTC)
+
+    @property
+    def writer(self) -> str:
+        return self.segment.rsplit("_", 1)[0]
+
+    @property
+    def name(self) -> str:
+        """Name of this entry which is unique within its log."""
+        return f"{self.writer}_{self.seq:06d}_{self.kind}"
+
+    @staticmethod
+    def from_index_line(segment: str, line: str) -> LogEntry:
+        seq, timestamp, kind, offset, length = line.rstrip("\n").split("\t")
+        return LogEntry(
+            segment=segment,
+            seq=int(seq),
+            timestamp=float(timestamp),
+            kind=kind,
+            offset=int(offset),
+            length=int(length),
+        )
+
+    def to_index_line(self) -> str:
+        return f"{self.seq}\t{self.timestamp!r}\t{self.kind}\t{self.offset}\t{self.length}\n"
+
+
+class _Writer:
+    """Appends records to the segments of a single process."""
+
+    def __init__(self, path: str, max_segment_bytes: int):
+        self._path = path
+        self._max_segment_bytes = max_segment_bytes
+        self.pid = os.getpid()
+        timestamp = datetime.datetime.now(datetime.UTC).strftime("%Y%m%dT%H%M%S")
+        self._id = f"{timestamp}-{self.pid}-{secrets.token_hex(2)}"
+        self._segment_number = 0
+        self._seq = 0
+
+    def _segment(self) -> str:
+        return f"{self._id}_{self._segment_number:04d}"
+
+    def _open_segment(self) -> BinaryIO:
+        return open(os.path.join(self._path, self._segment() + SEGMENT_EXTENSION), "ab")
+
+    def append(self, data: bytes, timestamp: float, kind: str) -> LogEntry:
+        f = self._open_segment()
+        if f.tell() >= self._max_segment_bytes:
+            f.close()
+            self._segment_number += 1
+            f = self._open_segment()
+        with f:
+            offset = f.tell()
+            f.write(data)
+
+        entry = LogEntry(
+            segment=self._segment(),
+            seq=self._seq,
+            timestamp=timestamp,
+            kind=kind,
+            offset=offset,
+            length=len(data),
+        )
+        self._seq += 1
+
+        # The index entry is only written after its record is complete, so readers never find an entry pointing to a
+        # partially-written record.
+        with open(os.path.join(self._path, entry.segment + INDEX_EXTENSION), "a") as f:
+            f.write(entry.to_index_line())
+        return entry
+
+
+class SegmentedLog:
+    """Append-only log of JSON records stored in a directory.
+
+    Each process appends records to its own JSON-lines segment files (rotated by size), so processes never contend for
+    the same file.  Alongside each segment, a compact sidecar index records the sequence number, timestamp, kind, and
+    location of each record so that records can be selected without reading every segment.  Appending a record is
+    O(1) regardless of how many records are already in the log, and indices are read incrementally so repeated queries
+    only parse index entries added since the previous query.
+    """
+
+    def __init__(self, path: str, max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES):
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+
+        self._write_lock = threading.Lock()
+        self._writer: _Writer | None = None
+
+        self._read_lock = threading.Lock()
+        self._index_cache: dict[str, tuple[tuple[int, bytes], int, list[LogEntry]]] = {}
+        """Identity (inode and first line) and number of bytes of each index file already parsed, and the entries parsed
+        from those bytes."""
+
+    def append(self, record: dict, timestamp: datetime.datetime, kind: str) -> LogEntry:
+        """Append a record to the log.
+
+        Args:
+            record: JSON-serializable content of the record.
+            timestamp: Time associated with the record, used to select records when reading.
+            kind: Short caller-defined description of the record, usable in file names.
+
+        Returns: Index entry of the record appended.
+        """
+        if "\t" in kind or "\n" in kind:
+            raise ValueError(
+                f"Log record kind '{kind}' may not contain tabs or newlines"
+            )
+        data = (json.dumps(record) + "\n").encode("utf-8")
+        with self._write_lock:
+            if self._writer is None or self._writer.pid != os.getpid():
+                # This process has not yet written (a forked process must not share its parent's writer)
+                self._writer = _Writer(self.path, self._max_segment_bytes)
+            return self._writer.append(data, timestamp.timestamp(), kind)
+
+    def _read_index(self, segment: str) -> list[LogEntry]:
+        with open(os.path.join(self.path, segment + INDEX_EXTENSION), "rb") as f:
+            # The inode number of an index file removed by clear() may be reused when its writer recreates it, but the
+            # recreated index never starts with the same entry since its writer's sequence numbers keep increasing.
+            identity = (os.fstat(f.fileno()).st_ino, f.readline())
+            cached_identity, bytes_read, entries = self._index_cache.get(
+                segment, (identity, 0, [])
+            )
+            if cached_identity != identity:
+                # Index file was replaced since we last read it
+                bytes_read, entries = 0, []
+                del self._index_cache[segment]
+            f.seek(bytes_read)
+            content = f.read()
+        # Ignore any trailing partial line that is still being written
+        complete = content[: content.rfind(b"\n") + 1]
+        if complete:
+            entries.extend(
+                LogEntry.from_index_line(segment, line)
+                for line in complete.decode("utf-8").splitlines()
+            )
+            self._index_cache[segment] = (identity, bytes_read + len(complete), entries)
+        return entries
+
+    def entries(
+        self,
+        from_time: datetime.datetime | None = None,
+        to_time: datetime.datetime | None = None,
+        kinds: Container[str] | None = None,
+    ) -> list[LogEntry]:
+        """Find the index entries of records in the log, ordered by timestamp.
+
+        Args:
+            from_time: If specified, only include records at or after this time.
+            to_time: If specified, only include records at or before this time.
+            kinds: If specified, only include records of these kinds.
+        """
+        t0 = from_time.timestamp() if from_time is not None else None
+        t1 = to_time.timestamp() if to_time is not None else None
+        result = []
+        with self._read_lock:
+            segments = {
+                fname.removesuffix(INDEX_EXTENSION)
+                for fname in os.listdir(self.path)
+                if fname.endswith(INDEX_EXTENSION)
+            }
+            for segment in list(self._index_cache):
+                if segment not in segments:
+                    del self._index_cache[segment]
+            for segment in segments:
+                try:
+                    entries = self._read_index(segment)
+                except FileNotFoundError:
+                    # Log was cleared while we were reading it
+                    continue
+                result.extend(
+                    e
+                    for e in entries
+                    if (t0 is None or e.timestamp >= t0)
+                    and (t1 is None or e.timestamp <= t1)
+                    and (kinds is None or e.kind in kinds)
+                )
+        result.sort(key=lambda e: (e.timestamp, e.segment, e.seq))
+        return result
+
+    def read(self, entries: Iterable[LogEntry]) -> Iterator[tuple[LogEntry, dict]]:
+        """Read the records described by the specified index entries, in the order specified.
+
+        Records which can no longer be read (e.g., because the log was cleared) are skipped.
+        """
+        files = {}
+        try:
+            for entry in entries:
+                if entry.segment not in files:
+                    try:
+                        files[entry.segment] = open(
+                            os.path.join(self.path, entry.segment + SEGMENT_EXTENSION),
+                            "rb",
+                        )
+                    except FileNotFoundError:
+                        files[entry.segment] = None
+                f = files[entry.segment]
+                if f is None:
+                    continue
+                f.seek(entry.offset)
+                data = f.read(entry.length)
+                try:
+                    record = json.loads(data)
+                except ValueError as e:
+                    logger.warning(
+                        f"Skipping unreadable record {entry.name} in {self.path}: {str(e)}"
+                    )
+                    continue
+                yield entry, record
+        finally:
+            for f in files.values():
+                if f is not None:
+                    f.close()
+
+    def clear(self) -> int:
+        """Remove all records from the log.
+
+        Returns: Number of files removed.
+        """
+        num_removed = 0
+        with self._read_lock:
+            for fname in os.listdir(self.path):
+                if fname.endswith(SEGMENT_EXTENSION) or fname.endswith(INDEX_EXTENSION):
+                    try:
+                        os.remove(os.path.join(self.path, fname))
+                        num_removed += 1
+                    except FileNotFoundError:
+                        pass
+            self._index_cache.clear()
+        return num_removed
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from monitoring.monitorlib.segmented_log import (
+    INDEX_EXTENSION,
+    SEGMENT_EXTENSION,
+    SegmentedLog,
+)
+
+T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _append_records(log: SegmentedLog, worker: int, n: int):
+    for i in range(n):
+        log.append({"worker": worker, "i": i}, T0 + timedelta(seconds=i), "Child")
+
+
+def test_append_and_read(tmp_path):
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=200)
+    for i in range(50):
+        # Append out of order to make sure results are sorted by time
+        t = T0 + timedelta(seconds=(i * 7) % 50)
+        log.append({"i": i, "t": t.isoformat()}, t, "Even" if i % 2 == 0 else "Odd")
+
+    segments = [f for f in os.listdir(tmp_path) if f.endswith(SEGMENT_EXTENSION)]
+    assert len(segments) > 1
+    for segment in segments:
+        assert os.path.getsize(tmp_path / segment) < 300
+
+    entries = log.entries()
+    assert len(entries) == 50
+    assert len({e.name for e in entries}) == 50
+    records = [r for _, r in log.read(entries)]
+    assert [r["t"] for r in records] == sorted(r["t"] for r in records)
+
+    from_time = T0 + timedelta(seconds=20)
+    to_time = T0 + timedelta(seconds=29)
+    selected = log.entries(from_time=from_time, to_time=to_time, kinds={"Even"})
+    records = [r for _, r in log.read(selected)]
+    assert records
+    for r in records:
+        assert r["i"] % 2 == 0
+        assert from_time <= datetime.fromisoformat(r["t"]) <= to_time
+
+    with pytest.raises(ValueError):
+        log.append({}, T0, "Bad\tkind")
+
+
+def test_incremental_index_reads(tmp_path):
+    log = SegmentedLog(str(tmp_path))
+    log.append({"i": 0}, T0, "Record")
+    assert len(log.entries()) == 1
+
+    log.append({"i": 1}, T0 + timedelta(seconds=1), "Record")
+    # Simulate an index entry which is still being written by another process
+    index = next(f for f in os.listdir(tmp_path) if f.endswith(INDEX_EXTENSION))
+    with open(tmp_path / index, "a") as f:
+        f.write("2\t1704067202.0\tRec")
+    assert [r for _, r in log.read(log.entries())] == [{"i": 0}, {"i": 1}]
+
+    assert log.clear() == 2
+    assert log.entries() == []
+    log.append({"i": 3}, T0, "Record")
+    assert [r for _, r in log.read(log.entries())] == [{"i": 3}]
+
+
+def test_clear_from_other_instance(tmp_path):
+    writer = SegmentedLog(str(tmp_path))
+    reader = SegmentedLog(str(tmp_path))
+    for i in range(3):
+        writer.append({"i": i}, T0 + timedelta(seconds=i), "Record")
+    assert len(reader.entries()) == 3
+
+    # Another instance clears the log, then the writer recreates the same index file with different records
+    assert SegmentedLog(str(tmp_path)).clear() == 2
+    for i in range(3, 7):
+        writer.append({"i": i}, T0 + timedelta(seconds=i), "Record")
+
+    entries = reader.entries()
+    assert [e.seq for e in entries] == [3, 4, 5, 6]
+    assert [r for _, r in reader.read(entries)] == [{"i": i} for i in range(3, 7)]
+
+
+def test_multiple_processes(tmp_path):
+    log = SegmentedLog(str(tmp_path), max_segment_bytes=1000)
+    log.append({"worker": -1, "i": 0}, T0, "Parent")
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_append_records, args=(log, w, 100)) for w in range(3)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+        assert p.exitcode == 0
+
+    records = [r for _, r in log.read(log.entries(kinds={"Child"}))]
+    assert len(records) == 300
+    for w in range(3):
+        assert [r["i"] for r in records if r["worker"] == w] == list(range(100))
+    assert len(log.entries()) == 301
@@ -143,6 +143,9 @@ class ExecutionConfiguration(ImplicitDict):
     stop_after: Optional[StringBasedTimeDelta]
     """If specified, stop the test run at the next earliest convenience (generally just after completion of the current test scenario) if it has been running at least this long."""
 
+    max_parallel_actions: Optional[int] = None
+    """If specified and greater than 1, run up to this many actions of each test suite or action generator concurrently.  Only actions declaring `exclusive_resources` are run concurrently, and only with other actions using none of the same resources exclusively.  Reports are recorded in declaration order regardless."""
+
 
 class TestConfiguration(ImplicitDict):
     action: TestSuiteActionDeclaration
@@ -250,6 +253,11 @@ class GloballyExpandedReportConfiguration(ImplicitDict):
     """When True, look for instances of "Authorization" keys in the report with values starting "Bearer " and redact the signature from those access tokens"""
 
 
+class StreamedReportConfiguration(ImplicitDict):
+    redact_access_tokens: bool = True
+    """When True, look for instances of "Authorization" keys in the report with values starting "Bearer " and redact the signature from those access tokens"""
+
+
 class TimingReportConfiguration(ImplicitDict):
     percentage_of_time_to_break_down: float = 100.0
     """Percentage of test time to break down in the timing report (smaller contributions are not reported)"""
@@ -277,6 +285,9 @@ class ArtifactsConfiguration(ImplicitDict):
     timing_report: Optional[TimingReportConfiguration] = None
     """If specified, configuration describing a desired report describing where and how time was spent during the test."""
 
+    streamed_report: Optional[StreamedReportConfiguration] = None
+    """If specified, write each test scenario report to disk as soon as the scenario completes (rather than only writing artifacts at the end of the test run)."""
+
     @property
     def acceptable_findings(self) -> Iterable[FullyQualifiedCheck]:
         """Iterates through checks where findings are acceptable in at least one tested_requirements artifact."""
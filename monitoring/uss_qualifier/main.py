@@ -23,6 +23,7 @@ from monitoring.uss_qualifier.reports.artifacts import (
     generate_artifacts,
 )
 from monitoring.uss_qualifier.reports.report import TestRunReport
+from monitoring.uss_qualifier.reports.streamed_report import StreamedReportWriter
 from monitoring.uss_qualifier.reports.validation.report_validation import (
     validate_report,
 )
@@ -117,6 +118,7 @@ class TestDefinitionDescription(ImplicitDict):
 def execute_test_run(
     whole_config: USSQualifierConfiguration,
     description: TestDefinitionDescription,
+    report_stream: StreamedReportWriter | None = None,
 ):
     assert whole_config.v1
     config = whole_config.v1.test_run
@@ -143,7 +145,9 @@ def execute_test_run(
     else:
         acceptable_findings = []
     context = ExecutionContext(
-        config.execution if "execution" in config else None, acceptable_findings
+        config.execution if "execution" in config else None,
+        acceptable_findings,
+        report_stream,
     )
     action = TestSuiteAction(config.action, resources)
     logger.info("Running top-level test suite action")
@@ -168,6 +172,7 @@ def raise_for_unredacted_information(config: USSQualifierConfiguration) -> None:
         "v1.artifacts.raw_report.redact_access_tokens": True,
         "v1.artifacts.report_html.redact_access_tokens": True,
         "v1.artifacts.sequence_view.redact_access_tokens": True,
+        "v1.artifacts.streamed_report.redact_access_tokens": True,
     }
 
     for json_address, required_value in required_values.items():
@@ -257,13 +262,24 @@ def run_config(
             "--output-path must be specified when configuration produces artifacts"
         )
 
+    report_stream = None
+    if output_path and config.artifacts and config.artifacts.streamed_report:
+        stream_path = os.path.join(output_path, "streamed_report")
+        logger.info(f"Streaming scenario reports to {stream_path}")
+        report_stream = StreamedReportWriter(
+            stream_path, config.artifacts.streamed_report.redact_access_tokens
+        )
+
     logger.info("Executing test run")
-    report = execute_test_run(whole_config, description)
+    report = execute_test_run(whole_config, description, report_stream)
 
     if runtime_metadata is not None:
         report.runtime_metadata = runtime_metadata
 
-    if config.artifacts:
+    if report_stream:
+        report_stream.finish(report)
+
+    if config.artifacts and output_path:
         generate_artifacts(report, config.artifacts, output_path, disallow_unredacted)
 
     if "validation" in config and config.validation:
@@ -13,12 +13,15 @@ from monitoring.uss_qualifier.configurations.configuration import (
     USSQualifierConfiguration,
     USSQualifierConfigurationV1,
 )
-from monitoring.uss_qualifier.fileio import load_dict_with_references
+from monitoring.uss_qualifier.fileio import load_dict_with_references, resolve_filename
 from monitoring.uss_qualifier.reports.artifacts import (
     default_output_path,
     generate_artifacts,
+    generate_artifacts_from_index,
 )
 from monitoring.uss_qualifier.reports.report import TestRunReport
+from monitoring.uss_qualifier.reports.report_index import IndexedReport
+from monitoring.uss_qualifier.reports.streamed_report import load_streamed_report
 
 
 def parseArgs() -> argparse.Namespace:
@@ -34,7 +37,7 @@ def parseArgs() -> argparse.Namespace:
 
     parser.add_argument(
         "--report",
-        help="File name of the report to read; Several comma-separated file names matching the configurations may be specified",
+        help="File name of the report to read, or folder of a streamed report; Several comma-separated file names matching the configurations may be specified",
         required=True,
     )
 
@@ -70,15 +73,27 @@ def main() -> int:
             f"========== Generating artifacts for configuration {config_name} and report {report_path} =========="
         )
 
-        report_src = load_dict_with_references(report_path)
-        report = ImplicitDict.parse(report_src, TestRunReport)
+        report_file = resolve_filename(report_path)
+        report = None
+        indexed_report = None
+        if os.path.isdir(report_file):
+            report = load_streamed_report(report_file)
+        elif report_file.lower().endswith(".json") and os.path.isfile(report_file):
+            indexed_report = IndexedReport(report_file)
+        else:
+            report_src = load_dict_with_references(report_path)
+            report = ImplicitDict.parse(report_src, TestRunReport)
 
         if config_name != config_in_report:
             config_src = load_dict_with_references(config_name)
             whole_config = ImplicitDict.parse(config_src, USSQualifierConfiguration)
-        else:
+        elif report is not None:
             whole_config = report.configuration
+        else:
+            assert indexed_report
+            whole_config = indexed_report.configuration()
 
+        assert whole_config.v1
         config: USSQualifierConfigurationV1 = whole_config.v1
         if config.artifacts:
             if args.output_path:
@@ -88,11 +103,20 @@ def main() -> int:
                 output_path = default_output_path(report_name)
             else:
                 output_path = default_output_path(config_name)
-            generate_artifacts(report, config.artifacts, output_path, False)
+            if indexed_report is not None:
+                generate_artifacts_from_index(
+                    indexed_report, config.artifacts, output_path, False
+                )
+            else:
+                assert report is not None
+                generate_artifacts(report, config.artifacts, output_path, False)
         else:
             output_path = "nowhere"
             logger.warning(f"No artifacts to generate for {config_name}")
 
+        if indexed_report is not None:
+            indexed_report.close()
+
         logger.info(
             f"========== Wrote artifacts for configuration {config_name} to {os.path.abspath(output_path)} =========="
         )
@@ -3,7 +3,6 @@ import os
 import time
 from multiprocessing import Process
 
-from implicitdict import ImplicitDict
 from loguru import logger
 
 from monitoring.uss_qualifier.configurations.configuration import ArtifactsConfiguration
@@ -11,7 +10,11 @@ from monitoring.uss_qualifier.reports.documents import make_report_html
 from monitoring.uss_qualifier.reports.globally_expanded.generate import (
     generate_globally_expanded_report,
 )
-from monitoring.uss_qualifier.reports.report import TestRunReport, redact_access_tokens
+from monitoring.uss_qualifier.reports.report import (
+    TestRunReport,
+    with_access_tokens_redacted,
+)
+from monitoring.uss_qualifier.reports.report_index import IndexedReport
 from monitoring.uss_qualifier.reports.sequence_view.generate import (
     generate_sequence_view,
 )
@@ -19,7 +22,10 @@ from monitoring.uss_qualifier.reports.templates import render_templates
 from monitoring.uss_qualifier.reports.tested_requirements.generate import (
     generate_tested_requirements,
 )
-from monitoring.uss_qualifier.reports.timing.generate import generate_timing_report
+from monitoring.uss_qualifier.reports.timing.generate import (
+    generate_timing_report,
+    timing_query_fields,
+)
 
 
 def default_output_path(config_name: str) -> str:
@@ -53,8 +59,8 @@ def generate_artifacts(
         return result
 
     logger.info("Redacting access tokens from report")
-    redacted_report = ImplicitDict.parse(json.loads(json.dumps(report)), TestRunReport)
-    redact_access_tokens(redacted_report)
+    # Content without access tokens is shared with report rather than copied
+    redacted_report = with_access_tokens_redacted(report)
 
     def make_raw_report() -> None:
         if not artifacts.raw_report:
@@ -163,3 +169,32 @@ def generate_artifacts(
     failed = [p for p in generators if p.exitcode != 0]
     if failed:
         raise RuntimeError(f"{len(failed)} generator(s) failed. Check exception above.")
+
+
+def generate_artifacts_from_index(
+    indexed_report: IndexedReport,
+    artifacts: ArtifactsConfiguration,
+    output_path: str,
+    disallow_unredacted: bool,
+):
+    """Write all configured artifacts for an indexed test run report, parsing only the parts of the report needed."""
+    other_artifacts = [
+        k for k, v in artifacts.items() if k != "timing_report" and v is not None
+    ]
+    if other_artifacts or artifacts.timing_report is None:
+        logger.info(f"Loading full report {indexed_report.path}")
+        generate_artifacts(
+            indexed_report.load(), artifacts, output_path, disallow_unredacted
+        )
+        return
+
+    # Only the timing report is needed, so only the timing fields of each query need to be held in memory.  Dropping
+    # the rest of each query (including its headers) also redacts access tokens.
+    path = os.path.join(output_path, "timing")
+    logger.info(f"Writing timing report to {path} from indexed report")
+    t0 = time.monotonic()
+    report = indexed_report.load(timing_query_fields)
+    generate_timing_report(
+        report, artifacts.timing_report, path, indexed_report.signature()
+    )
+    logger.info(f"Wrote timing report in {time.monotonic() - t0:.1f}s")
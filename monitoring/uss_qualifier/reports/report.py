@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 from collections.abc import Callable, Iterator
 from datetime import UTC, datetime
 from typing import Any
@@ -842,18 +843,26 @@ class TestRunReport(ImplicitDict):
     """Metadata for the test run specified at runtime."""
 
 
+def _redacted_access_token(key: str, value: Any) -> str | None:
+    """Returns the redacted version of value if key and value indicate an access token, otherwise None."""
+    if (
+        key.lower() == "authorization"
+        and isinstance(value, str)
+        and value.lower().startswith("bearer ")
+    ):
+        token_parts = value[len("bearer ") :].split(".")
+        token_parts[-1] = "REDACTED"
+        return value[0 : len("bearer ")] + ".".join(token_parts)
+    return None
+
+
 def redact_access_tokens(report: dict[str, Any] | list) -> None:
     if isinstance(report, dict):
         changes = {}
         for k, v in report.items():
-            if (
-                k.lower() == "authorization"
-                and isinstance(v, str)
-                and v.lower().startswith("bearer ")
-            ):
-                token_parts = v[len("bearer ") :].split(".")
-                token_parts[-1] = "REDACTED"
-                changes[k] = v[0 : len("bearer ")] + ".".join(token_parts)
+            redacted = _redacted_access_token(k, v)
+            if redacted is not None:
+                changes[k] = redacted
             elif isinstance(v, dict) or isinstance(v, list):
                 redact_access_tokens(v)
         for k, v in changes.items():
@@ -864,3 +873,40 @@ def redact_access_tokens(report: dict[str, Any] | list) -> None:
                 redact_access_tokens(item)
     else:
         raise ValueError(f"{type(report).__name__} is not a dict or list")
+
+
+def with_access_tokens_redacted[TReport: dict | list](report: TReport) -> TReport:
+    """Returns a version of report with access tokens redacted (as redact_access_tokens would), leaving report unchanged.
+
+    Only the dicts and lists containing an access token (directly or indirectly) are copied, and each is only shallowly
+    copied (preserving its type); all other content is shared with report.  The result therefore uses little additional
+    memory, but report must not be modified while the result is in use.
+    """
+    if isinstance(report, dict):
+        changes = {}
+        for k, v in report.items():
+            redacted = _redacted_access_token(k, v)
+            if redacted is not None:
+                changes[k] = redacted
+            elif isinstance(v, dict) or isinstance(v, list):
+                redacted_v = with_access_tokens_redacted(v)
+                if redacted_v is not v:
+                    changes[k] = redacted_v
+        if not changes:
+            return report
+        result = copy.copy(report)
+        for k, v in changes.items():
+            result[k] = v
+        return result
+    elif isinstance(report, list):
+        result = None
+        for i, item in enumerate(report):
+            if isinstance(item, dict) or isinstance(item, list):
+                redacted_item = with_access_tokens_redacted(item)
+                if redacted_item is not item:
+                    if result is None:
+                        result = copy.copy(report)
+                    result[i] = redacted_item
+        return report if result is None else result
+    else:
+        raise ValueError(f"{type(report).__name__} is not a dict or list")
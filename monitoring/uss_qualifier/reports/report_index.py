@@ -0,0 +1,423 @@
+"""Access to the content of a raw TestRunReport JSON file without loading the whole report into memory.
+
+The report file is memory-mapped and scanned once to build a ReportIndex recording where each test scenario report,
+test step report, and query is located in the file.  The index is saved next to the report file so later readers can
+skip the scan.  Subtrees of the report can then be parsed individually as they are needed.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from implicitdict import ImplicitDict, Optional
+from loguru import logger
+
+from monitoring.monitorlib.dicts import JSONAddress, get_element
+from monitoring.monitorlib.fetch import Query
+from monitoring.uss_qualifier.configurations.configuration import (
+    USSQualifierConfiguration,
+)
+from monitoring.uss_qualifier.reports.report import (
+    TestRunReport,
+    TestScenarioReport,
+    with_access_tokens_redacted,
+)
+from monitoring.uss_qualifier.signatures import signed_content
+
+INDEX_SUFFIX = ".index.json"
+"""Suffix appended to the name of a report file to obtain the name of its index file."""
+
+SKIP_WINDOW_BYTES = 64 * 1024
+"""Number of bytes initially decoded when skipping over a JSON object or array while scanning a report."""
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]+")
+_QUERY_PLACEHOLDER = re.compile(r'"\\u0000query(\d+)"')
+
+
+class ByteRange(ImplicitDict):
+    start: int
+    """Offset of the first byte of the JSON value in the report file."""
+
+    end: int
+    """Offset just past the last byte of the JSON value in the report file."""
+
+
+class StepLocation(ByteRange):
+    address: JSONAddress
+    """Location of this TestStepReport relative to its TestScenarioReport."""
+
+    queries: list[ByteRange]
+    """Location of each query recorded in this test step, in order."""
+
+
+class ScenarioLocation(ByteRange):
+    address: JSONAddress
+    """Location of this TestScenarioReport relative to the TestRunReport."""
+
+    scenario_type: str
+    """Type of this test scenario."""
+
+    steps: list[StepLocation]
+    """Location of each test step (including cleanup) of this test scenario, in file order."""
+
+
+class ReportIndex(ImplicitDict):
+    report_size: int
+    """Size of the indexed report file, in bytes."""
+
+    report_mtime_ns: int
+    """Modification time of the indexed report file."""
+
+    configuration: Optional[ByteRange]
+    """Location of the configuration of the test run."""
+
+    scenarios: list[ScenarioLocation]
+    """Location of each test scenario report, in file order."""
+
+    def queries(self) -> Iterator[ByteRange]:
+        """Location of each query in the report, in file order."""
+        for scenario in self.scenarios:
+            for step in scenario.steps:
+                yield from step.queries
+
+
+class _Scanner:
+    """Recursive-descent scanner building a ReportIndex by parsing only the structure of a raw TestRunReport.
+
+    Any JSON value not on the path to a query is skipped by decoding it with the C JSON decoder.
+    """
+
+    def __init__(self, data: mmap.mmap):
+        self._data = data
+        self._decoder = json.JSONDecoder()
+        self.configuration: ByteRange | None = None
+        self.scenarios: list[ScenarioLocation] = []
+
+    def scan(self) -> None:
+        def on_member(key: str, pos: int) -> int:
+            if key == "report":
+                return self._action(pos, "report")
+            end = self._skip(pos)
+            if key == "configuration":
+                self.configuration = ByteRange(start=pos, end=end)
+            return end
+
+        pos = self._members(self._ws(0), on_member)
+        if self._ws(pos) != len(self._data):
+            raise ValueError(f"Unexpected content after report at offset {pos}")
+
+    def _action(self, pos: int, address: JSONAddress) -> int:
+        def on_container_member(container: str, key: str, value_pos: int) -> int:
+            if key == "actions" and self._is(value_pos, b"["):
+                return self._items(
+                    value_pos,
+                    lambda i, p: self._action(p, f"{address}.{container}.actions[{i}]"),
+                )
+            return self._skip(value_pos)
+
+        def on_member(key: str, value_pos: int) -> int:
+            if key == "test_scenario" and self._is(value_pos, b"{"):
+                return self._scenario(value_pos, f"{address}.test_scenario")
+            elif key in ("test_suite", "action_generator") and self._is(
+                value_pos, b"{"
+            ):
+                return self._members(
+                    value_pos, lambda k, p: on_container_member(key, k, p)
+                )
+            return self._skip(value_pos)
+
+        return self._members(pos, on_member)
+
+    def _scenario(self, pos: int, address: JSONAddress) -> int:
+        steps: list[StepLocation] = []
+        scenario_type = ""
+
+        def on_case_member(case_index: int, key: str, value_pos: int) -> int:
+            if key == "steps" and self._is(value_pos, b"["):
+                return self._items(
+                    value_pos,
+                    lambda i, p: self._step(
+                        p, f"cases[{case_index}].steps[{i}]", steps
+                    ),
+                )
+            return self._skip(value_pos)
+
+        def on_member(key: str, value_pos: int) -> int:
+            nonlocal scenario_type
+            if key == "cases" and self._is(value_pos, b"["):
+                return self._items(
+                    value_pos,
+                    lambda i, p: self._members(p, lambda k, q: on_case_member(i, k, q)),
+                )
+            elif key == "cleanup" and self._is(value_pos, b"{"):
+                return self._step(value_pos, "cleanup", steps)
+            end = self._skip(value_pos)
+            if key == "scenario_type":
+                scenario_type = json.loads(self._data[value_pos:end])
+            return end
+
+        end = self._members(pos, on_member)
+        self.scenarios.append(
+            ScenarioLocation(
+                start=pos,
+                end=end,
+                address=address,
+                scenario_type=scenario_type,
+                steps=steps,
+            )
+        )
+        return end
+
+    def _step(self, pos: int, address: JSONAddress, steps: list[StepLocation]) -> int:
+        queries: list[ByteRange] = []
+
+        def on_query(_: int, query_pos: int) -> int:
+            end = self._skip(query_pos)
+            queries.append(ByteRange(start=query_pos, end=end))
+            return end
+
+        end = self._members(
+            pos,
+            lambda k, p: (
+                self._items(p, on_query)
+                if k == "queries" and self._is(p, b"[")
+                else self._skip(p)
+            ),
+        )
+        steps.append(StepLocation(start=pos, end=end, address=address, queries=queries))
+        return end
+
+    def _is(self, pos: int, token: bytes) -> bool:
+        return self._data[pos : pos + 1] == token
+
+    def _ws(self, pos: int) -> int:
+        m = _WHITESPACE.match(self._data, pos)
+        assert m
+        return m.end()
+
+    def _expect(self, pos: int, token: bytes) -> int:
+        if not self._is(pos, token):
+            raise ValueError(
+                f"Expected {token.decode()} at offset {pos} but found {self._data[pos : pos + 16]!r}"
+            )
+        return self._ws(pos + 1)
+
+    def _members(self, pos: int, on_member: Callable[[str, int], int]) -> int:
+        """Scan the object at pos, calling on_member with each key and value offset; on_member returns the value end."""
+        pos = self._expect(pos, b"{")
+        if self._is(pos, b"}"):
+            return pos + 1
+        while True:
+            m = _STRING.match(self._data, pos)
+            if not m:
+                raise ValueError(f"Expected object key at offset {pos}")
+            key = json.loads(m.group())
+            pos = self._expect(self._ws(m.end()), b":")
+            pos = self._ws(on_member(key, pos))
+            if self._is(pos, b"}"):
+                return pos + 1
+            pos = self._expect(pos, b",")
+
+    def _items(self, pos: int, on_item: Callable[[int, int], int]) -> int:
+        """Scan the array at pos, calling on_item with each index and item offset; on_item returns the item end."""
+        pos = self._expect(pos, b"[")
+        if self._is(pos, b"]"):
+            return pos + 1
+        i = 0
+        while True:
+            pos = self._ws(on_item(i, pos))
+            if self._is(pos, b"]"):
+                return pos + 1
+            pos = self._expect(pos, b",")
+            i += 1
+
+    def _skip(self, pos: int) -> int:
+        """Find the end of the JSON value at pos."""
+        if self._is(pos, b'"'):
+            m = _STRING.match(self._data, pos)
+        elif self._is(pos, b"{") or self._is(pos, b"["):
+            return self._skip_container(pos)
+        else:
+            m = _SCALAR.match(self._data, pos)
+        if not m:
+            raise ValueError(f"Expected JSON value at offset {pos}")
+        return m.end()
+
+    def _skip_container(self, pos: int) -> int:
+        window = SKIP_WINDOW_BYTES
+        while True:
+            chunk = self._data[pos : pos + window]
+            # The window may end in the middle of a multi-byte character; only content after the value is lost
+            text = chunk.decode("utf-8", errors="ignore")
+            try:
+                _, end = self._decoder.raw_decode(text)
+                return pos + len(text[:end].encode("utf-8"))
+            except json.JSONDecodeError:
+                if pos + window >= len(self._data):
+                    raise
+                window *= 4
+
+
+def build_report_index(report_path: str) -> ReportIndex:
+    """Scan the raw TestRunReport JSON file at the specified path to build its index."""
+    stat = os.stat(report_path)
+    with (
+        open(report_path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        scanner = _Scanner(data)
+        scanner.scan()
+    return ReportIndex(
+        report_size=stat.st_size,
+        report_mtime_ns=stat.st_mtime_ns,
+        configuration=scanner.configuration,
+        scenarios=scanner.scenarios,
+    )
+
+
+class IndexedReport:
+    """Raw TestRunReport JSON file, memory-mapped and indexed so that parts of it can be parsed individually."""
+
+    path: str
+    index: ReportIndex
+
+    def __init__(self, path: str, index_path: str | None = None):
+        """Open the raw TestRunReport JSON file at the specified path.
+
+        Args:
+            path: Path to report file.
+            index_path: Path to index file for the report, or None to use the report path plus INDEX_SUFFIX.  If this
+                file does not contain an up-to-date index of the report, the report is indexed and the index is written
+                to this file (if possible).
+        """
+        self.path = path
+        if index_path is None:
+            index_path = path + INDEX_SUFFIX
+        self.index = self._load_index(index_path)
+        self._file = open(path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _load_index(self, index_path: str) -> ReportIndex:
+        stat = os.stat(self.path)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                index = ImplicitDict.parse(json.load(f), ReportIndex)
+            if (
+                index.report_size == stat.st_size
+                and index.report_mtime_ns == stat.st_mtime_ns
+            ):
+                return index
+            logger.info(f"Index {index_path} is out of date")
+
+        logger.info(f"Indexing report {self.path}")
+        index = build_report_index(self.path)
+        try:
+            with open(index_path, "w") as f:
+                json.dump(index, f)
+        except OSError as e:
+            logger.warning(f"Could not write report index to {index_path}: {e}")
+        return index
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self) -> "IndexedReport":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def parse(self, location: ByteRange) -> Any:
+        """Parse the JSON value at the specified location in the report."""
+        return json.loads(self._data[location.start : location.end])
+
+    def configuration(self) -> USSQualifierConfiguration:
+        if "configuration" not in self.index or not self.index.configuration:
+            raise ValueError(f"Report {self.path} does not contain a configuration")
+        return ImplicitDict.parse(
+            self.parse(self.index.configuration), USSQualifierConfiguration
+        )
+
+    def scenario_reports(self) -> Iterator[tuple[ScenarioLocation, TestScenarioReport]]:
+        """Parse each test scenario report, one at a time, in file order."""
+        for scenario in self.index.scenarios:
+            yield scenario, ImplicitDict.parse(self.parse(scenario), TestScenarioReport)
+
+    def load(
+        self, query_transform: Callable[[dict], dict] | None = None
+    ) -> TestRunReport:
+        """Parse the full report.
+
+        Args:
+            query_transform: If specified, each query is parsed individually and replaced in the report by the result
+                of this function applied to the query's JSON content.  This limits the memory used to hold queries when
+                only some of their content is needed.
+        """
+        if query_transform is None:
+            content = json.loads(self._data[:])
+        else:
+            content = json.loads(
+                self._replace_queries(
+                    lambda _, query: json.dumps(
+                        query_transform(self.parse(query))
+                    ).encode("utf-8")
+                )
+            )
+        return ImplicitDict.parse(content, TestRunReport)
+
+    def signature(self) -> str:
+        """Compute the test run ID of the report while parsing only one query at a time.
+
+        This is the signature of the parsed report with access tokens redacted, as used by artifacts generated from the
+        full report (see `compute_test_run_information`).
+        """
+        queries = list(self.index.queries())
+        outline = json.loads(
+            self._replace_queries(
+                lambda i, _: json.dumps(f"\u0000query{i}").encode("utf-8")
+            )
+        )
+
+        # Parse the outline without its query placeholders so that defaults are filled in as in the full report
+        step_queries: dict[JSONAddress, list[str]] = {}
+        for scenario in self.index.scenarios:
+            for step in scenario.steps:
+                if step.queries:
+                    address = f"{scenario.address}.{step.address}"
+                    step_report = get_element(outline, address)
+                    step_queries[address] = step_report["queries"]
+                    step_report["queries"] = []
+        report = with_access_tokens_redacted(ImplicitDict.parse(outline, TestRunReport))
+        for address, placeholders in step_queries.items():
+            get_element(report, address)["queries"] = placeholders
+
+        sig = hashlib.sha256()
+        content = signed_content(report)
+        pos = 0
+        for m in _QUERY_PLACEHOLDER.finditer(content):
+            sig.update(content[pos : m.start()].encode("utf-8"))
+            query = ImplicitDict.parse(self.parse(queries[int(m.group(1))]), Query)
+            sig.update(
+                signed_content(with_access_tokens_redacted(query)).encode("utf-8")
+            )
+            pos = m.end()
+        sig.update(content[pos:].encode("utf-8"))
+        return sig.hexdigest()
+
+    def _replace_queries(self, replacement: Callable[[int, ByteRange], bytes]) -> bytes:
+        """Content of the report with each query replaced by the specified replacement for that query."""
+        parts = []
+        pos = 0
+        for i, query in enumerate(self.index.queries()):
+            parts.append(self._data[pos : query.start])
+            parts.append(replacement(i, query))
+            pos = query.end
+        parts.append(self._data[pos:])
+        return b"".join(parts)
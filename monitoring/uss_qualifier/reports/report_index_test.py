@@ -0,0 +1,163 @@
+import json
+import os
+
+import pytest
+from implicitdict import ImplicitDict
+
+from monitoring.uss_qualifier.configurations.configuration import (
+    USSQualifierConfiguration,
+)
+from monitoring.uss_qualifier.reports import report, report_index
+from monitoring.uss_qualifier.reports.report_index import INDEX_SUFFIX, IndexedReport
+from monitoring.uss_qualifier.reports.timing.generate import timing_query_fields
+from monitoring.uss_qualifier.signatures import compute_signature
+
+T0 = "2024-01-01T00:00:00Z"
+
+
+def _query(n: int) -> dict:
+    return {
+        "request": {
+            "method": "GET",
+            "url": f"https://uss{n}.example.com/ü/{n}",
+            "headers": {"Authorization": "Bearer a.b.c"},
+            "initiated_at": T0,
+        },
+        "response": {
+            "code": 200,
+            "elapsed_s": 0.0,
+            "reported": T0,
+            # Keys of the report structure within a query should not be mistaken for report structure
+            "json": {"queries": [{"cases": ["}]"]}], "padding": "x" * 300 * n},
+        },
+        "query_type": "astm.f3548.v21.dss.queryOperationalIntentReferences",
+    }
+
+
+def _step(queries: list[dict]) -> dict:
+    return {
+        "name": "Step",
+        "documentation_url": "",
+        "start_time": T0,
+        "queries": queries,
+        "failed_checks": [],
+        "passed_checks": [],
+    }
+
+
+def _scenario(name: str, steps: list[dict], cleanup: dict | None) -> dict:
+    scenario = {
+        "name": name,
+        "scenario_type": f"scenarios.{name}",
+        "documentation_url": "",
+        "start_time": T0,
+        "end_time": T0,
+        "cleanup": cleanup,
+        "cases": [
+            {"name": "Case", "documentation_url": "", "start_time": T0, "steps": steps}
+        ],
+    }
+    if cleanup is None:
+        del scenario["cleanup"]
+    return scenario
+
+
+def _report() -> dict:
+    scenario1 = _scenario(
+        "First", [_step([_query(1), _query(2)]), _step([])], _step([_query(3)])
+    )
+    scenario2 = _scenario("Second", [_step([_query(4)])], None)
+    return {
+        "codebase_version": "v0",
+        "commit_hash": "0",
+        "baseline_signature": "b",
+        "environment_signature": "e",
+        "configuration": {"v1": {"artifacts": {"timing_report": {}}}},
+        "report": {
+            "test_suite": {
+                "name": "Suite",
+                "suite_type": "suites.Example",
+                "documentation_url": "",
+                "start_time": T0,
+                "end_time": T0,
+                "actions": [
+                    {"test_scenario": scenario1},
+                    {
+                        "action_generator": {
+                            "generator_type": "action_generators.Example",
+                            "start_time": T0,
+                            "actions": [{"test_scenario": scenario2}],
+                        }
+                    },
+                ],
+                "capability_evaluations": [],
+            }
+        },
+    }
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_index(tmp_path, monkeypatch, indent):
+    # Use a small window so that skipping over large queries requires growing the window
+    monkeypatch.setattr(report_index, "SKIP_WINDOW_BYTES", 64)
+    content = _report()
+    path = os.path.join(tmp_path, "report.json")
+    with open(path, "w") as f:
+        json.dump(content, f, indent=indent, ensure_ascii=False)
+
+    with IndexedReport(path) as indexed:
+        scenarios = indexed.index.scenarios
+        assert [s.address for s in scenarios] == [
+            "report.test_suite.actions[0].test_scenario",
+            "report.test_suite.actions[1].action_generator.actions[0].test_scenario",
+        ]
+        assert [s.scenario_type for s in scenarios] == [
+            "scenarios.First",
+            "scenarios.Second",
+        ]
+        # Steps are listed in file order, and cleanup precedes cases in this file
+        assert [step.address for step in scenarios[0].steps] == [
+            "cleanup",
+            "cases[0].steps[0]",
+            "cases[0].steps[1]",
+        ]
+
+        suite = content["report"]["test_suite"]
+        assert [indexed.parse(s) for s in scenarios] == [
+            suite["actions"][0]["test_scenario"],
+            suite["actions"][1]["action_generator"]["actions"][0]["test_scenario"],
+        ]
+        assert [r.name for _, r in indexed.scenario_reports()] == ["First", "Second"]
+        assert [indexed.parse(q) for q in indexed.index.queries()] == [
+            _query(n) for n in (3, 1, 2, 4)
+        ]
+        assert indexed.parse(scenarios[0].steps[0]) == _step([_query(3)])
+
+        # Artifacts generated from the full report are identified by the signature of the parsed, redacted report
+        assert indexed.signature() == compute_signature(
+            report.with_access_tokens_redacted(
+                ImplicitDict.parse(content, report.TestRunReport)
+            )
+        )
+        assert indexed.signature() != compute_signature(content)
+        assert indexed.load() == ImplicitDict.parse(content, report.TestRunReport)
+        assert indexed.configuration() == ImplicitDict.parse(
+            content["configuration"], USSQualifierConfiguration
+        )
+
+        slim = indexed.load(timing_query_fields)
+        queries = slim.report.queries()
+        assert len(queries) == 4
+        assert all("headers" not in q.request or not q.request.headers for q in queries)
+        assert queries[0].request.url_hostname == "uss1.example.com"
+        assert queries[0].response.reported.datetime == queries[0].request.timestamp
+
+    # The index written by the first reader is used by later readers
+    assert os.path.exists(path + INDEX_SUFFIX)
+    monkeypatch.setattr(
+        report_index,
+        "build_report_index",
+        lambda _: pytest.fail("Report should not be indexed again"),
+    )
+    with IndexedReport(path) as indexed:
+        assert len(indexed.index.scenarios) == 2
@@ -0,0 +1,66 @@
+import copy
+
+from implicitdict import ImplicitDict
+
+from monitoring.monitorlib.fetch import Query
+from monitoring.uss_qualifier.reports.report import (
+    redact_access_tokens,
+    with_access_tokens_redacted,
+)
+
+T0 = "2024-01-01T00:00:00Z"
+
+
+def _query(authorization: str | None) -> Query:
+    headers = {"Content-Type": "application/json"}
+    if authorization is not None:
+        headers["Authorization"] = authorization
+    return ImplicitDict.parse(
+        {
+            "request": {
+                "method": "GET",
+                "url": "https://uss1.example.com",
+                "headers": headers,
+                "initiated_at": T0,
+            },
+            "response": {
+                "code": 200,
+                "elapsed_s": 0.1,
+                "reported": T0,
+                "json": {"flights": [{"id": "f1"}]},
+            },
+        },
+        Query,
+    )
+
+
+def test_with_access_tokens_redacted():
+    report = {
+        "steps": [
+            {"queries": [_query("Bearer header.payload.signature"), _query(None)]},
+            {"queries": [_query("bearer token"), _query("Basic dXNlcg==")]},
+        ],
+        "notes": {"authorization": "Bearer note.signature"},
+    }
+    original = copy.deepcopy(report)
+    expected = copy.deepcopy(report)
+    redact_access_tokens(expected)
+
+    redacted = with_access_tokens_redacted(report)
+
+    assert redacted == expected
+    assert report == original
+
+    # Only containers of access tokens are copied, and copies keep their types
+    queries = redacted["steps"][0]["queries"]
+    assert isinstance(queries[0], Query)
+    assert (
+        queries[0].request.headers["Authorization"] == "Bearer header.payload.REDACTED"
+    )
+    assert queries[0] is not report["steps"][0]["queries"][0]
+    assert queries[0].response is report["steps"][0]["queries"][0].response
+    assert queries[1] is report["steps"][0]["queries"][1]
+    assert redacted["steps"][1]["queries"][1] is report["steps"][1]["queries"][1]
+
+    no_tokens = {"steps": [{"queries": [_query(None)]}]}
+    assert with_access_tokens_redacted(no_tokens) is no_tokens
@@ -0,0 +1,169 @@
+"""Test run reports written to disk incrementally, one test scenario report at a time.
+
+A streamed report is a folder containing:
+  * SCENARIOS_FILE: one JSON line per completed test scenario, appended as soon as that scenario completes, with the
+    JSONAddress of the scenario within the TestSuiteActionReport of the test run and the scenario report itself.
+  * MANIFEST_FILE: the TestRunReport written at the end of the test run, with each streamed test scenario report
+    replaced by a reference to its line in SCENARIOS_FILE.
+
+If the test run does not complete, SCENARIOS_FILE still contains the reports of all scenarios completed before the
+interruption.
+"""
+
+import json
+import os
+import threading
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+from implicitdict import ImplicitDict
+
+from monitoring.monitorlib.dicts import JSONAddress
+from monitoring.uss_qualifier.reports.report import (
+    TestRunReport,
+    TestScenarioReport,
+    TestSuiteActionReport,
+    with_access_tokens_redacted,
+)
+
+SCENARIOS_FILE = "scenarios.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+FRAGMENT_KEY = "$fragment"
+"""Key of the object replacing a streamed test scenario report in the manifest; its value is the scenario's line index in SCENARIOS_FILE."""
+
+
+class StreamedReportWriter:
+    """Appends test scenario reports to a streamed report folder as they complete.
+
+    Scenario reports may be added concurrently from multiple threads.
+    """
+
+    path: str
+    redact: bool
+    _scenarios: TextIO
+    _fragments: dict[int, int]
+    _lock: threading.Lock
+
+    def __init__(self, path: str, redact: bool):
+        """Start a new streamed report, replacing any streamed report already in the folder.
+
+        Args:
+            path: Folder in which to write the streamed report.
+            redact: When True, redact access tokens from each scenario report as it is written.
+        """
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        self.path = path
+        self.redact = redact
+        self._scenarios = open(os.path.join(path, SCENARIOS_FILE), "w")
+        self._fragments = {}
+        self._lock = threading.Lock()
+
+    def add_scenario(self, address: JSONAddress, report: TestScenarioReport) -> None:
+        """Append a completed test scenario report.
+
+        Args:
+            address: Location of the scenario report relative to the TestSuiteActionReport of the test run.
+            report: Completed report; it must not be modified after being added.
+        """
+        line = json.dumps({"address": address, "report": self._copy(report)})
+        with self._lock:
+            if self._scenarios.closed:
+                raise RuntimeError(
+                    "Cannot add a scenario report to a streamed report which has already been finished"
+                )
+            self._fragments[id(report)] = len(self._fragments)
+            self._scenarios.write(line + "\n")
+            self._scenarios.flush()
+
+    def finish(self, report: TestRunReport) -> None:
+        """Write the manifest for the completed test run, after which no more scenario reports may be added."""
+        with self._lock:
+            self._scenarios.close()
+            manifest = {k: self._copy(v) for k, v in report.items() if k != "report"}
+            manifest["report"] = self._skeleton(report.report)
+            with open(os.path.join(self.path, MANIFEST_FILE), "w") as f:
+                json.dump(manifest, f)
+
+    def _skeleton(self, report: TestSuiteActionReport) -> Any:
+        """Copy of the specified report with each streamed test scenario report replaced by a reference."""
+        if "test_scenario" in report and report.test_scenario:
+            fragment = self._fragments.get(id(report.test_scenario))
+            if fragment is not None:
+                return {"test_scenario": {FRAGMENT_KEY: fragment}}
+            return self._copy(report)
+        for field in ("test_suite", "action_generator"):
+            if field in report and report[field]:
+                container = {
+                    k: self._copy(v) for k, v in report[field].items() if k != "actions"
+                }
+                container["actions"] = [
+                    self._skeleton(a) for a in report[field].actions
+                ]
+                return {field: container}
+        return self._copy(report)
+
+    def _copy(self, value: Any) -> Any:
+        """Value to write in place of the specified value: the value itself, or a redacted version when redacting."""
+        if not self.redact or not isinstance(value, dict | list):
+            return value
+        return with_access_tokens_redacted(value)
+
+
+def iter_streamed_scenario_reports(
+    path: str,
+) -> Iterator[tuple[JSONAddress, TestScenarioReport]]:
+    """Iterate over the test scenario reports in a streamed report folder, in order of completion, parsing each one only when reached.
+
+    The reports of a test run that did not complete may be read this way.
+    """
+    with open(os.path.join(path, SCENARIOS_FILE)) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # Partially-written line from an interrupted test run
+            fragment = json.loads(line)
+            yield (
+                fragment["address"],
+                ImplicitDict.parse(fragment["report"], TestScenarioReport),
+            )
+
+
+def load_streamed_report(path: str) -> TestRunReport:
+    """Reassemble the full TestRunReport from a streamed report folder.
+
+    Scenario reports are read one line at a time and inserted into the manifest where they are referenced.
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ValueError(
+            f"Streamed report in {path} has no {MANIFEST_FILE}, so its test run did not complete; completed scenario reports may still be read from {SCENARIOS_FILE}"
+        )
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    placeholders: dict[int, dict] = {}
+    _find_placeholders(manifest["report"], placeholders)
+    with open(os.path.join(path, SCENARIOS_FILE)) as f:
+        for i, line in enumerate(f):
+            if i in placeholders:
+                placeholders.pop(i)["test_scenario"] = json.loads(line)["report"]
+    if placeholders:
+        raise ValueError(
+            f"Streamed report in {path} is missing scenario report lines {', '.join(str(i) for i in sorted(placeholders))}"
+        )
+    return ImplicitDict.parse(manifest, TestRunReport)
+
+
+def _find_placeholders(report: dict, placeholders: dict[int, dict]) -> None:
+    """Find the TestSuiteActionReport dicts referencing scenario report lines, by line index."""
+    if "test_scenario" in report:
+        if FRAGMENT_KEY in report["test_scenario"]:
+            placeholders[report["test_scenario"][FRAGMENT_KEY]] = report
+        return
+    for field in ("test_suite", "action_generator"):
+        if field in report:
+            for action in report[field].get("actions", []):
+                _find_placeholders(action, placeholders)
@@ -0,0 +1,139 @@
+import json
+import os
+
+from implicitdict import ImplicitDict
+
+from monitoring.uss_qualifier.reports import report
+from monitoring.uss_qualifier.reports.streamed_report import (
+    SCENARIOS_FILE,
+    StreamedReportWriter,
+    iter_streamed_scenario_reports,
+    load_streamed_report,
+)
+
+T0 = "2024-01-01T00:00:00Z"
+TOKEN = "Bearer header.payload.signature"
+REDACTED_TOKEN = "Bearer header.payload.REDACTED"
+
+
+def _scenario(name: str) -> report.TestScenarioReport:
+    query = {
+        "request": {
+            "method": "GET",
+            "url": f"https://uss1.example.com/{name}",
+            "headers": {"Authorization": TOKEN},
+            "initiated_at": T0,
+        },
+        "response": {"code": 200, "elapsed_s": 0.1, "reported": T0},
+    }
+    step = {
+        "name": "Step",
+        "documentation_url": "",
+        "start_time": T0,
+        "queries": [query],
+        "failed_checks": [],
+        "passed_checks": [],
+    }
+    return ImplicitDict.parse(
+        {
+            "name": name,
+            "scenario_type": "scenarios.Example",
+            "documentation_url": "",
+            "start_time": T0,
+            "cases": [
+                {
+                    "name": "Case",
+                    "documentation_url": "",
+                    "start_time": T0,
+                    "steps": [step],
+                }
+            ],
+        },
+        report.TestScenarioReport,
+    )
+
+
+def _run_report(scenarios: list[report.TestScenarioReport]) -> report.TestRunReport:
+    actions: list[dict] = [{"test_scenario": s} for s in scenarios]
+    actions.append(
+        {
+            "skipped_action": {
+                "reason": "Example",
+                "timestamp": T0,
+                "declaration": {"test_scenario": {"scenario_type": "x"}},
+            }
+        }
+    )
+    return ImplicitDict.parse(
+        {
+            "codebase_version": "v0",
+            "commit_hash": "0",
+            "baseline_signature": "b",
+            "environment_signature": "e",
+            "configuration": {"v1": {}},
+            "report": {
+                "test_suite": {
+                    "name": "Suite",
+                    "suite_type": "suites.Example",
+                    "documentation_url": "",
+                    "start_time": T0,
+                    "actions": actions,
+                    "capability_evaluations": [],
+                }
+            },
+        },
+        report.TestRunReport,
+    )
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path)
+    scenarios = [_scenario("s1"), _scenario("s2")]
+    run_report = _run_report(scenarios)
+    assert run_report.report.test_suite
+    streamed = [
+        a.test_scenario
+        for a in run_report.report.test_suite.actions
+        if "test_scenario" in a and a.test_scenario
+    ]
+
+    writer = StreamedReportWriter(path, redact=True)
+    # Scenarios complete in a different order than they are listed in the report
+    writer.add_scenario("test_suite.actions[1].test_scenario", streamed[1])
+    writer.add_scenario("test_suite.actions[0].test_scenario", streamed[0])
+
+    partial = list(iter_streamed_scenario_reports(path))
+    assert [address for address, _ in partial] == [
+        "test_suite.actions[1].test_scenario",
+        "test_suite.actions[0].test_scenario",
+    ]
+    assert partial[0][1].name == "s2"
+
+    writer.finish(run_report)
+    loaded = load_streamed_report(path)
+
+    expected = json.loads(json.dumps(run_report))
+    for action in expected["report"]["test_suite"]["actions"][0:2]:
+        query = action["test_scenario"]["cases"][0]["steps"][0]["queries"][0]
+        query["request"]["headers"]["Authorization"] = REDACTED_TOKEN
+    assert json.loads(json.dumps(loaded)) == expected
+
+    # Redaction while streaming does not modify the report in memory
+    assert json.dumps(streamed[0]).count(TOKEN) == 1
+
+
+def test_unredacted(tmp_path):
+    path = str(tmp_path)
+    run_report = _run_report([_scenario("s1")])
+    assert run_report.report.test_suite
+    scenario = run_report.report.test_suite.actions[0].test_scenario
+    assert scenario
+
+    writer = StreamedReportWriter(path, redact=False)
+    writer.add_scenario("test_suite.actions[0].test_scenario", scenario)
+    writer.finish(run_report)
+    with open(os.path.join(path, SCENARIOS_FILE)) as f:
+        assert len(f.readlines()) == 1
+
+    loaded = load_streamed_report(path)
+    assert json.loads(json.dumps(loaded)) == json.loads(json.dumps(run_report))
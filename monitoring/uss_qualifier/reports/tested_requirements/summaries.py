@@ -16,14 +16,23 @@ from monitoring.uss_qualifier.reports.tested_requirements.data_types import (
 from monitoring.uss_qualifier.signatures import compute_signature
 
 
-def compute_test_run_information(report: TestRunReport) -> TestRunInformation:
+def compute_test_run_information(
+    report: TestRunReport, test_run_id: str | None = None
+) -> TestRunInformation:
+    """Summarize the specified test run.
+
+    Args:
+        report: Report of the test run.
+        test_run_id: Signature of the full report, if already known (or if report is not the full report).
+    """
+
     def print_datetime(t: StringBasedDateTime | None) -> str | None:
         if t is None:
             return None
         return t.datetime.strftime("%Y-%m-%d %H:%M:%S %Z")
 
     return TestRunInformation(
-        test_run_id=compute_signature(report),
+        test_run_id=test_run_id or compute_signature(report),
         start_time=print_datetime(report.report.start_time),
         end_time=print_datetime(report.report.end_time),
         baseline=report.baseline_signature,
@@ -22,14 +22,46 @@ class _GenerationError(RuntimeError):
         super().__init__(msg)
 
 
+def timing_query_fields(query: dict) -> dict:
+    """Select the content of a raw Query needed to generate a timing report."""
+    request = query["request"]
+    response = query["response"]
+    result = {
+        "request": {
+            k: request[k]
+            for k in ("method", "url", "initiated_at", "received_at")
+            if k in request
+        },
+        "response": {
+            k: response[k] for k in ("elapsed_s", "reported") if k in response
+        },
+    }
+    if "query_type" in query:
+        result["query_type"] = query["query_type"]
+    return result
+
+
 def generate_timing_report(
-    report: TestRunReport, config: TimingReportConfiguration, output_path: str
+    report: TestRunReport,
+    config: TimingReportConfiguration,
+    output_path: str,
+    test_run_id: str | None = None,
 ) -> None:
+    """Write a timing report for the specified test run.
+
+    Of the queries in the report, only the content selected by timing_query_fields is used.
+
+    Args:
+        report: Report of the test run.
+        config: Configuration of the timing report.
+        output_path: Folder in which to write the timing report.
+        test_run_id: Signature of the full report, if report is not the full report.
+    """
     import_submodules(scenarios)
     import_submodules(suites)
     import_submodules(action_generators)
 
-    test_run = compute_test_run_information(report)
+    test_run = compute_test_run_information(report, test_run_id)
 
     os.makedirs(output_path, exist_ok=True)
     index_file = os.path.join(output_path, "index.html")
@@ -16,6 +16,9 @@ class EvaluationConfiguration(ImplicitDict):
     repeat_query_rect_period: int = 3
     """If set to a value above zero, reuse the most recent query rectangle/view every this many queries."""
 
+    max_concurrent_sp_queries: int = 1
+    """When polling Service Providers as a Display Provider, perform up to this many flights and flight details queries to Service Providers concurrently.  If 1, queries are performed sequentially."""
+
 
 class EvaluationConfigurationResource(Resource[EvaluationConfiguration]):
     configuration: EvaluationConfiguration
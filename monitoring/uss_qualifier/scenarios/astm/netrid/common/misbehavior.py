@@ -177,6 +177,7 @@ class Misbehavior(GenericTestScenario):
             rid_version=self._rid_version,
             session=self._dss.client,
             dss_participant_id=self._dss.participant_id,
+            max_concurrent_queries=self._evaluation_configuration.configuration.max_concurrent_sp_queries,
         )
 
         self.record_queries(sp_observation.queries)
@@ -340,6 +340,7 @@ class RIDObservationEvaluator:
                 rid_version=self._rid_version,
                 session=self._dss.client,
                 dss_participant_id=self._dss.participant_id,
+                max_concurrent_queries=self._config.max_concurrent_sp_queries,
             )
 
             for q in sp_observation.queries:
@@ -1123,6 +1124,7 @@ class DisconnectedUASObservationEvaluator:
             rid_version=self._rid_version,
             session=self._dss.client,
             dss_participant_id=self._dss.participant_id,
+            max_concurrent_queries=self._config.max_concurrent_sp_queries,
         )
 
         for q in sp_observation.queries:
@@ -47,6 +47,15 @@ def _with_integer_zeros(obj: Any) -> Any:
         return obj
 
 
+def signed_content(obj: dict | list) -> str:
+    """Compute the content of the dict or list object from which its signature is computed.
+
+    The signed content of an object is the same whether it is computed for the object alone or as part of the signed
+    content of a containing object.
+    """
+    return json.dumps(_with_integer_zeros(obj), sort_keys=True)
+
+
 def compute_signature(obj: dict | list | str) -> str:
     """Compute a hash/signature of the content of the dict object."""
     if isinstance(obj, str):
@@ -54,6 +63,6 @@ def compute_signature(obj: dict | list | str) -> str:
         sig.update(obj.encode("utf-8"))
         return sig.hexdigest()
     elif isinstance(obj, dict) or isinstance(obj, list):
-        return compute_signature(json.dumps(_with_integer_zeros(obj), sort_keys=True))
+        return compute_signature(signed_content(obj))
     else:
         raise ValueError(f"Cannot compute signature for {type(obj).__name__} type")
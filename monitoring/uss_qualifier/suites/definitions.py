@@ -86,6 +86,9 @@ class TestSuiteActionDeclaration(ImplicitDict):
     on_failure: ReactionToFailure = ReactionToFailure.Continue
     """What to do if this action fails"""
 
+    exclusive_resources: Optional[list[ResourceID]] = None
+    """If specified, resources (by the resource IDs of the scenario, suite, or action generator) this action uses exclusively.  When the test run executes actions concurrently (see `max_parallel_actions`), this action may run concurrently with other actions that use none of these same resources exclusively.  If not specified, this action never runs concurrently with another action."""
+
     @property
     def invalid_type_error(self):
         return ValueError(
@@ -3,7 +3,15 @@ from __future__ import annotations
 import json
 import os
 import re
-from collections.abc import Iterator
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
@@ -40,9 +48,11 @@ from monitoring.uss_qualifier.reports.report import (
     TestSuiteActionReport,
     TestSuiteReport,
 )
+from monitoring.uss_qualifier.reports.streamed_report import StreamedReportWriter
 from monitoring.uss_qualifier.resources.definitions import ResourceID
 from monitoring.uss_qualifier.resources.resource import (
     MissingResourceError,
+    Resource,
     ResourceType,
     create_resources,
     make_child_resources,
@@ -82,6 +92,8 @@ class TestSuiteAction[T: ActionGenerator]:
     test_scenario: TestScenario | None = None
     test_suite: TestSuite | None = None
     action_generator: T | None = None
+    exclusive_resources: list[Resource] | None = None
+    """Resources this action uses exclusively, or None if this action may not run concurrently with any other action."""
 
     def __init__(
         self,
@@ -95,6 +107,20 @@ class TestSuiteAction[T: ActionGenerator]:
             f"Test suite action to run {action.get_action_type_name()} {action.get_child_type()}",
         )
 
+        if "exclusive_resources" in action and action.exclusive_resources is not None:
+            resource_links = action.get_resource_links()
+            for resource_id in action.exclusive_resources:
+                if resource_id not in resource_links:
+                    raise ValueError(
+                        f'Exclusive resource ID "{resource_id}" of test suite action to run {action.get_action_type_name()} {action.get_child_type()} is not one of the resources provided to it ({", ".join(resource_links) or "none"})'
+                    )
+            # Optional resources not present in the parent are not used by the action, so cannot conflict
+            self.exclusive_resources = [
+                resources_for_child[resource_id]
+                for resource_id in action.exclusive_resources
+                if resource_id in resources_for_child
+            ]
+
         if "test_scenario" in action and action.test_scenario:
             self.test_scenario = TestScenario.make_test_scenario(
                 declaration=action.test_scenario, resource_pool=resources_for_child
@@ -123,8 +149,20 @@ class TestSuiteAction[T: ActionGenerator]:
                 "TestSuiteAction as not a suite, action generator, nor scenario"
             )
 
-    def run(self, context: ExecutionContext) -> TestSuiteActionReport:
-        context.begin_action(self)
+    def conflicts_with(self, other: TestSuiteAction) -> bool:
+        """True if this action and the other action may not run concurrently."""
+        if self.exclusive_resources is None or other.exclusive_resources is None:
+            return True
+        return any(
+            r is r_other
+            for r in self.exclusive_resources
+            for r_other in other.exclusive_resources
+        )
+
+    def run(
+        self, context: ExecutionContext, frame: ActionStackFrame | None = None
+    ) -> TestSuiteActionReport:
+        context.begin_action(self, frame)
         skip_report = context.evaluate_skip()
         if skip_report:
             logger.warning(
@@ -348,40 +386,130 @@ class TestSuite:
         return report
 
 
+def _stops_actions(
+    a: int, action: TestSuiteAction | SkippedActionReport, report: TestSuiteActionReport
+) -> bool:
+    """True if no more actions should be run after the specified action produced the specified report."""
+    if report.has_critical_problem():
+        return True
+    if not report.successful():
+        if action.declaration.on_failure == ReactionToFailure.Abort:
+            return True
+        elif action.declaration.on_failure == ReactionToFailure.Continue:
+            return False
+        else:
+            raise ValueError(
+                f"Action {a} indicated an unrecognized reaction to failure: {str(action.declaration.on_failure)}"
+            )
+    return False
+
+
+def _make_timeout_skip_report(context: ExecutionContext) -> TestSuiteActionReport:
+    assert context.current_frame
+    return TestSuiteActionReport(
+        skipped_action=SkippedActionReport(
+            timestamp=StringBasedDateTime(arrow.utcnow().datetime),
+            reason=TEST_RUN_TIMEOUT_SKIP_REASON,
+            declaration=context.current_frame.action.declaration,
+        )
+    )
+
+
 def _run_actions(
     actions: Iterator[TestSuiteAction | SkippedActionReport],
     context: ExecutionContext,
     report: TestSuiteReport | ActionGeneratorReport,
 ) -> None:
+    if context.max_parallel_actions > 1:
+        _run_actions_concurrently(actions, context, report)
+        return
+
     success = True
     for a, action in enumerate(actions):
         if isinstance(action, SkippedActionReport):
             action_report = TestSuiteActionReport(skipped_action=action)
         elif context.should_stop_early_now():
-            assert context.current_frame
-            action_report = TestSuiteActionReport(
-                skipped_action=SkippedActionReport(
-                    timestamp=StringBasedDateTime(arrow.utcnow().datetime),
-                    reason=TEST_RUN_TIMEOUT_SKIP_REASON,
-                    declaration=context.current_frame.action.declaration,
-                )
-            )
+            action_report = _make_timeout_skip_report(context)
         else:
             action_report = action.run(context)
         report.actions.append(action_report)
-        if action_report.has_critical_problem():
+        if not action_report.successful() or action_report.has_critical_problem():
             success = False
+        if _stops_actions(a, action, action_report):
             break
-        if not action_report.successful():
-            success = False
-            if action.declaration.on_failure == ReactionToFailure.Abort:
+    report.successful = success
+    report.end_time = StringBasedDateTime(datetime.now(UTC))
+
+
+def _run_actions_concurrently(
+    actions: Iterator[TestSuiteAction | SkippedActionReport],
+    context: ExecutionContext,
+    report: TestSuiteReport | ActionGeneratorReport,
+) -> None:
+    """Run actions like _run_actions, but run each action concurrently with earlier actions not conflicting with it.
+
+    Actions are started in order, each once fewer than max_parallel_actions are running and no running action either
+    conflicts with it or aborts the remaining actions upon failure.  Once an action's outcome indicates that no more
+    actions should be run, no more actions are started.  Reports of all actions started are recorded in declaration
+    order.
+    """
+    action_reports: list[TestSuiteActionReport | Future[TestSuiteActionReport]] = []
+    running: dict[Future[TestSuiteActionReport], tuple[int, TestSuiteAction]] = {}
+    stopping = False
+
+    def collect(done: Iterable[Future[TestSuiteActionReport]]) -> None:
+        nonlocal stopping
+        for future in done:
+            a, action = running.pop(future)
+            if _stops_actions(a, action, future.result()):
+                stopping = True
+
+    def must_wait_for_running(action: TestSuiteAction) -> bool:
+        if len(running) >= context.max_parallel_actions:
+            return True
+        return any(
+            other.declaration.on_failure == ReactionToFailure.Abort
+            or action.conflicts_with(other)
+            for _, other in running.values()
+        )
+
+    with ThreadPoolExecutor(
+        max_workers=context.max_parallel_actions,
+        thread_name_prefix="uss_qualifier_action",
+    ) as executor:
+        for a, action in enumerate(actions):
+            if isinstance(action, SkippedActionReport):
+                action_report = TestSuiteActionReport(skipped_action=action)
+                action_reports.append(action_report)
+                if _stops_actions(a, action, action_report):
+                    break
+                continue
+
+            collect([f for f in running if f.done()])
+            while running and must_wait_for_running(action):
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                collect(done)
+            if stopping:
                 break
-            elif action.declaration.on_failure == ReactionToFailure.Continue:
+
+            if context.should_stop_early_now():
+                action_reports.append(_make_timeout_skip_report(context))
                 continue
-            else:
-                raise ValueError(
-                    f"Action {a} indicated an unrecognized reaction to failure: {str(action.declaration.on_failure)}"
-                )
+
+            # The action's frame is added here rather than in the worker thread so frames are in declaration order
+            frame = context.add_frame(action)
+            future = executor.submit(action.run, context, frame)
+            action_reports.append(future)
+            running[future] = (a, action)
+        collect(wait(running, return_when=ALL_COMPLETED).done)
+
+    success = True
+    for action_report in action_reports:
+        if isinstance(action_report, Future):
+            action_report = action_report.result()
+        report.actions.append(action_report)
+        if not action_report.successful() or action_report.has_critical_problem():
+            success = False
     report.successful = success
     report.end_time = StringBasedDateTime(datetime.now(UTC))
 
@@ -425,19 +553,43 @@ class ExecutionContext:
     config: ExecutionConfiguration | None
     acceptable_findings: list[FullyQualifiedCheck]
     top_frame: ActionStackFrame | None
-    current_frame: ActionStackFrame | None
+    report_stream: StreamedReportWriter | None
+    _thread_state: threading.local
+    _frames_lock: threading.Lock
 
     def __init__(
         self,
         config: ExecutionConfiguration | None,
         acceptable_findings: list[FullyQualifiedCheck],
+        report_stream: StreamedReportWriter | None = None,
     ):
         self.config = config
         self.acceptable_findings = acceptable_findings
+        self.report_stream = report_stream
         self.top_frame = None
-        self.current_frame = None
+        self._thread_state = threading.local()
+        self._frames_lock = threading.Lock()
         self.start_time = arrow.utcnow().datetime
 
+    @property
+    def current_frame(self) -> ActionStackFrame | None:
+        """Frame of the action being run by the current thread."""
+        return getattr(self._thread_state, "current_frame", None)
+
+    @current_frame.setter
+    def current_frame(self, frame: ActionStackFrame | None) -> None:
+        self._thread_state.current_frame = frame
+
+    @property
+    def max_parallel_actions(self) -> int:
+        if (
+            self.config is not None
+            and "max_parallel_actions" in self.config
+            and self.config.max_parallel_actions
+        ):
+            return self.config.max_parallel_actions
+        return 1
+
     def sibling_queries(self) -> Iterator[Query]:
         if self.current_frame is None or self.current_frame.parent is None:
             return
@@ -698,16 +850,32 @@ class ExecutionContext:
 
         return None
 
-    def begin_action(self, action: TestSuiteAction) -> None:
-        if self.top_frame is None:
-            self.top_frame = ActionStackFrame(action=action, parent=None, children=[])
-            self.current_frame = self.top_frame
-        else:
-            self.current_frame = ActionStackFrame(
+    def add_frame(self, action: TestSuiteAction) -> ActionStackFrame:
+        """Add a frame for the specified action as the last child of the current frame, without entering it."""
+        with self._frames_lock:
+            if self.top_frame is None:
+                self.top_frame = ActionStackFrame(
+                    action=action, parent=None, children=[]
+                )
+                return self.top_frame
+            frame = ActionStackFrame(
                 action=action, parent=self.current_frame, children=[]
             )
-            if self.current_frame.parent:
-                self.current_frame.parent.children.append(self.current_frame)
+            if frame.parent:
+                frame.parent.children.append(frame)
+            return frame
+
+    def begin_action(
+        self, action: TestSuiteAction, frame: ActionStackFrame | None = None
+    ) -> None:
+        """Enter the frame of the specified action, adding it first unless it was already added with add_frame."""
+        if frame is None:
+            frame = self.add_frame(action)
+        elif frame.action is not action:
+            raise RuntimeError(
+                f"Action {action.declaration.get_action_type_name()} {action.declaration.get_child_type()} was started in a frame for a different action"
+            )
+        self.current_frame = frame
 
     def end_action(
         self, action: TestSuiteAction, report: TestSuiteActionReport
@@ -722,4 +890,12 @@ class ExecutionContext:
                 f"Action {self.current_frame.action.declaration.get_action_type_name()} {self.current_frame.action.declaration.get_child_type()} was started, but a different action {action.declaration.get_action_type_name()} {action.declaration.get_child_type()} was ended"
             )
         self.current_frame.report = report
+        if (
+            self.report_stream is not None
+            and "test_scenario" in report
+            and report.test_scenario
+        ):
+            self.report_stream.add_scenario(
+                self.current_frame.address(), report.test_scenario
+            )
         self.current_frame = self.current_frame.parent
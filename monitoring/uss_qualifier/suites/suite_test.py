@@ -0,0 +1,160 @@
+import time
+
+import arrow
+import pytest
+from implicitdict import StringBasedDateTime
+
+from monitoring.uss_qualifier.action_generators.definitions import (
+    ActionGeneratorDefinition,
+)
+from monitoring.uss_qualifier.configurations.configuration import (
+    ExecutionConfiguration,
+)
+from monitoring.uss_qualifier.reports.report import (
+    ActionGeneratorReport,
+    TestSuiteActionReport,
+)
+from monitoring.uss_qualifier.suites.definitions import (
+    ReactionToFailure,
+    TestSuiteActionDeclaration,
+)
+from monitoring.uss_qualifier.suites.suite import (
+    ActionStackFrame,
+    ExecutionContext,
+    TestSuiteAction,
+    _run_actions,
+)
+
+
+class _Resource:
+    pass
+
+
+class _FakeAction(TestSuiteAction):
+    def __init__(
+        self,
+        name: str,
+        exclusive_resources: list[_Resource] | None,
+        duration: float = 0.05,
+        successful: bool = True,
+        on_failure: ReactionToFailure = ReactionToFailure.Continue,
+    ):
+        self.declaration = TestSuiteActionDeclaration(on_failure=on_failure)
+        self.exclusive_resources = exclusive_resources  # pyright: ignore[reportAttributeAccessIssue]
+        self.name = name
+        self.duration = duration
+        self.succeeds = successful
+        self.started: float | None = None
+        self.ended: float | None = None
+
+    def get_name(self) -> str:
+        return self.name
+
+    def run(
+        self, context: ExecutionContext, frame: ActionStackFrame | None = None
+    ) -> TestSuiteActionReport:
+        context.begin_action(self, frame)
+        self.started = time.monotonic()
+        time.sleep(self.duration)
+        self.ended = time.monotonic()
+        report = TestSuiteActionReport(
+            action_generator=ActionGeneratorReport(
+                generator_type=self.name,
+                start_time=StringBasedDateTime(arrow.utcnow()),
+                actions=[],
+                successful=self.succeeds,
+            )
+        )
+        context.end_action(self, report)
+        return report
+
+
+def _overlapped(a1: _FakeAction, a2: _FakeAction) -> bool:
+    assert a1.started and a1.ended and a2.started and a2.ended
+    return a1.started < a2.ended and a2.started < a1.ended
+
+
+def _run(
+    actions: list[_FakeAction], max_parallel_actions: int
+) -> ActionGeneratorReport:
+    context = ExecutionContext(
+        ExecutionConfiguration(max_parallel_actions=max_parallel_actions), []
+    )
+    parent = _FakeAction("parent", None)
+    context.begin_action(parent)
+    report = ActionGeneratorReport(
+        generator_type="parent",
+        start_time=StringBasedDateTime(arrow.utcnow()),
+        actions=[],
+    )
+    _run_actions(iter(actions), context, report)
+    context.end_action(parent, report=TestSuiteActionReport(action_generator=report))
+    assert context.top_frame is not None
+    assert [f.action for f in context.top_frame.children] == [
+        a for a in actions if a.started is not None
+    ]
+    return report
+
+
+def test_concurrent_actions():
+    r1, r2 = _Resource(), _Resource()
+    actions = [
+        _FakeAction("a", [r1]),
+        _FakeAction("b", [r2]),
+        _FakeAction("c", [r1], duration=0),
+        _FakeAction("d", None),
+        _FakeAction("e", [r1]),
+    ]
+    report = _run(actions, max_parallel_actions=4)
+    a, b, c, d, e = actions
+    assert _overlapped(a, b)
+    assert not _overlapped(a, c)
+    assert d.started is not None and d.started >= max(
+        a.ended or 0, b.ended or 0, c.ended or 0
+    )
+    assert not _overlapped(d, e)
+    assert [
+        r.action_generator.generator_type for r in report.actions if r.action_generator
+    ] == ["a", "b", "c", "d", "e"]
+    assert report.successful
+
+
+def test_concurrent_abort():
+    actions = [
+        _FakeAction(
+            "a", [_Resource()], successful=False, on_failure=ReactionToFailure.Abort
+        ),
+        _FakeAction("b", [_Resource()]),
+    ]
+    report = _run(actions, max_parallel_actions=4)
+    assert actions[1].started is None
+    assert len(report.actions) == 1
+    assert not report.successful
+
+    actions = [
+        _FakeAction("a", [_Resource()], duration=0.1, successful=False),
+        _FakeAction("b", [_Resource()]),
+    ]
+    report = _run(actions, max_parallel_actions=4)
+    assert _overlapped(actions[0], actions[1])
+    assert len(report.actions) == 2
+    assert not report.successful
+
+
+def test_sequential_by_default():
+    r1, r2 = _Resource(), _Resource()
+    actions = [_FakeAction("a", [r1]), _FakeAction("b", [r2])]
+    _run(actions, max_parallel_actions=1)
+    assert not _overlapped(actions[0], actions[1])
+
+
+def test_unknown_exclusive_resource():
+    declaration = TestSuiteActionDeclaration(
+        action_generator=ActionGeneratorDefinition(
+            generator_type="action_generators.Example",
+            resources={"flight_planners": "flight_planners"},
+        ),
+        exclusive_resources=["flight_planner"],
+    )
+    with pytest.raises(ValueError, match='"flight_planner"'):
+        TestSuiteAction(declaration, {"flight_planners": _Resource()})  # pyright: ignore[reportArgumentType]